@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+
+"""
+SCRIPT: benchmark_swiftauto_traders.py
+AUTHOR: Pravin Regismond
+DATE: 2026-10-18
+DESCRIPTION: This script benchmarks the setup performed by
+             setup_swiftauto_traders.py against the simulated Snowflake
+             connection of simulated_snowflake.py. It reports the wall time
+             and round trips of a cold and a warm run of the whole setup,
+             of the uploads and table loads as the file count and file size
+             grow, and of the role and user setup, so changes to the setup
+             can be compared without a Snowflake account.
+
+AUDIT TRAIL START                               INIT  DATE
+----------------------------------------------  ----- -----------
+1. Initial version                              PR    2026-10-18
+2. Polled the loads at a short interval and     PR    2026-10-18
+   failed the run when a case reports errors.
+
+AUDIT TRAIL END
+"""
+
+# Importing the required libraries
+import contextlib
+import csv
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import setup_swiftauto_traders as setup
+import simulated_snowflake as simulated
+
+# Simulated Snowflake behaviour, overridable through environment variables
+LATENCY = float(os.getenv('SWIFTAUTO_BENCH_LATENCY', '0.05'))
+BYTE_COST = float(os.getenv('SWIFTAUTO_BENCH_BYTE_COST', '0.00000002'))
+FAILURE_RATE = float(os.getenv('SWIFTAUTO_BENCH_FAILURE_RATE', '0'))
+FAILURE_PATTERN = os.getenv('SWIFTAUTO_BENCH_FAILURE_PATTERN') or None
+SEED = int(os.getenv('SWIFTAUTO_BENCH_SEED', '42'))
+
+# Seconds between two status polls of the table loads, short enough that
+# the timings measure the simulated latency rather than the polling
+POLL_INTERVAL = float(os.getenv('SWIFTAUTO_BENCH_POLL_INTERVAL', '0.005'))
+
+# Output lines of the setup reporting an error it recovered from
+ERROR_LINE = re.compile(r"An unexpected error occurred|: FAILED\b")
+
+# Scaling curves: file counts at BASE_ROWS rows per file, and rows per file
+# for a single file
+FILE_COUNTS = [
+    int(count)
+    for count in os.getenv('SWIFTAUTO_BENCH_FILE_COUNTS', '1,4,16').split(',')
+]
+FILE_ROWS = [
+    int(rows) for rows in
+    os.getenv('SWIFTAUTO_BENCH_FILE_ROWS', '1000,10000,100000').split(',')
+]
+BASE_ROWS = int(os.getenv('SWIFTAUTO_BENCH_BASE_ROWS', '3000'))
+
+# Dataset used by the whole setup, and source of the rows of the scaling
+# datasets
+DATASET_DIR = './Automotive_Industry/'
+SOURCE_FILE = 'AU_Sales_By_Model.csv'
+
+# JSON-lines file receiving the results of every benchmark run
+OUTPUT_PATH = os.getenv(
+    'SWIFTAUTO_BENCH_OUTPUT', './benchmark_swiftauto_traders.jsonl'
+)
+
+
+def connect():
+    """
+    Open a simulated Snowflake connection with the configured behaviour.
+
+    Returns:
+        simulated_snowflake.SimulatedConnection: Simulated connection.
+    """
+    return simulated.SimulatedConnection(
+        latency=LATENCY, byte_cost=BYTE_COST, failure_rate=FAILURE_RATE,
+        failure_pattern=FAILURE_PATTERN, seed=SEED
+    )
+
+
+def measure(case, connection, function, *args, **details):
+    """
+    Time a setup function, silencing its output. Errors raised by the
+    function and errors it reports in its output are recorded.
+
+    Args:
+        case (str): Benchmark case name.
+        connection (simulated_snowflake.SimulatedConnection):
+            Simulated connection used by the function.
+        function (callable): Function to time.
+        *args: Function arguments.
+        **details: Case details added to the result, such as file counts.
+
+    Returns:
+        dict: Case name and details, wall time, round trips, injected
+            failures and the errors of the function, if any.
+    """
+    round_trips, failures = connection.round_trips, connection.failures
+    errors = []
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        try:
+            function(*args)
+        except Exception as e:
+            errors.append(str(e))
+    seconds = time.perf_counter() - start
+    errors += [
+        line.strip() for line in output.getvalue().splitlines()
+        if ERROR_LINE.search(line)
+    ]
+    return {
+        "case": case,
+        **details,
+        "seconds": round(seconds, 3),
+        "round_trips": connection.round_trips - round_trips,
+        "failures": connection.failures - failures,
+        "error": "; ".join(errors) or None,
+    }
+
+
+def write_dataset(directory, file_count, file_rows):
+    """
+    Write CSV files repeating the rows of the source file.
+
+    Args:
+        directory (str): Output directory.
+        file_count (int): Number of files.
+        file_rows (int): Number of data rows per file.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    with open(os.path.join(DATASET_DIR, SOURCE_FILE), newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+
+    paths = []
+    for index in range(file_count):
+        path = os.path.join(directory, f"AU_Bench_{index:03d}.csv")
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row_index in range(file_rows):
+                writer.writerow(rows[row_index % len(rows)])
+        paths.append(path)
+    return paths
+
+
+def benchmark_main():
+    """
+    Run the whole setup twice in a copy of the dataset, the second run
+    finding everything already uploaded, loaded and granted.
+
+    Returns:
+        list: Results of the cold and warm runs.
+    """
+    connection = connect()
+    get_connection = setup.get_snowflake_connection
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copytree(
+            DATASET_DIR, os.path.join(directory, DATASET_DIR)
+        )
+        setup.get_snowflake_connection = lambda: connection
+        os.chdir(directory)
+        try:
+            return [
+                measure(f"main ({run})", connection, setup.main)
+                for run in ("cold", "warm")
+            ]
+        finally:
+            os.chdir(cwd)
+            setup.get_snowflake_connection = get_connection
+
+
+def benchmark_loads(file_count, file_rows):
+    """
+    Upload and load a generated dataset.
+
+    Args:
+        file_count (int): Number of files.
+        file_rows (int): Number of data rows per file.
+
+    Returns:
+        list: Results of the upload and of the table loads.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_dataset(directory, file_count, file_rows)
+        details = {
+            "files": file_count,
+            "rows": file_rows,
+            "bytes": sum(os.path.getsize(path) for path in paths),
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            schemas = {
+                os.path.basename(path): setup.infer_csv_schema(path)
+                for path in paths
+            }
+        return [
+            measure(
+                "upload_csv_files", connection, setup.upload_csv_files,
+                cursor, directory, paths, **details
+            ),
+            measure(
+                "create_tables", connection, setup.create_tables,
+                cursor, list(schemas), schemas, **details
+            ),
+        ]
+
+
+def benchmark_roles():
+    """
+    Set up the roles, grants and users on an empty account, then again on
+    the provisioned account.
+
+    Returns:
+        list: Results of the cold and warm runs.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    return [
+        measure(
+            f"sync_roles_and_users ({run})", connection,
+            setup.sync_roles_and_users, cursor
+        )
+        for run in ("cold", "warm")
+    ]
+
+
+def print_results(results):
+    """
+    Print the benchmark results as a table.
+
+    Args:
+        results (list): Benchmark results.
+    """
+    print(
+        f"{'CASE':<30} {'FILES':>6} {'ROWS':>8} {'BYTES':>11} "
+        f"{'SECONDS':>8} {'TRIPS':>6} {'FAILS':>6}"
+    )
+    for result in results:
+        print(
+            f"{result['case']:<30} {result.get('files', ''):>6} "
+            f"{result.get('rows', ''):>8} {result.get('bytes', ''):>11} "
+            f"{result['seconds']:>8.2f} {result['round_trips']:>6} "
+            f"{result['failures']:>6}"
+        )
+        if result["error"]:
+            print(f"    {result['error']}")
+
+
+def main():
+    """
+    Main function to run the benchmarks and record their results. The run
+    fails when a case reports an error and no failure is injected.
+    """
+    config = {
+        "latency": LATENCY,
+        "byte_cost": BYTE_COST,
+        "failure_rate": FAILURE_RATE,
+        "failure_pattern": FAILURE_PATTERN,
+        "seed": SEED,
+        "poll_interval": POLL_INTERVAL,
+    }
+    print(f"Simulated Snowflake: {json.dumps(config)}")
+
+    poll_interval = setup.POLL_INTERVAL
+    setup.POLL_INTERVAL = POLL_INTERVAL
+    try:
+        results = benchmark_main()
+        for file_count in FILE_COUNTS:
+            results += benchmark_loads(file_count, BASE_ROWS)
+        for file_rows in FILE_ROWS:
+            results += benchmark_loads(1, file_rows)
+        results += benchmark_roles()
+    finally:
+        setup.POLL_INTERVAL = poll_interval
+    print_results(results)
+
+    # Record the results for comparison with other runs
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+    with open(OUTPUT_PATH, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(
+                json.dumps({"run_id": run_id, **config, **result}) + "\n"
+            )
+    print(f"Results appended to {OUTPUT_PATH}.")
+
+    failed = [result["case"] for result in results if result["error"]]
+    if failed and not FAILURE_RATE:
+        raise SystemExit(f"Benchmark cases failed: {', '.join(failed)}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+
+"""
+SCRIPT: generate_swiftauto_traders.py
+AUTHOR: Pravin Regismond
+DATE: 2026-10-18
+DESCRIPTION: This script generates a scaled copy of the Automotive Industry
+             sample data for load testing. Dealers, sales, sentiment and
+             recalls are generated at a chosen scale factor with the
+             schemas, keys and value distributions of the bundled CSV
+             files. Rows are written in fixed-size blocks, each generated
+             from its own seed, so the output is identical for any number
+             of worker processes and memory use does not grow with the
+             output size.
+
+AUDIT TRAIL START                               INIT  DATE
+----------------------------------------------  ----- -----------
+1. Initial version                              PR    2026-10-18
+
+AUDIT TRAIL END
+"""
+
+# Importing the required libraries
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+from multiprocessing import Pool
+
+# Generation settings, overridable through environment variables. A scale
+# factor of 1 produces as many rows as the bundled files.
+SCALE = float(os.getenv('SWIFTAUTO_GEN_SCALE', '1'))
+SEED = int(os.getenv('SWIFTAUTO_GEN_SEED', '42'))
+WORKERS = int(os.getenv('SWIFTAUTO_GEN_WORKERS', '1'))
+BLOCK_ROWS = int(os.getenv('SWIFTAUTO_GEN_BLOCK_ROWS', '1000000'))
+OUTPUT_DIR = os.getenv('SWIFTAUTO_GEN_OUTPUT', './Automotive_Industry_Scaled/')
+TABLES = os.getenv(
+    'SWIFTAUTO_GEN_TABLES',
+    'AU_Dealers,AU_Sales_By_Model,AU_Sentiment,AU_Car_Recalls'
+).split(',')
+
+# Bundled CSV files whose schemas and value distributions are reproduced
+SOURCE_DIR = './Automotive_Industry/'
+
+# Synthetic dealers get IDs above the bundled ones and Zip Codes below the
+# bundled Colorado ones, reused once all of them are taken
+SYNTHETIC_DEALER_ID = 10000
+SYNTHETIC_ZIP_CODES = range(10000, 80000)
+
+
+def read_csv(name):
+    """
+    Read a bundled CSV file.
+
+    Args:
+        name (str): File name without extension.
+
+    Returns:
+        tuple: Header and data rows, as lists of strings.
+    """
+    with open(os.path.join(SOURCE_DIR, f"{name}.csv"), newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        return header, list(reader)
+
+
+def load_profile():
+    """
+    Collect the headers, keys and values of the bundled CSV files that the
+    generated rows are drawn from.
+
+    Returns:
+        dict: Headers keyed by table name, dealers in sales order with their
+            Zip Codes, sales months with the date used by each dealer,
+            quantity and profit pairs by model, and the sentiment and recall
+            rows.
+    """
+    dealers_header, dealers = read_csv("AU_Dealers")
+    sales_header, sales = read_csv("AU_Sales_By_Model")
+    sentiment_header, sentiment = read_csv("AU_Sentiment")
+    recalls_header, recalls = read_csv("AU_Car_Recalls")
+
+    # Months, models and dealers in the order of the sales file
+    months, models, dealer_ids, dates, amounts = [], [], [], {}, {}
+    for year, month, date, model, dealer_id, quantity, profit in sales:
+        if (year, month) not in months:
+            months.append((year, month))
+        if model not in models:
+            models.append(model)
+        if dealer_id not in dealer_ids:
+            dealer_ids.append(dealer_id)
+        dates[(year, month, dealer_id)] = date
+        amounts.setdefault(model, []).append((quantity, profit))
+
+    zip_codes = {row[0]: row[4] for row in dealers}
+    return {
+        "headers": {
+            "AU_Dealers": dealers_header,
+            "AU_Sales_By_Model": sales_header,
+            "AU_Sentiment": sentiment_header,
+            "AU_Car_Recalls": recalls_header,
+        },
+        "dealers": dealers,
+        "dealer_ids": dealer_ids,
+        "dealer_zip_codes": [zip_codes[dealer] for dealer in dealer_ids],
+        "months": months,
+        "models": models,
+        "dates": dates,
+        "amounts": amounts,
+        "sentiment": [row[1:] for row in sentiment],
+        "recalls": recalls,
+    }
+
+
+def table_rows(profile, scale):
+    """
+    Compute the number of rows of each generated table.
+
+    Args:
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+
+    Returns:
+        dict: Row counts keyed by table name.
+    """
+    dealers = dealer_count(profile, scale)
+    return {
+        "AU_Dealers": dealers,
+        "AU_Sales_By_Model": (
+            dealers * len(profile["months"]) * len(profile["models"])
+        ),
+        "AU_Sentiment": max(1, round(len(profile["sentiment"]) * scale)),
+        "AU_Car_Recalls": max(1, round(len(profile["recalls"]) * scale)),
+    }
+
+
+def dealer_count(profile, scale):
+    """
+    Compute the number of generated dealers.
+
+    Args:
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+
+    Returns:
+        int: Number of dealers.
+    """
+    return max(1, round(len(profile["dealer_ids"]) * scale))
+
+
+def dealer_key(profile, index):
+    """
+    Return the Dealer ID and Zip Code of a dealer. The first dealers are
+    the bundled ones.
+
+    Args:
+        profile (dict): Source profile, as returned by load_profile.
+        index (int): Dealer index.
+
+    Returns:
+        tuple: Dealer ID and Zip Code.
+    """
+    if index < len(profile["dealer_ids"]):
+        return (profile["dealer_ids"][index],
+                profile["dealer_zip_codes"][index])
+    synthetic = index - len(profile["dealer_ids"])
+    return (
+        str(SYNTHETIC_DEALER_ID + synthetic),
+        str(SYNTHETIC_ZIP_CODES[synthetic % len(SYNTHETIC_ZIP_CODES)])
+    )
+
+
+def dealer_rows(rng, profile, scale, start, stop):
+    """
+    Generate dealers, starting with the bundled ones. Synthetic dealers
+    take the location of a bundled dealer with a new address, name and
+    contact.
+
+    Args:
+        rng (random.Random): Random generator of the block.
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+        start (int): Index of the first row.
+        stop (int): Index after the last row.
+
+    Yields:
+        list: Dealer row.
+    """
+    dealers = profile["dealers"]
+    for index in range(start, stop):
+        if index < len(dealers):
+            yield dealers[index]
+            continue
+        base = dealers[index % len(dealers)]
+        dealer_id, zip_code = dealer_key(profile, index)
+        street = base[5].split(" ", 1)[1]
+        contact = rng.choice(dealers)[7].split(" ", 1)[0]
+        surname = rng.choice(dealers)[7].split(" ", 1)[1]
+        area_code = base[8].split(")", 1)[0]
+        yield [
+            dealer_id, base[1], base[2], base[3], zip_code,
+            f"{rng.randint(100, 9999)} {street}",
+            f"{base[6]} {index // len(dealers)}",
+            f"{contact} {surname}",
+            f"{area_code}) 555-{rng.randrange(10000):04d}",
+            f"{float(base[9]) + rng.uniform(-0.05, 0.05):.6f}",
+            f"{float(base[10]) + rng.uniform(-0.05, 0.05):.6f}",
+        ]
+
+
+def sales_rows(rng, profile, scale, start, stop):
+    """
+    Generate one sales row per month, dealer and model, in the order of the
+    bundled file, with the quantity and profit of a bundled sale of the
+    same model.
+
+    Args:
+        rng (random.Random): Random generator of the block.
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+        start (int): Index of the first row.
+        stop (int): Index after the last row.
+
+    Yields:
+        list: Sales row.
+    """
+    models = profile["models"]
+    dealers = dealer_count(profile, scale)
+    bundled_ids = profile["dealer_ids"]
+    for index in range(start, stop):
+        year, month = profile["months"][index // (dealers * len(models))]
+        dealer = index // len(models) % dealers
+        model = models[index % len(models)]
+        dealer_id = dealer_key(profile, dealer)[0]
+        date = profile["dates"][
+            (year, month, bundled_ids[dealer % len(bundled_ids)])
+        ]
+        quantity, profit = rng.choice(profile["amounts"][model])
+        yield [year, month, date, model, dealer_id, quantity, profit]
+
+
+def sentiment_rows(rng, profile, scale, start, stop):
+    """
+    Generate sentiment rows drawn from the bundled ones, for the Zip Code of
+    a random dealer.
+
+    Args:
+        rng (random.Random): Random generator of the block.
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+        start (int): Index of the first row.
+        stop (int): Index after the last row.
+
+    Yields:
+        list: Sentiment row.
+    """
+    dealers = dealer_count(profile, scale)
+    for _ in range(start, stop):
+        zip_code = dealer_key(profile, rng.randrange(dealers))[1]
+        yield [zip_code, *rng.choice(profile["sentiment"])]
+
+
+def recall_rows(rng, profile, scale, start, stop):
+    """
+    Generate recall rows drawn from the bundled ones, keeping the Car_ID and
+    Model of each recall together.
+
+    Args:
+        rng (random.Random): Random generator of the block.
+        profile (dict): Source profile, as returned by load_profile.
+        scale (float): Scale factor.
+        start (int): Index of the first row.
+        stop (int): Index after the last row.
+
+    Yields:
+        list: Recall row.
+    """
+    for _ in range(start, stop):
+        yield rng.choice(profile["recalls"])
+
+
+# Row generator of each table
+GENERATORS = {
+    "AU_Dealers": dealer_rows,
+    "AU_Sales_By_Model": sales_rows,
+    "AU_Sentiment": sentiment_rows,
+    "AU_Car_Recalls": recall_rows,
+}
+
+# Source profile of the worker processes
+_profile = None
+
+
+def init_worker(profile):
+    """
+    Store the source profile in a worker process.
+
+    Args:
+        profile (dict): Source profile, as returned by load_profile.
+    """
+    global _profile
+    _profile = profile
+
+
+def write_block(task):
+    """
+    Write one block of rows to a part file, with a random generator seeded
+    by the table and block, so the block is the same whichever process
+    writes it.
+
+    Args:
+        task (tuple): Table name, block index, first and last row indexes,
+            part file path, seed and scale factor.
+
+    Returns:
+        str: Part file path.
+    """
+    table, block, start, stop, path, seed, scale = task
+    rng = random.Random(f"{seed}:{table}:{block}")
+    with open(path, "w", newline='') as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerows(
+            GENERATORS[table](rng, _profile, scale, start, stop)
+        )
+    return path
+
+
+def generate_table(pool, profile, table, rows, output_dir, seed, scale,
+                   block_rows=BLOCK_ROWS):
+    """
+    Generate a table block by block and concatenate the blocks, in order,
+    into its CSV file.
+
+    Args:
+        pool (multiprocessing.pool.Pool): Worker pool, None to generate in
+            this process.
+        profile (dict): Source profile, as returned by load_profile.
+        table (str): Table name.
+        rows (int): Number of rows.
+        output_dir (str): Output directory.
+        seed (int): Random seed.
+        scale (float): Scale factor.
+        block_rows (int): Number of rows per block.
+
+    Returns:
+        str: Path of the generated CSV file.
+    """
+    path = os.path.join(output_dir, f"{table}.csv")
+    with tempfile.TemporaryDirectory(dir=output_dir) as parts_dir:
+        tasks = [
+            (table, block, start, min(start + block_rows, rows),
+             os.path.join(parts_dir, f"{block:08d}.csv"), seed, scale)
+            for block, start in enumerate(range(0, rows, block_rows))
+        ]
+        parts = (pool.imap(write_block, tasks) if pool
+                 else map(write_block, tasks))
+        with open(path, "w", newline='') as f:
+            csv.writer(f, lineterminator="\n").writerow(
+                profile["headers"][table]
+            )
+            for part in parts:
+                with open(part, newline='') as part_file:
+                    shutil.copyfileobj(part_file, f)
+                os.remove(part)
+    return path
+
+
+def main():
+    """
+    Main function to generate the scaled dataset.
+    """
+    profile = load_profile()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Car models are a fixed list referenced by Car_ID
+    shutil.copy(os.path.join(SOURCE_DIR, "AU_Car_Models.csv"), OUTPUT_DIR)
+
+    counts = table_rows(profile, SCALE)
+    pool = Pool(WORKERS, init_worker, (profile,)) if WORKERS > 1 else None
+    init_worker(profile)
+    try:
+        for table in TABLES:
+            start = time.perf_counter()
+            path = generate_table(
+                pool, profile, table, counts[table], OUTPUT_DIR, SEED, SCALE
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"Generated {path}: {counts[table]} rows, "
+                f"{os.path.getsize(path) / 1e6:.1f} MB in {elapsed:.2f}s "
+                f"({counts[table] / max(elapsed, 1e-9):,.0f} rows/s)."
+            )
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+
+"""
+SCRIPT: local_session_swiftauto_traders.py
+AUTHOR: Pravin Regismond
+DATE: 2026-10-18
+DESCRIPTION: This module provides a local stand-in for the Snowpark session
+             used by streamlit_swiftauto_traders.py. It loads the CSV files
+             of the dataset into an in-memory DuckDB database, with the
+             table names, column names and types of the tables created by
+             setup_swiftauto_traders.py, and runs the queries of the app,
+             so the dashboard can be developed and timed without a
+             Snowflake account.
+
+AUDIT TRAIL START                               INIT  DATE
+----------------------------------------------  ----- -----------
+1. Initial version                              PR    2026-10-18
+2. Accepted the statement parameters of the     PR    2026-10-18
+   queries.
+3. Parsed the recall dates with weekday and     PR    2026-10-18
+   month names as DATE.
+
+AUDIT TRAIL END
+"""
+
+# Importing the required libraries
+import glob
+import os
+import re
+import textwrap
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import duckdb
+import pyarrow as pa
+import setup_swiftauto_traders as setup
+
+# Simulated warehouse behaviour, overridable through environment variables
+LATENCY = float(os.getenv('SWIFTAUTO_LOCAL_LATENCY', '0'))
+WORKERS = int(os.getenv('SWIFTAUTO_LOCAL_WORKERS', '4'))
+
+# Rows per Arrow record batch returned by fetch_arrow_batches
+BATCH_ROWS = 65536
+
+# DuckDB types of the Snowflake types inferred by the setup script. Integers
+# are stored as BIGINT, which DuckDB parses much faster than DECIMAL(38, 0)
+TYPE_REWRITES = (
+    (re.compile(r"\bNUMBER\(38, 0\)"), "BIGINT"),
+    (re.compile(r"\bNUMBER\("), "DECIMAL("),
+    (re.compile(r"\bTIMESTAMP_NTZ\b"), "TIMESTAMP"),
+)
+
+# DuckDB has no LAST_ALTERED column, so the table versions are read from a
+# table maintained by the session
+DIALECT_REWRITES = (
+    (
+        re.compile(r"\b(?:\w+\.)?INFORMATION_SCHEMA\.TABLES\b", re.I),
+        "LOCAL_METADATA.TABLES"
+    ),
+)
+
+# strptime formats of the date formats detected by the setup script
+DATE_FORMATS = {
+    'YYYY-MM-DD': '%Y-%m-%d',
+    'MM/DD/YYYY': '%m/%d/%Y',
+    'DAY, MMMM DD, YYYY': '%A, %B %d, %Y',
+}
+
+
+def translate(query):
+    """
+    Translate a Snowflake query into the DuckDB dialect.
+
+    Args:
+        query (str): Snowflake SQL query.
+
+    Returns:
+        str: DuckDB SQL query.
+    """
+    for pattern, replacement in DIALECT_REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def column_expression(column):
+    """
+    Build the expression converting a CSV value read as text to the type of
+    its column, treating the NULL_IF values of CSV_FF as NULL.
+
+    Args:
+        column (dict): Column description from infer_csv_schema.
+
+    Returns:
+        str: SQL expression.
+    """
+    name = f'"{column["name"].upper()}"'
+    value = f"NULLIF(TRIM({name}), '')"
+    column_type = column["type"]
+    for pattern, replacement in TYPE_REWRITES:
+        column_type = pattern.sub(replacement, column_type)
+    if column_type == "DATE" and column.get("format") in DATE_FORMATS:
+        return (
+            f"CAST(STRPTIME({value}, '{DATE_FORMATS[column['format']]}') "
+            f"AS DATE) AS {name}"
+        )
+    return f"CAST({value} AS {column_type}) AS {name}"
+
+
+class LocalSession:
+    """
+    Stand-in for snowflake.snowpark.Session backed by DuckDB.
+
+    Args:
+        dataset_dir (str): Directory containing the CSV files.
+        rollups (bool): Whether to create the rollup tables of the setup
+            script.
+        latency (float): Seconds added to every query.
+        workers (int): Number of queries run at the same time.
+    """
+
+    def __init__(self, dataset_dir=setup.DATASET_DIR, rollups=True,
+                 latency=LATENCY, workers=WORKERS):
+        self.latency = latency
+        self.database = duckdb.connect()
+        self.connection = LocalConnection(self)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._jobs = {}
+        self._last_altered = 0.0
+        self.database.execute(
+            """
+            CREATE SCHEMA AUTOMOTIVE;
+            CREATE SCHEMA LOCAL_METADATA;
+            CREATE TABLE LOCAL_METADATA.TABLES (
+                TABLE_SCHEMA VARCHAR,
+                TABLE_NAME VARCHAR,
+                LAST_ALTERED DOUBLE
+            );
+            USE AUTOMOTIVE;
+            """
+        )
+        paths = sorted(glob.glob(os.path.join(dataset_dir, "*.csv")))
+        if not paths:
+            raise FileNotFoundError(f"No CSV files found in {dataset_dir}")
+        for path in paths:
+            self.load_csv_file(path)
+        if rollups:
+            self.create_rollup_tables()
+
+    def touch(self, table_name):
+        """
+        Record a change to a table, with a LAST_ALTERED time later than any
+        before.
+
+        Args:
+            table_name (str): Table name in the AUTOMOTIVE schema.
+        """
+        self._last_altered = max(time.time(), self._last_altered + 0.001)
+        self.database.execute(
+            "DELETE FROM LOCAL_METADATA.TABLES WHERE TABLE_NAME = ?",
+            [table_name]
+        )
+        self.database.execute(
+            "INSERT INTO LOCAL_METADATA.TABLES VALUES ('AUTOMOTIVE', ?, ?)",
+            [table_name, self._last_altered]
+        )
+
+    def load_csv_file(self, path):
+        """
+        Create and load the table of a CSV file as the setup script does.
+
+        Args:
+            path (str): Path to the CSV file.
+        """
+        table_name = setup.stage_table_name(os.path.basename(path))
+        columns = setup.infer_csv_schema(path)
+        ddl = setup.create_table_ddl(table_name, columns)
+        for pattern, replacement in TYPE_REWRITES:
+            ddl = pattern.sub(replacement, ddl)
+        names = ", ".join(f"'{column['name'].upper()}'" for column in columns)
+        expressions = ",\n    ".join(
+            column_expression(column) for column in columns
+        )
+        self.database.execute(ddl)
+        self.database.execute(
+            f"""
+            INSERT INTO {table_name}
+            SELECT {expressions}
+            FROM read_csv(
+                '{path.replace("'", "''")}', header = true,
+                all_varchar = true, names = [{names}],
+                nullstr = ['\\N', 'NULL']
+            );
+            """
+        )
+        self.touch(table_name)
+
+    def create_rollup_tables(self):
+        """
+        Create the rollup tables of the setup script.
+        """
+        for name, (source, query) in setup.ROLLUP_TABLES.items():
+            self.database.execute(
+                f"CREATE OR REPLACE TABLE {name} AS"
+                f"{textwrap.dedent(query)}"
+            )
+            self.touch(name)
+
+    def sql(self, query, params=None):
+        """
+        Create a dataframe for a query.
+
+        Args:
+            query (str): Snowflake SQL query.
+            params (list): Bind parameters.
+
+        Returns:
+            LocalDataFrame: Dataframe of the query.
+        """
+        return LocalDataFrame(self, query, params)
+
+    def submit(self, query, params=None):
+        """
+        Run a query in the background.
+
+        Args:
+            query (str): Snowflake SQL query.
+            params (list): Bind parameters.
+
+        Returns:
+            LocalAsyncJob: Running query.
+        """
+        query_id = str(uuid.uuid4())
+        future = self._executor.submit(self._run, translate(query), params)
+        self._jobs[query_id] = future
+        return LocalAsyncJob(query_id, future)
+
+    def _run(self, query, params):
+        """
+        Run a query on its own DuckDB cursor.
+
+        Args:
+            query (str): DuckDB SQL query.
+            params (list): Bind parameters.
+
+        Returns:
+            tuple: Column descriptions and Arrow record batches.
+        """
+        time.sleep(self.latency)
+        cursor = self.database.cursor()
+        try:
+            cursor.execute(query, params or [])
+            description = cursor.description
+            batches = [
+                pa.Table.from_batches([batch])
+                for batch in cursor.to_arrow_reader(BATCH_ROWS)
+            ]
+        finally:
+            cursor.close()
+        return description, batches
+
+    def result(self, query_id):
+        """
+        Wait for the result of a query.
+
+        Args:
+            query_id (str): Query ID.
+
+        Returns:
+            tuple: Column descriptions and Arrow record batches.
+        """
+        return self._jobs.pop(query_id).result()
+
+    def close(self):
+        """
+        Close the session.
+        """
+        self._executor.shutdown()
+        self.database.close()
+
+
+class LocalDataFrame:
+    """
+    Stand-in for snowflake.snowpark.DataFrame created by Session.sql.
+
+    Args:
+        session (LocalSession): Local session.
+        query (str): Snowflake SQL query.
+        params (list): Bind parameters.
+    """
+
+    def __init__(self, session, query, params=None):
+        self.session = session
+        self.query = query
+        self.params = params
+
+    def collect_nowait(self, statement_params=None):
+        """
+        Run the query without waiting for its result.
+
+        Args:
+            statement_params (dict): Session parameters of the query, such
+                as QUERY_TAG, which DuckDB has no use for.
+
+        Returns:
+            LocalAsyncJob: Running query.
+        """
+        return self.session.submit(self.query, self.params)
+
+    def to_arrow(self):
+        """
+        Run the query.
+
+        Returns:
+            pyarrow.Table: Query result.
+        """
+        job = self.collect_nowait()
+        description, batches = self.session.result(job.query_id)
+        if not batches:
+            return pa.table({column[0]: [] for column in description})
+        return pa.concat_tables(batches)
+
+    def to_pandas(self):
+        """
+        Run the query.
+
+        Returns:
+            pandas.DataFrame: Query result.
+        """
+        return self.to_arrow().to_pandas()
+
+    def collect(self):
+        """
+        Run the query.
+
+        Returns:
+            list: Rows as tuples.
+        """
+        return list(zip(*(
+            column.to_pylist() for column in self.to_arrow().columns
+        )))
+
+
+class LocalAsyncJob:
+    """
+    Stand-in for snowflake.snowpark.AsyncJob.
+
+    Args:
+        query_id (str): Query ID.
+        future (concurrent.futures.Future): Running query.
+    """
+
+    def __init__(self, query_id, future):
+        self.query_id = query_id
+        self._future = future
+
+    def is_done(self):
+        """
+        Check whether the query has completed.
+
+        Returns:
+            bool: True if the query has completed.
+        """
+        return self._future.done()
+
+
+class LocalConnection:
+    """
+    Stand-in for the connector connection of a Snowpark session.
+
+    Args:
+        session (LocalSession): Local session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    def cursor(self):
+        """
+        Open a new cursor on the connection.
+
+        Returns:
+            LocalCursor: Cursor object.
+        """
+        return LocalCursor(self.session)
+
+
+class LocalCursor:
+    """
+    Stand-in for snowflake.connector.cursor.SnowflakeCursor, fetching the
+    results of queries run by the local session.
+
+    Args:
+        session (LocalSession): Local session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.description = None
+        self._batches = []
+
+    def get_results_from_sfqid(self, query_id):
+        """
+        Wait for a query and make its result current.
+
+        Args:
+            query_id (str): Query ID.
+        """
+        self.description, self._batches = self.session.result(query_id)
+
+    def fetch_arrow_batches(self):
+        """
+        Fetch the current result.
+
+        Returns:
+            iterator: Arrow tables of the result, one per record batch.
+        """
+        return iter(self._batches)
+
+    def close(self):
+        """
+        Close the cursor.
+        """
+        self._batches = []
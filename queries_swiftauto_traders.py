@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+SCRIPT: queries_swiftauto_traders.py
+AUTHOR: Pravin Regismond
+DATE: 2026-10-18
+DESCRIPTION: This module holds the queries of the raw tables run by
+             streamlit_swiftauto_traders.py and the conditions its sidebar
+             filters add to them. The app builds its panels from them, and
+             setup_swiftauto_traders.py reads them to propose clustering
+             keys for the tables the dashboard filters.
+
+AUDIT TRAIL START                               INIT  DATE
+----------------------------------------------  ----- -----------
+1. Initial version                              PR    2026-10-18
+
+AUDIT TRAIL END
+"""
+
+# Queries of the raw tables; {where} receives the conditions of the sidebar
+# filters. Every sales panel is computed from a single scan of the sales
+# table, with one grouping set per panel
+SALES_AGGREGATES_QUERY = """
+    SELECT CASE
+               WHEN GROUPING(MODEL) = 0 THEN 'Model'
+               WHEN GROUPING(DEALER_ID) = 0 THEN 'Dealer ID'
+               WHEN GROUPING(MONTH_NUMBER) = 0 THEN 'Month'
+               ELSE 'Total'
+           END AS "Grain",
+           MODEL AS "Model",
+           DEALER_ID AS "Dealer ID",
+           MONTH AS "Month",
+           MONTH_NUMBER AS "Month Number",
+           SUM(QUANTITY_SOLD) AS "Quantity Sold (Sum)",
+           SUM(PROFIT) AS "Profit (Sum)",
+           ROUND(AVG(QUANTITY_SOLD), 3) AS "Average Quantity Sold"
+    FROM (
+        SELECT MODEL,
+               DEALER_ID,
+               MONTH,
+               MONTH(DATE) AS MONTH_NUMBER,
+               QUANTITY_SOLD,
+               PROFIT
+        FROM AUTOMOTIVE.AU_SALES_BY_MODEL
+        {where}
+    )
+    GROUP BY GROUPING SETS (
+        (),
+        (MODEL),
+        (DEALER_ID),
+        (MONTH, MONTH_NUMBER)
+    )
+"""
+
+RECALLS_BY_MODEL_QUERY = """
+    SELECT MODEL AS "Model"
+    , SUM(UNITS) AS "Total Recalls"
+    FROM AUTOMOTIVE.AU_CAR_RECALLS
+    {where}
+    GROUP BY MODEL
+"""
+
+SENTIMENT_HIERARCHY_QUERY = """
+    SELECT SENTIMENT AS "Sentiment",
+           COUNT(*) AS "Sentiment (Count)"
+    FROM AUTOMOTIVE.AU_SENTIMENT
+    {where}
+    GROUP BY SENTIMENT
+    ORDER BY "Sentiment (Count)" DESC;
+"""
+
+MODEL_AFFECTED_SYSTEM_QUERY = """
+    SELECT MODEL,
+        SYSTEM_AFFECTED,
+        SUM(UNITS) AS UNITS
+    FROM AUTOMOTIVE.AU_CAR_RECALLS
+    {where}
+    GROUP BY MODEL,
+        SYSTEM_AFFECTED
+"""
+
+# Query of the raw tables behind each result of the dashboard, and the
+# source filtered by its conditions
+RAW_QUERIES = {
+    'sales': SALES_AGGREGATES_QUERY,
+    'recalls_by_model': RECALLS_BY_MODEL_QUERY,
+    'sentiment_hierarchy': SENTIMENT_HIERARCHY_QUERY,
+    'model_affected_system': MODEL_AFFECTED_SYSTEM_QUERY,
+}
+QUERY_SOURCES = {
+    'sales': 'sales',
+    'recalls_by_model': 'recalls',
+    'sentiment_hierarchy': 'sentiment',
+    'model_affected_system': 'recalls',
+}
+
+# Table of each source
+SOURCE_TABLES = {
+    'sales': 'AU_SALES_BY_MODEL',
+    'recalls': 'AU_CAR_RECALLS',
+    'sentiment': 'AU_SENTIMENT',
+}
+
+# Condition added by each sidebar filter to the queries of the sales,
+# recalls and sentiment tables, the {} receiving one ? bind parameter per
+# selected value. Dealers and states select the sentiment of their zip codes.
+# The Date filter binds the first day and the day after the last one of the
+# range, compared with the DATE column of every table
+FILTERS = {
+    'Year': {
+        'sales': 'YEAR IN ({})',
+        'recalls': 'YEAR(DATE) IN ({})',
+        'sentiment': 'YEAR IN ({})',
+    },
+    'Date': {
+        'sales': 'DATE >= ? AND DATE < ?',
+        'recalls': 'DATE >= ? AND DATE < ?',
+        'sentiment': 'DATE >= ? AND DATE < ?',
+    },
+    'Model': {
+        'sales': 'MODEL IN ({})',
+        'recalls': 'MODEL IN ({})',
+    },
+    'Dealer ID': {
+        'sales': 'DEALER_ID IN ({})',
+        'sentiment': (
+            'POSTAL_CODE IN (SELECT ZIP_CODE FROM AUTOMOTIVE.AU_DEALERS '
+            'WHERE DEALER_ID IN ({}))'
+        ),
+    },
+    'State': {
+        'sales': (
+            'DEALER_ID IN (SELECT DEALER_ID FROM AUTOMOTIVE.AU_DEALERS '
+            'WHERE STATE IN ({}))'
+        ),
+        'sentiment': (
+            'POSTAL_CODE IN (SELECT ZIP_CODE FROM AUTOMOTIVE.AU_DEALERS '
+            'WHERE STATE IN ({}))'
+        ),
+    },
+}
+
+
+def dashboard_workload():
+    """
+    Describe the queries of the raw tables run by the dashboard, with the
+    conditions its sidebar filters add to them.
+
+    Returns:
+        list: One dictionary per query, with the query name, the SQL text
+            and its {where} placeholder, the table the conditions apply to
+            and the conditions.
+    """
+    return [
+        {
+            "query": name,
+            "sql": query,
+            "table": SOURCE_TABLES[QUERY_SOURCES[name]],
+            "conditions": [
+                conditions[QUERY_SOURCES[name]]
+                for conditions in FILTERS.values()
+                if QUERY_SOURCES[name] in conditions
+            ],
+        }
+        for name, query in RAW_QUERIES.items()
+    ]
@@ -17,15 +17,297 @@ AUDIT TRAIL START                               INIT  DATE
    REPLACE USER statements for documentation.
 3. Added DATA_ANALYST functional role for       PR    2024-11-18
    documentation.
+4. Added concurrent, batched stage uploads      PR    2026-10-18
+   with an upload summary.
+5. Added a content-hash manifest to skip        PR    2026-10-18
+   unchanged files and purge stale stage files.
+6. Normalized CSV headers before upload to      PR    2026-10-18
+   replace the per-column RENAME statements.
+7. Replaced INFER_SCHEMA with local schema      PR    2026-10-18
+   inference cached by file hash.
+8. Added gzip, zstd and Parquet staging         PR    2026-10-18
+   formats with size and load time reporting.
+9. Split large CSV files into chunks loaded     PR    2026-10-18
+   by a single pattern-based COPY.
+10. Loaded tables concurrently using            PR    2026-10-18
+    asynchronous queries.
+11. Replaced the role and user statements with  PR    2026-10-18
+    a desired-state diff sent in one batch.
+12. Added per-statement telemetry written to    PR    2026-10-18
+    JSON lines with a slowest steps summary.
+13. Added SWIFTAUTO_DATASET_DIR to load a       PR    2026-10-18
+    generated dataset.
+14. Added rollup tables summarizing the sales,  PR    2026-10-18
+    recalls and sentiment for the dashboard.
+15. Added an append mode loading only the       PR    2026-10-18
+    lines appended to a file since its load.
+16. Proposed clustering keys for large tables   PR    2026-10-18
+    from the dashboard filters, with pruning.
+17. Loaded every detected date format as DATE   PR    2026-10-18
+    through a COPY transform.
+18. Read the dashboard queries from             PR    2026-10-18
+    queries_swiftauto_traders.py.
+19. Kept the current telemetry step per thread  PR    2026-10-18
+    and copied it into the upload workers.
+20. Read the load concurrency and poll         PR    2026-10-18
+    interval when the pipelines run.
 
 AUDIT TRAIL END
 """
 
 # Importing the required libraries
 import os
+import contextlib
+import contextvars
+import csv
+import decimal
 import glob
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import queue
+import re
+import shutil
+import tempfile
+import textwrap
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import snowflake.connector as sf
 from snowflake.connector.errors import ProgrammingError
+import queries_swiftauto_traders as dashboard
+
+# Optional libraries for the zstd and Parquet staging formats
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pyarrow = None
+
+# Directory containing the CSV files loaded into tables
+DATASET_DIR = os.getenv('SWIFTAUTO_DATASET_DIR', './Automotive_Industry/')
+
+# Upload tuning, overridable through environment variables
+UPLOAD_WORKERS = int(os.getenv('SWIFTAUTO_UPLOAD_WORKERS', '4'))
+PUT_PARALLEL = int(os.getenv('SWIFTAUTO_PUT_PARALLEL', '4'))
+SMALL_FILE_BYTES = int(os.getenv('SWIFTAUTO_SMALL_FILE_BYTES', '1048576'))
+
+# Local record of the files uploaded and loaded by previous runs
+MANIFEST_PATH = os.getenv(
+    'SWIFTAUTO_MANIFEST', './setup_swiftauto_traders.manifest.json'
+)
+FORCE_RELOAD = os.getenv('SWIFTAUTO_FORCE_RELOAD', '') == '1'
+
+# Loading mode of changed files: replace reloads their table in full, and
+# append only loads the lines appended since their last load into the
+# existing table, reloading it in full when the file was otherwise changed
+# or the new lines no longer fit the schema of the table
+LOAD_MODE = os.getenv('SWIFTAUTO_LOAD_MODE', 'replace')
+
+# Directory receiving the prepared copies of the CSV files before upload
+BUILD_DIR = os.getenv('SWIFTAUTO_BUILD_DIR', './.swiftauto_build')
+
+# Format of the prepared files uploaded to the stage, with their extension
+STAGE_FORMAT = os.getenv('SWIFTAUTO_STAGE_FORMAT', 'gzip')
+STAGE_EXTENSIONS = {
+    'csv': '.csv',
+    'gzip': '.csv.gz',
+    'zstd': '.csv.zst',
+    'parquet': '.parquet',
+}
+
+# Maximum number of tables created and loaded at the same time, and the
+# interval between polls of the status of their asynchronous queries
+LOAD_CONCURRENCY = int(os.getenv('SWIFTAUTO_LOAD_CONCURRENCY', '4'))
+POLL_INTERVAL = float(os.getenv('SWIFTAUTO_POLL_INTERVAL', '0.25'))
+
+# CSV files larger than this are split into chunks of about this size
+SPLIT_FILE_BYTES = int(os.getenv('SWIFTAUTO_SPLIT_FILE_BYTES', '268435456'))
+
+# JSON-lines file receiving the statement timings of every run, and the
+# number of slowest statements printed at the end of the run
+TELEMETRY_PATH = os.getenv(
+    'SWIFTAUTO_TELEMETRY', './setup_swiftauto_traders.telemetry.jsonl'
+)
+TELEMETRY_TOP = int(os.getenv('SWIFTAUTO_TELEMETRY_TOP', '10'))
+
+# The dashboard queries and filters of queries_swiftauto_traders.py are
+# read to propose clustering keys for the tables of at least
+# CLUSTER_MIN_BYTES, with at most CLUSTER_KEY_COLUMNS columns. Keys are only
+# applied when CLUSTER_APPLY is set, as Automatic Clustering consumes credits
+CLUSTER_MIN_BYTES = int(os.getenv('SWIFTAUTO_CLUSTER_MIN_BYTES', '1073741824'))
+CLUSTER_KEY_COLUMNS = int(os.getenv('SWIFTAUTO_CLUSTER_KEY_COLUMNS', '3'))
+CLUSTER_APPLY = os.getenv('SWIFTAUTO_CLUSTER_APPLY', '') == '1'
+
+# Number of rows sampled by the local schema inference, 0 for all rows
+INFER_SAMPLE_ROWS = int(os.getenv('SWIFTAUTO_INFER_SAMPLE_ROWS', '10000'))
+
+# Version of the column descriptions of the local schema inference. Tables
+# loaded with the schema of an earlier version are reloaded
+SCHEMA_VERSION = 3
+
+# Values loaded as SQL NULL, matching the NULL_IF option of CSV_FF
+NULL_VALUES = frozenset(('\\N', 'NULL', ''))
+
+# Value patterns recognized by the local schema inference, in order of
+# preference, with the Snowflake format of each date pattern
+INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+DECIMAL_PATTERN = re.compile(r"[+-]?(\d*)\.(\d+)")
+TIMESTAMP_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d{1,9})?"
+)
+DATE_PATTERNS = (
+    (re.compile(r"\d{4}-\d{2}-\d{2}"), 'YYYY-MM-DD'),
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4}"), 'MM/DD/YYYY'),
+    (
+        re.compile(
+            r"(Mon|Tues|Wednes|Thurs|Fri|Satur|Sun)day, "
+            r"(January|February|March|April|May|June|July|August|"
+            r"September|October|November|December) \d{1,2}, \d{4}"
+        ),
+        'DAY, MMMM DD, YYYY'
+    ),
+)
+
+# Expressions parsing the text of a date column of each detected format in
+# the transform of COPY, {} receiving the column value. Snowflake has no
+# format element for full weekday names, so they are removed first
+DATE_TRANSFORMS = {
+    'YYYY-MM-DD': "TO_DATE({}, 'YYYY-MM-DD')",
+    'MM/DD/YYYY': "TO_DATE({}, 'MM/DD/YYYY')",
+    'DAY, MMMM DD, YYYY': (
+        "TO_DATE(REGEXP_REPLACE({}, '^[A-Za-z]+, ', ''), 'MMMM DD, YYYY')"
+    ),
+}
+
+# Rollup tables read by the dashboard, with the table each one summarizes
+# and the query computing it
+ROLLUP_TABLES = {
+    'AU_SALES_BY_MONTH_ROLLUP': ('AU_SALES_BY_MODEL', """
+        SELECT MONTH,
+               MONTH(DATE) AS MONTH_NUMBER,
+               SUM(QUANTITY_SOLD) AS QUANTITY_SOLD,
+               SUM(PROFIT) AS PROFIT,
+               COUNT(QUANTITY_SOLD) AS SALES
+        FROM AU_SALES_BY_MODEL
+        GROUP BY MONTH, MONTH(DATE)
+    """),
+    'AU_SALES_BY_MODEL_ROLLUP': ('AU_SALES_BY_MODEL', """
+        SELECT MODEL,
+               SUM(QUANTITY_SOLD) AS QUANTITY_SOLD,
+               SUM(PROFIT) AS PROFIT
+        FROM AU_SALES_BY_MODEL
+        GROUP BY MODEL
+    """),
+    'AU_SALES_BY_DEALER_ROLLUP': ('AU_SALES_BY_MODEL', """
+        SELECT DEALER_ID,
+               SUM(QUANTITY_SOLD) AS QUANTITY_SOLD,
+               SUM(PROFIT) AS PROFIT
+        FROM AU_SALES_BY_MODEL
+        GROUP BY DEALER_ID
+    """),
+    'AU_RECALLS_BY_MODEL_SYSTEM_ROLLUP': ('AU_CAR_RECALLS', """
+        SELECT MODEL,
+               SYSTEM_AFFECTED,
+               SUM(UNITS) AS UNITS
+        FROM AU_CAR_RECALLS
+        GROUP BY MODEL, SYSTEM_AFFECTED
+    """),
+    'AU_SENTIMENT_ROLLUP': ('AU_SENTIMENT', """
+        SELECT SENTIMENT,
+               COUNT(*) AS REVIEWS
+        FROM AU_SENTIMENT
+        GROUP BY SENTIMENT
+    """),
+}
+
+# Desired access roles and functional roles, with their comments
+ROLES = {
+    'SWIFTAUTO_BI_CREATOR_ROLE':
+        'Access role that permits BI creator access for SWIFTAUTO_DB',
+    'SWIFTAUTO_BI_VIEWER_ROLE':
+        'Access role that permits BI viewer access for SWIFTAUTO_DB',
+    'SWIFTAUTO_READ_ROLE':
+        'Access role that permits read-only access for SWIFTAUTO_DB',
+    'SWIFTAUTO_READWRITE_ROLE':
+        'Access role that permits read-write access for SWIFTAUTO_DB',
+    'DATA_ANALYST': 'Functional role for data analysts',
+    'DATA_SCIENTIST': 'Functional role for data scientists',
+    'REGIONAL_MANAGER': 'Functional role for regional managers',
+}
+
+# Desired role hierarchy as (granted role, grantee role) pairs
+ROLE_GRANTS = (
+    ('SWIFTAUTO_READ_ROLE', 'DATA_ANALYST'),
+    ('SWIFTAUTO_BI_CREATOR_ROLE', 'DATA_SCIENTIST'),
+    ('SWIFTAUTO_BI_VIEWER_ROLE', 'DATA_SCIENTIST'),
+    ('SWIFTAUTO_READWRITE_ROLE', 'DATA_SCIENTIST'),
+    ('SWIFTAUTO_BI_VIEWER_ROLE', 'REGIONAL_MANAGER'),
+    ('DATA_ANALYST', 'SYSADMIN'),
+    ('DATA_SCIENTIST', 'SYSADMIN'),
+    ('REGIONAL_MANAGER', 'SYSADMIN'),
+)
+
+# Desired privileges as (privileges, object type, object name, role)
+PRIVILEGE_GRANTS = (
+    (('USAGE', 'MONITOR'), 'WAREHOUSE', 'SWIFTAUTO_WH',
+     'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('USAGE',), 'WAREHOUSE', 'SWIFTAUTO_WH', 'SWIFTAUTO_BI_VIEWER_ROLE'),
+    (('USAGE',), 'WAREHOUSE', 'SWIFTAUTO_WH', 'SWIFTAUTO_READ_ROLE'),
+    (('USAGE',), 'WAREHOUSE', 'SWIFTAUTO_WH', 'SWIFTAUTO_READWRITE_ROLE'),
+    (('USAGE',), 'DATABASE', 'SWIFTAUTO_DB', 'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('USAGE',), 'DATABASE', 'SWIFTAUTO_DB', 'SWIFTAUTO_BI_VIEWER_ROLE'),
+    (('USAGE',), 'DATABASE', 'SWIFTAUTO_DB', 'SWIFTAUTO_READ_ROLE'),
+    (('USAGE',), 'DATABASE', 'SWIFTAUTO_DB', 'SWIFTAUTO_READWRITE_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_BI_VIEWER_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE', 'SWIFTAUTO_READ_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_READWRITE_ROLE'),
+    (('SELECT',), 'ALL TABLES IN SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('SELECT',), 'ALL TABLES IN SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_BI_VIEWER_ROLE'),
+    (('SELECT',), 'ALL TABLES IN SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_READ_ROLE'),
+    (('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REFERENCES'),
+     'ALL TABLES IN SCHEMA', 'SWIFTAUTO_DB.AUTOMOTIVE',
+     'SWIFTAUTO_READWRITE_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.PUBLIC', 'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('USAGE',), 'SCHEMA', 'SWIFTAUTO_DB.PUBLIC', 'SWIFTAUTO_BI_VIEWER_ROLE'),
+    (('CREATE STREAMLIT', 'CREATE STAGE'), 'SCHEMA', 'SWIFTAUTO_DB.PUBLIC',
+     'SWIFTAUTO_BI_CREATOR_ROLE'),
+    (('CREATE SHARE',), 'ACCOUNT', None, 'SWIFTAUTO_BI_CREATOR_ROLE'),
+)
+
+# Desired users with their properties; each user is granted its default role
+USERS = {
+    'RM_DENVER': {
+        'COMMENT': 'Regional Manager, Denver, Colorado',
+        'DEFAULT_WAREHOUSE': 'SWIFTAUTO_WH',
+        'DEFAULT_ROLE': 'REGIONAL_MANAGER',
+    },
+    'DS_JSMITH': {
+        'COMMENT': 'Data Scientist, SwiftAuto Traders',
+        'DEFAULT_WAREHOUSE': 'SWIFTAUTO_WH',
+        'DEFAULT_ROLE': 'DATA_SCIENTIST',
+    },
+}
+
+# Initial password of new users, who must change it at first login
+USER_PASSWORD = 'abc123'
 
 
 def get_snowflake_connection():
@@ -164,282 +446,2568 @@ def create_stage(cursor):
         print(f"An unexpected error occurred: {e}")
 
 
-def upload_csv_files(cursor, file_location):
+def file_digest(path):
     """
-    Upload CSV files to the stage.
+    Compute the SHA-256 digest of a file without reading it into memory.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1048576), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digests(path, prefix_size):
+    """
+    Compute in a single pass the SHA-256 digests of a file and of its
+    first bytes.
+
+    Args:
+        path (str): Path to the file.
+        prefix_size (int): Number of bytes of the prefix.
+
+    Returns:
+        tuple: Hexadecimal digests of the file and of its prefix, the
+            latter being None when the prefix does not end with a line
+            break.
+    """
+    digest, remaining = hashlib.sha256(), prefix_size
+    prefix_digest, last_byte = None, b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1048576), b""):
+            if 0 < remaining <= len(block):
+                digest.update(block[:remaining])
+                last_byte = block[remaining - 1:remaining]
+                prefix_digest = digest.copy()
+                digest.update(block[remaining:])
+            else:
+                digest.update(block)
+            remaining -= len(block)
+    if last_byte != b"\n":
+        prefix_digest = None
+    return digest.hexdigest(), prefix_digest and prefix_digest.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Load the manifest written by a previous run.
+
+    Args:
+        path (str): Path to the manifest file.
+
+    Returns:
+        dict: Manifest, empty when no previous run was recorded.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("version", 1)
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """
+    Atomically write the manifest.
+
+    Args:
+        manifest (dict): Manifest to write.
+        path (str): Path to the manifest file.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def scan_csv_files(file_location, manifest, load_mode=LOAD_MODE):
+    """
+    Describe the local CSV files by size, modification time and content
+    hash. Hashes recorded in the manifest are reused when the size and
+    modification time of a file are unchanged. In append mode, the hash of
+    the bytes loaded by the previous run is also computed for files that
+    grew since.
+
+    Args:
+        file_location (str): Path to the directory containing CSV files.
+        manifest (dict): Manifest written by a previous run.
+        load_mode (str): Loading mode, replace or append.
+
+    Returns:
+        dict: File details keyed by file name.
+    """
+    local_files = {}
+    for csvfile in sorted(glob.glob(os.path.join(file_location, "*.csv"))):
+        name = os.path.basename(csvfile)
+        stat = os.stat(csvfile)
+        entry = {"path": csvfile, "size": stat.st_size,
+                 "mtime": stat.st_mtime}
+        previous = manifest["files"].get(name, {})
+        loaded_size = previous.get("loaded_size") or 0
+        if load_mode == 'append' and 0 < loaded_size < entry["size"]:
+            entry["sha256"], entry["loaded_sha256"] = file_digests(
+                csvfile, loaded_size
+            )
+        elif (previous.get("size") == entry["size"]
+                and previous.get("mtime") == entry["mtime"]):
+            entry["sha256"] = previous["sha256"]
+        else:
+            entry["sha256"] = file_digest(csvfile)
+        local_files[name] = entry
+    return local_files
+
+
+def stage_pattern(names):
+    """
+    Build a regular expression matching the given stage file names.
+
+    Args:
+        names (iterable): Stage file names.
+
+    Returns:
+        str: Regular expression for the PATTERN option.
+    """
+    escaped = [escape_pattern(name) for name in sorted(names)]
+    return f".*/({'|'.join(escaped)})"
+
+
+def escape_pattern(name):
+    """
+    Escape a stage file name for a regular expression without using
+    backslashes, which would need escaping again inside SQL strings. The
+    chunk number wildcard of split files matches any number.
+
+    Args:
+        name (str): Stage file name, optionally with a chunk wildcard.
+
+    Returns:
+        str: Regular expression.
+    """
+    return re.sub(
+        r"[^A-Za-z0-9_-]",
+        lambda m: "[0-9]+" if m.group(0) == "*" else f"[{m.group(0)}]",
+        name
+    )
+
+
+def reconcile_stage(cursor, expected):
+    """
+    Remove stage files without a local source file, including files
+    staged in a previous staging format.
 
     Args:
         cursor (snowflake.connector.cursor.SnowflakeCursor):
             Snowflake cursor object.
-        file_location (str): Path to the directory containing CSV files.
+        expected (iterable): Stage file names or chunk wildcards of the
+            local CSV files.
+
+    Returns:
+        set: Paths of the files remaining in the stage, relative to the
+            stage.
     """
     try:
-        for csvfile in glob.glob(os.path.join(file_location, "*.csv")):
+        cursor.execute("LIST @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/;")
+        staged = {row[0].split('/', 1)[1] for row in cursor.fetchall()}
+        names = {name for name in expected if "*" not in name}
+        prefixes = tuple(
+            name.split("/")[0] + "/" for name in expected if "*" in name
+        )
+        stale = {
+            path for path in staged
+            if path not in names and not path.startswith(prefixes)
+        }
+        if stale:
             cursor.execute(
                 f"""
-                PUT file://{csvfile}
-                @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY
-                AUTO_COMPRESS = FALSE
-                OVERWRITE = TRUE;
+                REMOVE @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/
+                PATTERN = '{stage_pattern(stale)}';
                 """
             )
-            print(f"Uploaded {csvfile} to stage.")
+            for name in sorted(stale):
+                print(f"Removed stale file {name} from stage.")
+        return staged - stale
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+        return set()
 
 
-def create_tables(cursor):
+def normalize_column_name(name):
     """
-    Create and load tables with inferred schema.
+    Convert a CSV header to its table column name by replacing spaces
+    with underscores.
 
     Args:
-        cursor (snowflake.connector.cursor.SnowflakeCursor):
-            Snowflake cursor object.
+        name (str): CSV header.
+
+    Returns:
+        str: Column name.
     """
-    try:
-        # Create a file format for CSV
-        cursor.execute(
-            """
-            CREATE OR REPLACE FILE FORMAT SWIFTAUTO_DB.PUBLIC.CSV_FF
-                TYPE = CSV
-                PARSE_HEADER = TRUE
-                FIELD_DELIMITER = ','
-                TRIM_SPACE = TRUE
-                FIELD_OPTIONALLY_ENCLOSED_BY = '\042'
-                NULL_IF = ('\\N', 'NULL', '')
-                EMPTY_FIELD_AS_NULL = TRUE
-                ERROR_ON_COLUMN_COUNT_MISMATCH = TRUE;
-            """
+    return name.strip().replace(" ", "_")
+
+
+def resolve_stage_format(stage_format=STAGE_FORMAT):
+    """
+    Validate the staging format, falling back to gzip when the library
+    required by the requested format is not installed.
+
+    Args:
+        stage_format (str): Requested staging format.
+
+    Returns:
+        str: Staging format to use.
+    """
+    if stage_format not in STAGE_EXTENSIONS:
+        print(f"Unknown staging format {stage_format}, using gzip.")
+        return 'gzip'
+    if stage_format == 'zstd' and zstandard is None:
+        print("The zstandard package is not installed, using gzip.")
+        return 'gzip'
+    if stage_format == 'parquet' and pyarrow is None:
+        print("The pyarrow package is not installed, using gzip.")
+        return 'gzip'
+    return stage_format
+
+
+def stage_file_name(csvfile, stage_format, split=False):
+    """
+    Return the stage file name of a local CSV file. Split files are
+    staged as numbered chunks under a prefix named after the file, and
+    are described by a wildcard matching every chunk.
+
+    Args:
+        csvfile (str): Path or name of the local CSV file.
+        stage_format (str): Staging format.
+        split (bool): Whether the file is split into chunks.
+
+    Returns:
+        str: Stage file name, or prefix and chunk wildcard.
+    """
+    base = os.path.splitext(os.path.basename(csvfile))[0]
+    if split:
+        return f"{base}/{base}_*{STAGE_EXTENSIONS[stage_format]}"
+    return base + STAGE_EXTENSIONS[stage_format]
+
+
+def stage_table_name(stage_name):
+    """
+    Return the table loaded from a stage file name or chunk wildcard.
+
+    Args:
+        stage_name (str): Stage file name or chunk wildcard.
+
+    Returns:
+        str: Table name.
+    """
+    return stage_name.split("/")[0].split(".")[0].upper()
+
+
+def preparation_signature(stage_format):
+    """
+    Describe how CSV files are prepared before upload, so that a change
+    of preparation causes the files to be uploaded again.
+
+    Args:
+        stage_format (str): Staging format.
+
+    Returns:
+        str: Preparation signature recorded in the manifest.
+    """
+    return f"{stage_format}/normalized-headers"
+
+
+def open_stage_file(path, stage_format):
+    """
+    Open a prepared file for writing, compressing it on the fly.
+
+    Args:
+        path (str): Path to the prepared file.
+        stage_format (str): Staging format, one of csv, gzip or zstd.
+
+    Returns:
+        file object: Binary file object.
+    """
+    if stage_format == 'gzip':
+        return gzip.open(path, "wb", compresslevel=6)
+    if stage_format == 'zstd':
+        return zstandard.ZstdCompressor(level=3).stream_writer(
+            open(path, "wb"), closefd=True
         )
-        print("Created or replaced file format SWIFTAUTO_DB.PUBLIC.CSV_FF.")
+    return open(path, "wb")
 
-        # Execute the LIST command to get files in the stage
-        cursor.execute(
-            """
-            LIST @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/;
-            """
+
+def read_csv_header(source):
+    """
+    Read the header line of a CSV file and normalize its column names.
+
+    Args:
+        source (io.BufferedReader): CSV file opened in binary mode.
+
+    Returns:
+        tuple: Normalized column names and the line terminator used.
+    """
+    header_line = source.readline()
+    newline = "\r\n" if header_line.endswith(b"\r\n") else "\n"
+    header = next(csv.reader([header_line.decode("utf-8-sig")]))
+    return [normalize_column_name(name) for name in header], newline
+
+
+def write_parquet_file(csvfile, target, names):
+    """
+    Convert a CSV file to Parquet one record batch at a time. Values are
+    kept as strings so that Snowflake applies the same conversions as for
+    CSV files.
+
+    Args:
+        csvfile (str): Path to the source CSV file.
+        target (str): Path to the Parquet file.
+        names (list): Normalized column names.
+    """
+    reader = pa_csv.open_csv(
+        csvfile,
+        read_options=pa_csv.ReadOptions(
+            column_names=names, skip_rows=1, block_size=8388608
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pyarrow.string() for name in names},
+            null_values=sorted(NULL_VALUES),
+            strings_can_be_null=True
         )
+    )
+    with pa_parquet.ParquetWriter(
+        target, reader.schema, compression='snappy'
+    ) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
 
-        # Fetch all files and extract file names
-        files = cursor.fetchall()
-        file_names = [file[0].split('/')[-1] for file in files]
 
-        # Loop through each CSV file and create a table
-        for csvfile in file_names:
-            table_name = csvfile.split(".")[0].upper()
-            print(f"Creating table {table_name} using detected schema:")
+def count_quotes(mm, start, end, window=1048576):
+    """
+    Count the double quotes in a byte range, one window at a time.
 
-            # Create table statement using template
-            create_table_query = (
-                f"""
-                CREATE OR REPLACE TABLE {table_name} USING TEMPLATE (
-                    SELECT ARRAY_AGG(OBJECT_CONSTRUCT(*))
-                    FROM TABLE(
-                        INFER_SCHEMA(
-                            LOCATION =>
-                            '@SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{csvfile}',
-                            FILE_FORMAT => 'SWIFTAUTO_DB.PUBLIC.CSV_FF',
-                            IGNORE_CASE => TRUE
-                        )
-                    )
-                );
-                """
-            )
-            print(create_table_query)
+    Args:
+        mm (mmap.mmap): Memory-mapped file.
+        start (int): Start offset.
+        end (int): End offset.
+        window (int): Number of bytes examined at a time.
 
-            # Execute the SQL command
-            cursor.execute(create_table_query)
-            print(f"Table {table_name} created.")
+    Returns:
+        int: Number of double quotes.
+    """
+    return sum(
+        mm[offset:min(offset + window, end)].count(b'"')
+        for offset in range(start, end, window)
+    )
 
-            # Load the CSV file using MATCH_BY_COLUMN_NAME
-            cursor.execute(
-                f"""
-                COPY INTO {table_name}
-                FROM @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{csvfile}
-                FILE_FORMAT = (
-                    FORMAT_NAME = 'SWIFTAUTO_DB.PUBLIC.CSV_FF'
-                )
-                MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
-                """
-            )
-            print(f"Data loaded into table {table_name} from {csvfile}.")
 
-            # Rename columns to replace spaces with underscores
-            cursor.execute(
-                f"""
-                SELECT COLUMN_NAME
-                FROM SWIFTAUTO_DB.INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = '{table_name}';
-                """
-            )
-            columns = cursor.fetchall()
-
-            for col in columns:
-                original_col = col[0]
-                modified_col = original_col.replace(" ", "_")
-                if original_col != modified_col:
-                    cursor.execute(
-                        f"""
-                        ALTER TABLE {table_name}
-                        RENAME COLUMN "{original_col}" TO "{modified_col}";
-                        """
-                    )
-                    print(
-                        f"Renamed column {original_col} to {modified_col} in "
-                        f"table {table_name}."
-                    )
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+def find_record_boundaries(mm, data_start, parts):
+    """
+    Find offsets that split the records of a CSV file into roughly equal
+    parts. Each target offset is moved forward to the next line break
+    outside a quoted field, so records with quoted commas or line breaks
+    are never cut.
+
+    Args:
+        mm (mmap.mmap): Memory-mapped CSV file.
+        data_start (int): Offset of the first record after the header.
+        parts (int): Requested number of parts.
+
+    Returns:
+        list: Offsets, starting with data_start and ending with the file
+            size.
+    """
+    size = len(mm)
+    boundaries = [data_start]
+    position, in_quotes = data_start, False
+    for part in range(1, parts):
+        target = data_start + (size - data_start) * part // parts
+        if target > position:
+            in_quotes ^= count_quotes(mm, position, target) % 2 == 1
+            position = target
+        while position < size:
+            newline = mm.find(b"\n", position)
+            end = size if newline == -1 else newline + 1
+            in_quotes ^= count_quotes(mm, position, end) % 2 == 1
+            position = end
+            if not in_quotes:
+                break
+        if boundaries[-1] < position < size:
+            boundaries.append(position)
+    boundaries.append(size)
+    return boundaries
 
 
-def create_roles(cursor):
+def write_csv_part(mm, start, end, header, target, stage_format):
     """
-    Create a role hierarchy.
+    Write a header and a range of records to a prepared file.
 
     Args:
-        cursor (snowflake.connector.cursor.SnowflakeCursor):
-            Snowflake cursor object.
+        mm (mmap.mmap): Memory-mapped CSV file.
+        start (int): Offset of the first record.
+        end (int): Offset after the last record.
+        header (bytes): Normalized header line.
+        target (str): Path to the prepared file.
+        stage_format (str): Staging format.
     """
-    sql_commands = [
-        "USE ROLE SECURITYADMIN;",
-        "CREATE ROLE IF NOT EXISTS SWIFTAUTO_BI_CREATOR_ROLE "
-        "COMMENT = 'Access role that permits BI creator access for "
-        "SWIFTAUTO_DB';",
-        "CREATE ROLE IF NOT EXISTS SWIFTAUTO_BI_VIEWER_ROLE "
-        "COMMENT = 'Access role that permits BI viewer access for "
-        "SWIFTAUTO_DB';",
-        "CREATE ROLE IF NOT EXISTS SWIFTAUTO_READ_ROLE "
-        "COMMENT = 'Access role that permits read-only access for "
-        "SWIFTAUTO_DB';",
-        "CREATE ROLE IF NOT EXISTS SWIFTAUTO_READWRITE_ROLE "
-        "COMMENT = 'Access role that permits read-write access for "
-        "SWIFTAUTO_DB';",
-        "CREATE ROLE IF NOT EXISTS DATA_ANALYST "
-        "COMMENT = 'Functional role for data analysts';",
-        "CREATE ROLE IF NOT EXISTS DATA_SCIENTIST "
-        "COMMENT = 'Functional role for data scientists';",
-        "CREATE ROLE IF NOT EXISTS REGIONAL_MANAGER "
-        "COMMENT = 'Functional role for regional managers';",
-        "GRANT ROLE SWIFTAUTO_READ_ROLE TO ROLE DATA_ANALYST;",
-        "GRANT ROLE SWIFTAUTO_BI_CREATOR_ROLE TO ROLE DATA_SCIENTIST;",
-        "GRANT ROLE SWIFTAUTO_BI_VIEWER_ROLE TO ROLE DATA_SCIENTIST;",
-        "GRANT ROLE SWIFTAUTO_READWRITE_ROLE TO ROLE DATA_SCIENTIST;",
-        "GRANT ROLE SWIFTAUTO_BI_VIEWER_ROLE TO ROLE REGIONAL_MANAGER;",
-        "GRANT ROLE DATA_ANALYST, DATA_SCIENTIST, REGIONAL_MANAGER "
-        "TO ROLE SYSADMIN;",
-        "GRANT USAGE, MONITOR ON WAREHOUSE SWIFTAUTO_WH "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT USAGE ON WAREHOUSE SWIFTAUTO_WH "
-        "TO ROLE SWIFTAUTO_BI_VIEWER_ROLE;",
-        "GRANT USAGE ON WAREHOUSE SWIFTAUTO_WH "
-        "TO ROLE SWIFTAUTO_READ_ROLE;",
-        "GRANT USAGE ON WAREHOUSE SWIFTAUTO_WH "
-        "TO ROLE SWIFTAUTO_READWRITE_ROLE;",
-        "GRANT USAGE ON DATABASE SWIFTAUTO_DB "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT USAGE ON DATABASE SWIFTAUTO_DB "
-        "TO ROLE SWIFTAUTO_BI_VIEWER_ROLE;",
-        "GRANT USAGE ON DATABASE SWIFTAUTO_DB "
-        "TO ROLE SWIFTAUTO_READ_ROLE;",
-        "GRANT USAGE ON DATABASE SWIFTAUTO_DB "
-        "TO ROLE SWIFTAUTO_READWRITE_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_BI_VIEWER_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_READ_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_READWRITE_ROLE;",
-        "GRANT SELECT ON ALL TABLES IN SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT SELECT ON ALL TABLES IN SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_BI_VIEWER_ROLE;",
-        "GRANT SELECT ON ALL TABLES IN SCHEMA SWIFTAUTO_DB.AUTOMOTIVE "
-        "TO ROLE SWIFTAUTO_READ_ROLE;",
-        "GRANT SELECT, INSERT, UPDATE, DELETE, REFERENCES ON ALL TABLES "
-        "IN SCHEMA SWIFTAUTO_DB.AUTOMOTIVE TO ROLE SWIFTAUTO_READWRITE_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.PUBLIC "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT USAGE ON SCHEMA SWIFTAUTO_DB.PUBLIC "
-        "TO ROLE SWIFTAUTO_BI_VIEWER_ROLE;",
-        "GRANT CREATE STREAMLIT ON SCHEMA SWIFTAUTO_DB.PUBLIC "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "GRANT CREATE STAGE ON SCHEMA SWIFTAUTO_DB.PUBLIC "
-        "TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;",
-        "USE ROLE ACCOUNTADMIN;",
-        "GRANT CREATE SHARE ON ACCOUNT TO ROLE SWIFTAUTO_BI_CREATOR_ROLE;"
-    ]
+    with open_stage_file(target, stage_format) as prepared:
+        prepared.write(header)
+        for offset in range(start, end, 1048576):
+            prepared.write(mm[offset:min(offset + 1048576, end)])
 
-    # Execute each SQL command individually
-    for command in sql_commands:
-        try:
-            print(f"Executing command: {command}")
-            cursor.execute(command)
-        except ProgrammingError as pe:
-            print(f"Error executing command: {command}\n{pe}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+
+def prepare_csv_file(csvfile, stage_format='csv', build_dir=BUILD_DIR,
+                     split_threshold=SPLIT_FILE_BYTES):
+    """
+    Write a copy of a CSV file with normalized headers in the staging
+    format. Only the header line is parsed; the remaining bytes are
+    streamed through the compressor, or converted batch by batch to
+    Parquet, so memory use does not depend on the file size. Files
+    larger than split_threshold are written as numbered chunks in a
+    directory named after the file, each chunk with its own header.
+
+    Args:
+        csvfile (str): Path to the source CSV file.
+        stage_format (str): Staging format.
+        build_dir (str): Directory receiving the prepared copy.
+        split_threshold (int): Files larger than this many bytes are
+            split into chunks of about this size.
+
+    Returns:
+        str: Path to the prepared file, or to the directory of chunks.
+    """
+    os.makedirs(build_dir, exist_ok=True)
+    raw_bytes = os.path.getsize(csvfile)
+    split = raw_bytes > split_threshold
+    target = os.path.join(
+        build_dir, stage_file_name(csvfile, stage_format, split)
+    )
+    with open(csvfile, "rb") as source:
+        names, newline = read_csv_header(source)
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator=newline).writerow(names)
+        header = buffer.getvalue().encode("utf-8")
+        if split:
+            target = os.path.dirname(target)
+            shutil.rmtree(target, ignore_errors=True)
+            os.makedirs(target)
+            with mmap.mmap(source.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mm:
+                boundaries = find_record_boundaries(
+                    mm, source.tell(), math.ceil(raw_bytes / split_threshold)
+                )
+                for part, (start, end) in enumerate(
+                        zip(boundaries, boundaries[1:])):
+                    part_name = stage_file_name(
+                        csvfile, stage_format, True
+                    ).split("/")[1].replace("*", f"{part:04d}")
+                    part_path = os.path.join(target, part_name)
+                    if stage_format == 'parquet':
+                        write_csv_part(
+                            mm, start, end, header, part_path + ".csv", 'csv'
+                        )
+                        write_parquet_file(part_path + ".csv", part_path,
+                                           names)
+                        os.remove(part_path + ".csv")
+                    else:
+                        write_csv_part(
+                            mm, start, end, header, part_path, stage_format
+                        )
+        elif stage_format == 'parquet':
+            write_parquet_file(csvfile, target, names)
+        else:
+            with open_stage_file(target, stage_format) as prepared:
+                prepared.write(header)
+                shutil.copyfileobj(source, prepared, 1048576)
+
+    staged_bytes = local_size(target)
+    saved = 1 - staged_bytes / raw_bytes if raw_bytes else 0
+    print(
+        f"Prepared {os.path.basename(target)}: {raw_bytes} bytes -> "
+        f"{staged_bytes} bytes ({saved:.0%} saved)."
+    )
+    return target
 
 
-def create_users(cursor):
+def local_size(path):
     """
-    Create users and grant functional roles.
+    Return the size of a file, or the total size of a directory of chunks.
 
     Args:
-        cursor (snowflake.connector.cursor.SnowflakeCursor):
-            Snowflake cursor object.
+        path (str): Path to a file or directory.
+
+    Returns:
+        int: Size in bytes.
     """
-    sql_commands = [
-        "USE ROLE USERADMIN;",
-        "CREATE OR REPLACE USER RM_DENVER "
-        "PASSWORD = 'abc123' "
-        "COMMENT = 'Regional Manager, Denver, Colorado' "
-        "MUST_CHANGE_PASSWORD = TRUE "
-        "DEFAULT_WAREHOUSE = SWIFTAUTO_WH;",
-        "CREATE OR REPLACE USER DS_JSMITH "
-        "PASSWORD = 'abc123' "
-        "COMMENT = 'Data Scientist, SwiftAuto Traders' "
-        "MUST_CHANGE_PASSWORD = TRUE "
-        "DEFAULT_WAREHOUSE = SWIFTAUTO_WH;",
-        "USE ROLE SECURITYADMIN;",
-        "GRANT ROLE REGIONAL_MANAGER TO USER RM_DENVER;",
-        "GRANT ROLE DATA_SCIENTIST TO USER DS_JSMITH;",
-        "ALTER USER RM_DENVER SET DEFAULT_ROLE = REGIONAL_MANAGER;",
-        "ALTER USER DS_JSMITH SET DEFAULT_ROLE = DATA_SCIENTIST;"
-    ]
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+    return os.path.getsize(path)
 
-    # Execute each SQL command individually
-    for command in sql_commands:
-        try:
-            print(f"Executing command: {command}")
-            cursor.execute(command)
-        except ProgrammingError as pe:
-            print(f"Error executing command: {command}\n{pe}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
 
+class ColumnProfile:
+    """
+    Running summary of the values seen in one CSV column, narrowed chunk
+    by chunk to the most specific type matching every value.
 
-def main():
+    Args:
+        name (str): Column name.
     """
-    Main function to execute the Snowflake operations.
+
+    def __init__(self, name):
+        self.name = name
+        self.kinds = ["integer", "decimal", "timestamp", "date"]
+        self.date_formats = [fmt for _, fmt in DATE_PATTERNS]
+        self.nullable = False
+        self.max_length = 0
+        self.integer_digits = 0
+        self.scale = 0
+
+    def update(self, values):
+        """
+        Narrow the profile with a chunk of column values. Each distinct
+        value is only tested once per chunk, against every type still
+        matching all the values seen before, so a type ruled out by a chunk
+        is never reconsidered and values of mixed types fall back to a
+        string.
+
+        Args:
+            values (iterable): Raw column values.
+        """
+        distinct = {value.strip() for value in values}
+        if distinct & NULL_VALUES:
+            self.nullable = True
+            distinct -= NULL_VALUES
+        if not distinct:
+            return
+        self.max_length = max(
+            self.max_length, max(len(value) for value in distinct)
+        )
+
+        if "integer" in self.kinds and not all(
+                INTEGER_PATTERN.fullmatch(v) for v in distinct):
+            self.kinds.remove("integer")
+        if "decimal" in self.kinds:
+            # Integers are decimals too, so their digits are counted here
+            matches = [
+                DECIMAL_PATTERN.fullmatch(v) or INTEGER_PATTERN.fullmatch(v)
+                for v in distinct
+            ]
+            if all(matches):
+                for match in matches:
+                    groups = match.groups()
+                    if groups:
+                        self.integer_digits = max(
+                            self.integer_digits, len(groups[0])
+                        )
+                        self.scale = max(self.scale, len(groups[1]))
+                    else:
+                        self.integer_digits = max(
+                            self.integer_digits,
+                            len(match.group(0).lstrip("+-"))
+                        )
+            else:
+                self.kinds.remove("decimal")
+        if "timestamp" in self.kinds and not all(
+                TIMESTAMP_PATTERN.fullmatch(v) for v in distinct):
+            self.kinds.remove("timestamp")
+        if "date" in self.kinds:
+            self.date_formats = [
+                fmt for pattern, fmt in DATE_PATTERNS
+                if fmt in self.date_formats
+                and all(pattern.fullmatch(v) for v in distinct)
+            ]
+            if not self.date_formats:
+                self.kinds.remove("date")
+
+    def to_column(self, exact):
+        """
+        Describe the inferred column.
+
+        Args:
+            exact (bool): Whether every row of the file was profiled, in
+                which case the observed precision and length are used.
+
+        Returns:
+            dict: Column name, type, nullability, maximum length and, for
+                dates, the detected format.
+        """
+        column = {"name": self.name, "nullable": self.nullable,
+                  "max_length": self.max_length}
+        kind = self.kinds[0] if self.kinds and self.max_length else "string"
+        if kind == "integer":
+            column["type"] = "NUMBER(38, 0)"
+        elif kind == "decimal":
+            precision = min(38, self.integer_digits + self.scale)
+            column["type"] = (
+                f"NUMBER({max(precision, 1)}, {self.scale})" if exact
+                else f"NUMBER(38, {self.scale})"
+            )
+        elif kind == "timestamp":
+            column["type"] = "TIMESTAMP_NTZ"
+        elif kind == "date":
+            # Parsed by the transform of COPY, see DATE_TRANSFORMS
+            column["type"] = "DATE"
+            column["format"] = self.date_formats[0]
+        else:
+            column["type"] = self._varchar(exact)
+        return column
+
+    def _varchar(self, exact):
+        """
+        Return the VARCHAR type for the column.
+
+        Args:
+            exact (bool): Whether every row of the file was profiled.
+
+        Returns:
+            str: VARCHAR type, sized to the longest value when exact.
+        """
+        return f"VARCHAR({max(self.max_length, 1)})" if exact else "VARCHAR"
+
+
+def infer_csv_schema(csvfile, sample_rows=INFER_SAMPLE_ROWS,
+                     chunk_rows=5000):
     """
-    ctx = get_snowflake_connection()
-    cs = ctx.cursor()
-    try:
-        create_warehouse(cs)
-        create_database(cs)
-        create_schema(cs)
-        print_environment_details(cs)
-        create_stage(cs)
-        upload_csv_files(cs, "./Automotive_Industry/")
-        create_tables(cs)
-        create_roles(cs)
-        create_users(cs)
-    finally:
-        # Close the cursor and connection
-        cs.close()
-        ctx.close()
+    Infer the table schema of a CSV file by streaming a bounded sample of
+    its rows in column-wise chunks.
+
+    Args:
+        csvfile (str): Path to the CSV file.
+        sample_rows (int): Number of rows to profile, 0 for all rows.
+        chunk_rows (int): Number of rows profiled per chunk.
+
+    Returns:
+        list: Column descriptions in file order.
+    """
+    with open(csvfile, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        profiles = [
+            ColumnProfile(normalize_column_name(name))
+            for name in next(reader)
+        ]
+        rows = itertools.islice(reader, sample_rows) if sample_rows else reader
+        exact = True
+        while True:
+            chunk = list(itertools.islice(rows, chunk_rows))
+            if not chunk:
+                break
+            columns = itertools.zip_longest(*chunk, fillvalue="")
+            for profile, values in zip(profiles, columns):
+                profile.update(values)
+        if sample_rows:
+            exact = next(reader, None) is None
+    return [profile.to_column(exact) for profile in profiles]
+
+
+def create_table_ddl(table_name, columns):
+    """
+    Build the CREATE TABLE statement for an inferred schema.
+
+    Args:
+        table_name (str): Table name.
+        columns (list): Column descriptions from infer_csv_schema.
+
+    Returns:
+        str: CREATE OR REPLACE TABLE statement.
+    """
+    definitions = ",\n".join(
+        f'    "{column["name"].upper()}" {column["type"]}'
+        for column in columns
+    )
+    return f"CREATE OR REPLACE TABLE {table_name} (\n{definitions}\n);"
+
+
+def column_accepts(column, new_column):
+    """
+    Check whether the values of a newly profiled column load unchanged
+    into a table column.
+
+    Args:
+        column (dict): Column description of the table.
+        new_column (dict): Column description of the new values.
+
+    Returns:
+        bool: True if every new value fits the table column.
+    """
+    if column["name"] != new_column["name"]:
+        return False
+    if not new_column["max_length"]:
+        return True
+    varchar = re.fullmatch(r"VARCHAR(?:\((\d+)\))?", column["type"])
+    if varchar:
+        return not varchar.group(1) or (
+            new_column["max_length"] <= int(varchar.group(1))
+        )
+    number = re.fullmatch(r"NUMBER\((\d+), (\d+)\)", column["type"])
+    if number:
+        new_number = re.fullmatch(
+            r"NUMBER\((\d+), (\d+)\)", new_column["type"]
+        )
+        if not new_number:
+            return False
+        precision, scale = map(int, number.groups())
+        new_precision, new_scale = map(int, new_number.groups())
+        # Integers are typed NUMBER(38, 0), their length bounds their digits
+        integer_digits = min(
+            new_precision - new_scale, new_column["max_length"]
+        )
+        return (
+            new_scale <= scale and integer_digits <= precision - scale
+        )
+    return (
+        new_column["type"] == column["type"]
+        and new_column.get("format") == column.get("format")
+    )
+
+
+def schema_accepts(columns, new_columns):
+    """
+    Check whether the rows of a newly profiled file load unchanged into a
+    table.
+
+    Args:
+        columns (list): Column descriptions of the table.
+        new_columns (list): Column descriptions of the new rows.
+
+    Returns:
+        bool: True if the columns match and every new value fits.
+    """
+    return len(columns) == len(new_columns) and all(
+        column_accepts(column, new_column)
+        for column, new_column in zip(columns, new_columns)
+    )
+
+
+def write_delta_file(csvfile, offset, build_dir=BUILD_DIR):
+    """
+    Write the lines appended to a CSV file after an offset, under the
+    header of the file, to a CSV file named after the file and the offset
+    so that it loads into the same table.
+
+    Args:
+        csvfile (str): Path to the source CSV file.
+        offset (int): Offset of the first appended line.
+        build_dir (str): Directory receiving the delta file.
+
+    Returns:
+        str: Path to the delta file.
+    """
+    os.makedirs(build_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(csvfile))[0]
+    target = os.path.join(build_dir, f"{base}.delta_{offset:015d}.csv")
+    with open(csvfile, "rb") as source:
+        header = source.readline()
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            write_csv_part(mm, offset, len(mm), header, target, 'csv')
+    print(
+        f"Extracted {os.path.getsize(csvfile) - offset} appended bytes "
+        f"of {os.path.basename(csvfile)}."
+    )
+    return target
+
+
+def put_files(cursor, source, parallel, prefix=""):
+    """
+    Upload local files matching a path or wildcard to the stage.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        source (str): Local file path, optionally containing wildcards.
+        parallel (int): Number of threads used by PUT for the upload.
+        prefix (str): Stage path prefix receiving the files.
+    """
+    cursor.execute(
+        f"""
+        PUT file://{source}
+        @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{prefix}
+        AUTO_COMPRESS = FALSE
+        OVERWRITE = TRUE
+        PARALLEL = {parallel};
+        """
+    )
+
+
+def plan_uploads(csvfiles, batch_threshold):
+    """
+    Group CSV files into PUT tasks, batching small files together.
+
+    Args:
+        csvfiles (list): Paths of the CSV files, or directories of chunks,
+            to upload.
+        batch_threshold (int): Files smaller than this many bytes are
+            batched into a single wildcard PUT.
+
+    Returns:
+        list: Lists of file paths, one list per PUT task.
+    """
+    small = [
+        f for f in csvfiles
+        if not os.path.isdir(f) and os.path.getsize(f) < batch_threshold
+    ]
+    tasks = [[csvfile] for csvfile in csvfiles if csvfile not in small]
+    if small:
+        tasks.append(small)
+    return tasks
+
+
+def run_upload_task(cursor, files, parallel):
+    """
+    Upload one PUT task, linking batched files into a temporary directory
+    so that they can be sent with a single wildcard PUT. A directory of
+    chunks replaces the stage prefix of the same name.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        files (list): Paths of the files in the task.
+        parallel (int): Number of threads used by PUT for the upload.
+    """
+    if len(files) == 1 and os.path.isdir(files[0]):
+        prefix = os.path.basename(os.path.normpath(files[0])) + "/"
+        cursor.execute(
+            f"REMOVE @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{prefix};"
+        )
+        put_files(cursor, os.path.join(files[0], "*"), parallel, prefix)
+        return
+    if len(files) == 1:
+        put_files(cursor, files[0], parallel)
+        return
+
+    batch_dir = tempfile.mkdtemp(prefix="swiftauto_put_")
+    try:
+        for csvfile in files:
+            target = os.path.join(batch_dir, os.path.basename(csvfile))
+            try:
+                os.link(csvfile, target)
+            except OSError:
+                shutil.copyfile(csvfile, target)
+        put_files(cursor, os.path.join(batch_dir, "*"), parallel)
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+def upload_csv_files(cursor, file_location, csvfiles=None,
+                     workers=UPLOAD_WORKERS, parallel=PUT_PARALLEL,
+                     batch_threshold=SMALL_FILE_BYTES):
+    """
+    Upload CSV files to the stage.
+
+    Large files are uploaded concurrently by a bounded pool of cursors,
+    while small files are batched into a single wildcard PUT.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        file_location (str): Path to the directory containing CSV files.
+        csvfiles (list): Paths of the CSV files to upload. Defaults to
+            every CSV file in file_location.
+        workers (int): Maximum number of concurrent PUT statements.
+        parallel (int): Number of threads used by each PUT statement.
+        batch_threshold (int): Files smaller than this many bytes are
+            batched into a single wildcard PUT.
+
+    Returns:
+        dict: Upload summary with file, byte and elapsed time totals, and
+            the list of uploaded files.
+    """
+    summary = {"files": 0, "bytes": 0, "seconds": 0.0, "uploaded": []}
+    start = time.perf_counter()
+    try:
+        if csvfiles is None:
+            csvfiles = sorted(
+                glob.glob(os.path.join(file_location, "*.csv"))
+            )
+        tasks = plan_uploads(csvfiles, batch_threshold)
+        workers = max(1, min(workers, len(tasks)))
+
+        # Each worker borrows a cursor of its own from the pool
+        cursors = queue.Queue()
+        cursors.put(cursor)
+        for _ in range(workers - 1):
+            cursors.put(cursor.connection.cursor())
+
+        def upload(files):
+            worker_cursor = cursors.get()
+            try:
+                run_upload_task(worker_cursor, files, parallel)
+            finally:
+                cursors.put(worker_cursor)
+            for csvfile in files:
+                print(f"Uploaded {csvfile} to stage.")
+            return files
+
+        # Workers run in a copy of the caller's context, so their
+        # statements are recorded in the step of the caller
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, upload, files
+                    )
+                    for files in tasks
+                ]
+                for files in (future.result() for future in futures):
+                    summary["uploaded"].extend(files)
+                    summary["files"] += sum(
+                        len(os.listdir(f)) if os.path.isdir(f) else 1
+                        for f in files
+                    )
+                    summary["bytes"] += sum(
+                        local_size(csvfile) for csvfile in files
+                    )
+        finally:
+            while not cursors.empty():
+                worker_cursor = cursors.get()
+                if worker_cursor is not cursor:
+                    worker_cursor.close()
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+    summary["seconds"] = time.perf_counter() - start
+    throughput = summary["bytes"] / 1048576 / max(summary["seconds"], 1e-9)
+    print(
+        f"Uploaded {summary['files']} files "
+        f"({summary['bytes'] / 1048576:.2f} MB) in "
+        f"{summary['seconds']:.2f}s ({throughput:.2f} MB/s)."
+    )
+    return summary
+
+
+def copy_statement(csvfile, columns=None):
+    """
+    Build the COPY statement loading a staged file into its table. When
+    the schema has date columns, they are parsed in the format detected by
+    the schema inference by a transform selecting the columns by position.
+
+    Args:
+        csvfile (str): Stage file name or chunk wildcard.
+        columns (list): Column descriptions from infer_csv_schema, None
+            when the table was created from INFER_SCHEMA.
+
+    Returns:
+        str: COPY INTO statement.
+    """
+    table_name = stage_table_name(csvfile)
+    location, pattern = csvfile, ""
+    if "*" in csvfile:
+        # Load every chunk of a split file with a single COPY
+        location = csvfile.split("/")[0] + "/"
+        pattern = f"PATTERN = '.*/{escape_pattern(csvfile.split('/')[1])}'"
+    parquet = csvfile.endswith(STAGE_EXTENSIONS['parquet'])
+    file_format = (
+        'SWIFTAUTO_DB.PUBLIC.PARQUET_FF' if parquet
+        else 'SWIFTAUTO_DB.PUBLIC.CSV_FF'
+    )
+
+    dates = [
+        column for column in columns or ()
+        if column["type"] == "DATE" and column.get("format") in DATE_TRANSFORMS
+    ]
+    if dates:
+        # CSV values are read by position, as PARSE_HEADER does not apply
+        # to transforms, and Parquet values by name
+        if not parquet:
+            file_format = 'SWIFTAUTO_DB.PUBLIC.CSV_TRANSFORM_FF'
+        values = []
+        for position, column in enumerate(columns, 1):
+            value = (
+                f'$1:"{column["name"]}"::VARCHAR' if parquet
+                else f"${position}"
+            )
+            if column in dates:
+                value = DATE_TRANSFORMS[column["format"]].format(value)
+            values.append(value)
+        names = ", ".join(f'"{column["name"].upper()}"' for column in columns)
+        select_list = ",\n                   ".join(values)
+        return (
+            f"""
+        COPY INTO {table_name} ({names})
+        FROM (
+            SELECT {select_list}
+            FROM @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{location}
+        )
+        {pattern}
+        FILE_FORMAT = (
+            FORMAT_NAME = '{file_format}'
+        );
+        """
+        )
+
+    # Load the staged file using MATCH_BY_COLUMN_NAME
+    return (
+        f"""
+        COPY INTO {table_name}
+        FROM @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{location}
+        {pattern}
+        FILE_FORMAT = (
+            FORMAT_NAME = '{file_format}'
+        )
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE;
+        """
+    )
+
+
+def create_tables(cursor, file_names=None, schemas=None):
+    """
+    Create and load tables with inferred schema.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        file_names (list): Names of the staged files to load. Defaults to
+            every file in the stage.
+        schemas (dict): Locally inferred column descriptions keyed by file
+            name. Files without one use INFER_SCHEMA on the staged file.
+
+    Returns:
+        dict: COPY elapsed seconds keyed by the name of each loaded file.
+    """
+    loaded = {}
+    try:
+        # Create a file format for CSV
+        cursor.execute(
+            """
+            CREATE OR REPLACE FILE FORMAT SWIFTAUTO_DB.PUBLIC.CSV_FF
+                TYPE = CSV
+                PARSE_HEADER = TRUE
+                FIELD_DELIMITER = ','
+                TRIM_SPACE = TRUE
+                FIELD_OPTIONALLY_ENCLOSED_BY = '\042'
+                NULL_IF = ('\\N', 'NULL', '')
+                EMPTY_FIELD_AS_NULL = TRUE
+                ERROR_ON_COLUMN_COUNT_MISMATCH = TRUE;
+            """
+        )
+        print("Created or replaced file format SWIFTAUTO_DB.PUBLIC.CSV_FF.")
+
+        # Create a file format for CSV read by COPY transforms
+        cursor.execute(
+            """
+            CREATE OR REPLACE FILE FORMAT SWIFTAUTO_DB.PUBLIC.CSV_TRANSFORM_FF
+                TYPE = CSV
+                SKIP_HEADER = 1
+                FIELD_DELIMITER = ','
+                TRIM_SPACE = TRUE
+                FIELD_OPTIONALLY_ENCLOSED_BY = '\042'
+                NULL_IF = ('\\N', 'NULL', '')
+                EMPTY_FIELD_AS_NULL = TRUE
+                ERROR_ON_COLUMN_COUNT_MISMATCH = TRUE;
+            """
+        )
+        print(
+            "Created or replaced file format "
+            "SWIFTAUTO_DB.PUBLIC.CSV_TRANSFORM_FF."
+        )
+
+        # Create a file format for Parquet
+        cursor.execute(
+            """
+            CREATE OR REPLACE FILE FORMAT SWIFTAUTO_DB.PUBLIC.PARQUET_FF
+                TYPE = PARQUET
+                TRIM_SPACE = TRUE
+                NULL_IF = ('\\N', 'NULL', '');
+            """
+        )
+        print(
+            "Created or replaced file format SWIFTAUTO_DB.PUBLIC.PARQUET_FF."
+        )
+
+        if file_names is None:
+            # Execute the LIST command to get files in the stage
+            cursor.execute(
+                """
+                LIST @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/;
+                """
+            )
+
+            # Fetch all files and extract file names, describing the
+            # chunks of split files by a single wildcard
+            files = cursor.fetchall()
+            file_names = sorted({
+                re.sub(r"_[0-9]+(?=[.][^/]*$)", "_*", path)
+                if "/" in path else path
+                for path in (file[0].split('/', 1)[1] for file in files)
+            })
+
+        # Build the create and load statements of each table
+        pipelines = {}
+        for csvfile in file_names:
+            table_name = stage_table_name(csvfile)
+            location = csvfile
+            if "*" in csvfile:
+                location = csvfile.split("/")[0] + "/"
+            file_format = (
+                'SWIFTAUTO_DB.PUBLIC.PARQUET_FF'
+                if csvfile.endswith(STAGE_EXTENSIONS['parquet'])
+                else 'SWIFTAUTO_DB.PUBLIC.CSV_FF'
+            )
+            print(f"Creating table {table_name} using detected schema:")
+
+            # Create table statement from the local schema or a template
+            if schemas and csvfile in schemas:
+                create_table_query = create_table_ddl(
+                    table_name, schemas[csvfile]
+                )
+            else:
+                create_table_query = (
+                    f"""
+                    CREATE OR REPLACE TABLE {table_name} USING TEMPLATE (
+                        SELECT ARRAY_AGG(OBJECT_CONSTRUCT(*))
+                        FROM TABLE(
+                            INFER_SCHEMA(
+                                LOCATION =>
+                                '@SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY/{location}',
+                                FILE_FORMAT => '{file_format}',
+                                IGNORE_CASE => TRUE
+                            )
+                        )
+                    );
+                    """
+                )
+            print(create_table_query)
+            pipelines[csvfile] = [
+                ("create", create_table_query),
+                ("copy", copy_statement(csvfile, (schemas or {}).get(csvfile)))
+            ]
+
+        # Run the tables concurrently, each one step after the other
+        results = run_table_pipelines(cursor.connection, pipelines)
+        for csvfile, result in results.items():
+            if result["status"] == "SUCCESS":
+                loaded[csvfile] = result["steps"]["copy"]
+                print(
+                    f"Data loaded into table {stage_table_name(csvfile)} "
+                    f"from {csvfile} in {loaded[csvfile]:.2f}s."
+                )
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    return loaded
+
+
+def append_tables(cursor, file_names, schemas=None):
+    """
+    Load staged files into their existing tables.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        file_names (list): Names of the staged files to load.
+        schemas (dict): Column descriptions of the tables keyed by file
+            name, from infer_csv_schema.
+
+    Returns:
+        dict: COPY elapsed seconds keyed by the name of each loaded file.
+    """
+    loaded = {}
+    try:
+        pipelines = {}
+        for csvfile in file_names:
+            copy_query = copy_statement(csvfile, (schemas or {}).get(csvfile))
+            print(f"Appending {csvfile} to table {stage_table_name(csvfile)}:")
+            print(copy_query)
+            pipelines[csvfile] = [("copy", copy_query)]
+
+        # Run the tables concurrently
+        results = run_table_pipelines(cursor.connection, pipelines)
+        for csvfile, result in results.items():
+            if result["status"] == "SUCCESS":
+                loaded[csvfile] = result["steps"]["copy"]
+                print(
+                    f"Data appended to table {stage_table_name(csvfile)} "
+                    f"from {csvfile} in {loaded[csvfile]:.2f}s."
+                )
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    return loaded
+
+
+def run_table_pipelines(connection, pipelines, concurrency=None,
+                        poll_interval=None):
+    """
+    Run independent sequences of statements concurrently. Each statement
+    is submitted asynchronously, and the next statement of a sequence is
+    submitted as soon as the query status of the previous one reports
+    success, with at most concurrency sequences running at a time.
+
+    Args:
+        connection (snowflake.connector.connection.SnowflakeConnection):
+            Snowflake connection object.
+        pipelines (dict): Lists of (step name, statement) tuples keyed by
+            pipeline name.
+        concurrency (int): Maximum number of pipelines running at a time.
+            Defaults to LOAD_CONCURRENCY.
+        poll_interval (float): Seconds between two status polls. Defaults
+            to POLL_INTERVAL.
+
+    Returns:
+        dict: Status, error, elapsed seconds, per-step seconds and rows
+            loaded by the copy step keyed by pipeline name.
+    """
+    concurrency = LOAD_CONCURRENCY if concurrency is None else concurrency
+    poll_interval = POLL_INTERVAL if poll_interval is None else poll_interval
+    cursor = connection.cursor()
+    waiting = list(pipelines.items())
+    running, results = {}, {}
+
+    def submit(state):
+        step, statement = state["steps"][state["index"]]
+        state["step_start"] = time.perf_counter()
+        cursor.execute_async(statement)
+        state["query_id"] = cursor.sfqid
+
+    def finish(name, state, status, error=None):
+        elapsed = time.perf_counter() - state["start"]
+        results[name] = {"status": status, "error": error,
+                         "seconds": elapsed, "steps": state["timings"],
+                         "rows_loaded": state.get("rows_loaded")}
+        del running[name]
+        print(f"Pipeline {name}: {status} in {elapsed:.2f}s.")
+
+    try:
+        while waiting or running:
+            while waiting and len(running) < max(1, concurrency):
+                name, steps = waiting.pop(0)
+                running[name] = {"steps": steps, "index": 0, "timings": {},
+                                 "start": time.perf_counter()}
+                submit(running[name])
+            time.sleep(poll_interval)
+
+            for name, state in list(running.items()):
+                status = connection.get_query_status(state["query_id"])
+                if connection.is_still_running(status):
+                    continue
+                step = state["steps"][state["index"]][0]
+                state["timings"][step] = (
+                    time.perf_counter() - state["step_start"]
+                )
+                if connection.is_an_error(status):
+                    try:
+                        cursor.get_results_from_sfqid(state["query_id"])
+                        error = f"Query {state['query_id']} failed."
+                    except Exception as e:
+                        error = str(e)
+                    finish(name, state, "FAILED", f"{step}: {error}")
+                    continue
+                if step == "copy":
+                    cursor.get_results_from_sfqid(state["query_id"])
+                    state["rows_loaded"] = result_totals(
+                        cursor.description, cursor.fetchall()
+                    )[0]
+                state["index"] += 1
+                if state["index"] < len(state["steps"]):
+                    submit(state)
+                else:
+                    finish(name, state, "SUCCESS")
+    finally:
+        cursor.close()
+
+    # Report the status and timings of every pipeline
+    print(
+        f"{'PIPELINE':<44} {'STATUS':<8} {'SECONDS':>8} {'ROWS':>10}  STEPS"
+    )
+    for name, result in results.items():
+        steps = ", ".join(
+            f"{step} {seconds:.2f}s"
+            for step, seconds in result["steps"].items()
+        )
+        rows = result["rows_loaded"]
+        print(
+            f"{name:<44} {result['status']:<8} "
+            f"{result['seconds']:>8.2f} "
+            f"{'' if rows is None else rows:>10}  {steps}"
+        )
+        if result["error"]:
+            print(f"    {result['error']}")
+    return results
+
+
+def fetch_dicts(cursor):
+    """
+    Fetch the rows of the current result as dictionaries.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+
+    Returns:
+        list: Rows keyed by lowercase column name.
+    """
+    columns = [column[0].lower() for column in cursor.description or ()]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def execute_batch(cursor, statements):
+    """
+    Execute statements in a single multi-statement request, falling back to
+    one request per statement when the batch fails.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        statements (list): SQL statements, each ending with a semicolon.
+
+    Returns:
+        list: Rows of each statement as returned by fetch_dicts, or None
+            for the statements that failed.
+    """
+    if len(statements) > 1:
+        try:
+            cursor.execute(
+                "\n".join(statements), num_statements=len(statements)
+            )
+            results = [fetch_dicts(cursor)]
+            while cursor.nextset():
+                results.append(fetch_dicts(cursor))
+            return results
+        except ProgrammingError as pe:
+            print(f"Error executing batch, retrying one at a time\n{pe}")
+
+    results = []
+    for statement in statements:
+        try:
+            cursor.execute(statement)
+            results.append(fetch_dicts(cursor))
+        except ProgrammingError as pe:
+            print(f"Error executing command: {statement}\n{pe}")
+            results.append(None)
+    return results
+
+
+def sql_literal(value):
+    """
+    Quote a value as a SQL string literal.
+
+    Args:
+        value (str): Value to quote.
+
+    Returns:
+        str: String literal.
+    """
+    return "'" + value.replace("'", "''") + "'"
+
+
+def object_key(granted_on, name):
+    """
+    Build the key of a securable object as listed by SHOW GRANTS.
+
+    Args:
+        granted_on (str): Object type, such as WAREHOUSE or TABLE.
+        name (str): Object name, possibly quoted and qualified.
+
+    Returns:
+        tuple: Object type and unquoted uppercase name, without a name for
+            the account.
+    """
+    granted_on = granted_on.upper()
+    if granted_on == "ACCOUNT":
+        return granted_on, None
+    return granted_on, name.replace('"', "").upper()
+
+
+def read_access_state(cursor):
+    """
+    Read the current roles, role grants, privileges and users with two
+    batches of SHOW commands, switching to the SECURITYADMIN role.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+
+    Returns:
+        dict: Tables of each schema (None when they could not be listed),
+            role comments, users, role grants as (role, granted to,
+            grantee) and privileges as (role, privilege, object type,
+            object name).
+    """
+    schemas = sorted({
+        name for _, object_type, name, _ in PRIVILEGE_GRANTS
+        if object_type == "ALL TABLES IN SCHEMA"
+    })
+    results = execute_batch(
+        cursor,
+        [f"SHOW TABLES IN SCHEMA {schema};" for schema in schemas]
+        + ["USE ROLE SECURITYADMIN;", "SHOW ROLES;", "SHOW USERS;"]
+    )
+    tables = {
+        schema: None if rows is None else {
+            f"{schema}.{row['name']}".upper() for row in rows
+        }
+        for schema, rows in zip(schemas, results)
+    }
+    roles = {row["name"]: row["comment"] for row in results[-2] or []}
+    users = {row["name"]: row for row in results[-1] or []}
+
+    # Only the existing roles can be inspected
+    granted_roles = sorted(
+        {granted for granted, _ in ROLE_GRANTS}
+        | {user["DEFAULT_ROLE"] for user in USERS.values()}
+    )
+    privileged_roles = sorted({grant[3] for grant in PRIVILEGE_GRANTS})
+    statements = [
+        f"SHOW GRANTS OF ROLE {role};"
+        for role in granted_roles if role in roles
+    ] + [
+        f"SHOW GRANTS TO ROLE {role};"
+        for role in privileged_roles if role in roles
+    ]
+    results = execute_batch(cursor, statements) if statements else []
+    grants, privileges = set(), set()
+    for statement, rows in zip(statements, results):
+        for row in rows or []:
+            if statement.startswith("SHOW GRANTS OF"):
+                grants.add((
+                    row["role"], row["granted_to"].upper(),
+                    row["grantee_name"]
+                ))
+            else:
+                privileges.add((
+                    row["grantee_name"], row["privilege"],
+                    *object_key(row["granted_on"], row["name"])
+                ))
+
+    return {
+        "tables": tables,
+        "roles": roles,
+        "users": users,
+        "grants": grants,
+        "privileges": privileges,
+    }
+
+
+def missing_privileges(state, privileges, object_type, object_name, role):
+    """
+    Find the privileges of a desired grant that the role does not hold.
+
+    Args:
+        state (dict): Current state, as returned by read_access_state.
+        privileges (tuple): Desired privileges.
+        object_type (str): Object type, ALL TABLES IN SCHEMA covering every
+            table of the schema.
+        object_name (str): Object name, None for the account.
+        role (str): Grantee role.
+
+    Returns:
+        list: Missing privileges.
+    """
+    if object_type == "ALL TABLES IN SCHEMA":
+        tables = state["tables"].get(object_name)
+        if tables is None:
+            # Nothing to compare against, so grant on whatever exists
+            return list(privileges)
+        targets = [("TABLE", table) for table in tables]
+    else:
+        targets = [object_key(object_type, object_name or "")]
+    return [
+        privilege for privilege in privileges
+        if any(
+            (role, privilege, *target) not in state["privileges"]
+            for target in targets
+        )
+    ]
+
+
+def plan_role_statements(state):
+    """
+    Plan the statements creating the role hierarchy and granting its
+    privileges, leaving out what the account already has. Nothing is run
+    here; sync_roles_and_users sends the statements.
+
+    Args:
+        state (dict): Current state, as returned by read_access_state.
+
+    Returns:
+        tuple: Statements run as SECURITYADMIN and statements run as
+            ACCOUNTADMIN.
+    """
+    statements, account_statements = [], []
+    for role, comment in ROLES.items():
+        if role not in state["roles"]:
+            statements.append(
+                f"CREATE ROLE IF NOT EXISTS {role} "
+                f"COMMENT = {sql_literal(comment)};"
+            )
+        elif state["roles"][role] != comment:
+            statements.append(
+                f"ALTER ROLE {role} SET COMMENT = {sql_literal(comment)};"
+            )
+
+    for granted, grantee in ROLE_GRANTS:
+        if (granted, "ROLE", grantee) not in state["grants"]:
+            statements.append(f"GRANT ROLE {granted} TO ROLE {grantee};")
+
+    for privileges, object_type, object_name, role in PRIVILEGE_GRANTS:
+        missing = missing_privileges(
+            state, privileges, object_type, object_name, role
+        )
+        if not missing:
+            continue
+        if object_type == "ACCOUNT":
+            account_statements.append(
+                f"GRANT {', '.join(missing)} ON ACCOUNT TO ROLE {role};"
+            )
+        else:
+            statements.append(
+                f"GRANT {', '.join(missing)} ON {object_type} {object_name} "
+                f"TO ROLE {role};"
+            )
+    return statements, account_statements
+
+
+def plan_user_statements(state):
+    """
+    Plan the statements creating or updating users and granting their
+    functional roles. Existing users are altered, not replaced. Nothing is
+    run here; sync_roles_and_users sends the statements.
+
+    Args:
+        state (dict): Current state, as returned by read_access_state.
+
+    Returns:
+        tuple: Statements run as USERADMIN and statements run as
+            SECURITYADMIN.
+    """
+    user_statements, grant_statements = [], []
+    for user, properties in USERS.items():
+        values = {
+            key: sql_literal(value) if key == "COMMENT" else value
+            for key, value in properties.items()
+        }
+        current = state["users"].get(user)
+        if current is None:
+            settings = " ".join(
+                f"{key} = {value}" for key, value in values.items()
+            )
+            user_statements.append(
+                f"CREATE USER IF NOT EXISTS {user} "
+                f"PASSWORD = {sql_literal(USER_PASSWORD)} "
+                f"MUST_CHANGE_PASSWORD = TRUE {settings};"
+            )
+        else:
+            changed = " ".join(
+                f"{key} = {values[key]}"
+                for key, value in properties.items()
+                if (current.get(key.lower()) or "") != value
+            )
+            if changed:
+                user_statements.append(f"ALTER USER {user} SET {changed};")
+
+        role = properties["DEFAULT_ROLE"]
+        if (role, "USER", user) not in state["grants"]:
+            grant_statements.append(f"GRANT ROLE {role} TO USER {user};")
+    return user_statements, grant_statements
+
+
+def sync_roles_and_users(cursor):
+    """
+    Bring the role hierarchy, privileges and users to their desired state.
+    The current state is read with bulk SHOW commands and only the missing
+    changes are sent, as a single multi-statement request.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+    """
+    try:
+        state = read_access_state(cursor)
+        role_statements, account_statements = plan_role_statements(state)
+        user_statements, grant_statements = plan_user_statements(state)
+
+        statements = list(role_statements)
+        if user_statements:
+            statements += (
+                ["USE ROLE USERADMIN;"] + user_statements
+                + ["USE ROLE SECURITYADMIN;"]
+            )
+        statements += grant_statements
+        if account_statements:
+            statements += ["USE ROLE ACCOUNTADMIN;"] + account_statements
+
+        if not statements:
+            print("Roles, grants and users are up to date")
+            return
+        for statement in statements:
+            print(f"Executing command: {statement}")
+        execute_batch(cursor, statements)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+def sync_csv_files(cursor, file_location):
+    """
+    Upload and load only the CSV files that changed since the last run,
+    using the manifest to detect changes and the stage listing to detect
+    missing or stale stage files. In append mode, files that only grew
+    since their last load have their new lines uploaded and loaded into
+    the existing table.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        file_location (str): Path to the directory containing CSV files.
+    """
+    manifest = load_manifest()
+    stage_format = resolve_stage_format()
+    signature = preparation_signature(stage_format)
+    local_files = scan_csv_files(file_location, manifest, LOAD_MODE)
+    for name, entry in local_files.items():
+        entry["staged"] = stage_file_name(
+            name, stage_format, entry["size"] > SPLIT_FILE_BYTES
+        )
+    with telemetry_step(cursor, "reconcile_stage"):
+        staged = reconcile_stage(
+            cursor, [entry["staged"] for entry in local_files.values()] + [
+                delta
+                for name in local_files
+                for delta in manifest["files"].get(name, {}).get("deltas", [])
+            ]
+        )
+
+    to_upload, to_load, to_append = [], [], []
+    for name, entry in local_files.items():
+        previous = manifest["files"].get(name, {})
+        parts = previous.get("parts") or [entry["staged"]]
+        deltas = previous.get("deltas", [])
+        current = previous.get("schema_version") == SCHEMA_VERSION
+        if not FORCE_RELOAD and current and entry.get("loaded_sha256") and (
+                entry["loaded_sha256"] == previous.get("loaded")):
+            to_append.append(name)
+            continue
+        # The base file of the stage misses the lines loaded from deltas
+        if FORCE_RELOAD or not staged.issuperset(parts + deltas) or (
+                previous.get("uploaded") != entry["sha256"]) or (
+                previous.get("prepared") != signature) or (
+                deltas and previous.get("loaded") != entry["sha256"]):
+            to_upload.append(name)
+        if name in to_upload or not current or (
+                previous.get("loaded") != entry["sha256"]):
+            to_load.append(name)
+        else:
+            print(f"Skipping unchanged file {name}.")
+
+    # Extract the lines appended to the files that grew, and reload a file
+    # in full when they no longer fit the schema of its table
+    delta_files = {}
+    with telemetry_step(cursor, "extract_appended_lines"):
+        for name in to_append:
+            previous = manifest["files"][name]
+            delta_file = write_delta_file(
+                local_files[name]["path"], previous["loaded_size"]
+            )
+            columns = previous.get("columns")
+            if not columns:
+                print(f"No schema recorded for {name}, reloading its table.")
+            elif schema_accepts(
+                    columns, infer_csv_schema(delta_file, sample_rows=0)):
+                delta_files[name] = delta_file
+                continue
+            else:
+                print(f"Schema of {name} changed, reloading its table.")
+            to_upload.append(name)
+            to_load.append(name)
+
+    uploaded, appended_files = [], {}
+    if to_upload or delta_files:
+        with telemetry_step(cursor, "prepare_csv_files"):
+            prepared = {
+                name: prepare_csv_file(
+                    local_files[name]["path"], stage_format,
+                    split_threshold=SPLIT_FILE_BYTES
+                )
+                for name in to_upload
+            }
+            prepared_deltas = {
+                name: prepare_csv_file(
+                    delta_file, stage_format,
+                    split_threshold=SPLIT_FILE_BYTES
+                )
+                for name, delta_file in delta_files.items()
+            }
+        with telemetry_step(cursor, "upload_csv_files"):
+            summary = upload_csv_files(
+                cursor, file_location, csvfiles=list(prepared.values())
+                + list(prepared_deltas.values())
+            )
+        uploaded = [
+            name for name in to_upload
+            if prepared[name] in summary["uploaded"]
+        ]
+        for name in uploaded:
+            if os.path.isdir(prepared[name]):
+                prefix = os.path.basename(prepared[name])
+                local_files[name]["parts"] = [
+                    f"{prefix}/{part}"
+                    for part in sorted(os.listdir(prepared[name]))
+                ]
+        for name, delta_file in delta_files.items():
+            if prepared_deltas[name] not in summary["uploaded"]:
+                continue
+            split = os.path.isdir(prepared_deltas[name])
+            appended_files[name] = stage_file_name(
+                delta_file, stage_format, split
+            )
+            local_files[name]["deltas"] = [
+                f"{os.path.basename(prepared_deltas[name])}/{part}"
+                for part in sorted(os.listdir(prepared_deltas[name]))
+            ] if split else [appended_files[name]]
+    to_load = [
+        name for name in to_load if name in uploaded or name not in to_upload
+    ]
+
+    # Infer the schema of each file once per content hash
+    cached_schemas = manifest.get("schemas", {})
+    schemas, manifest["schemas"] = {}, {}
+    with telemetry_step(cursor, "infer_csv_schema"):
+        for name, entry in local_files.items():
+            key = f"{entry['sha256']}:{INFER_SAMPLE_ROWS}:{SCHEMA_VERSION}"
+            if key not in cached_schemas and name in to_load:
+                print(f"Inferring schema of {name}.")
+                cached_schemas[key] = infer_csv_schema(entry["path"])
+            if key in cached_schemas:
+                schemas[entry["staged"]] = cached_schemas[key]
+                manifest["schemas"][key] = cached_schemas[key]
+
+    loaded = {}
+    if to_load:
+        with telemetry_step(cursor, "create_tables"):
+            copy_seconds = create_tables(
+                cursor, [local_files[name]["staged"] for name in to_load],
+                schemas
+            )
+        loaded = {
+            name: copy_seconds[local_files[name]["staged"]]
+            for name in to_load if local_files[name]["staged"] in copy_seconds
+        }
+    appended = {}
+    if appended_files:
+        with telemetry_step(cursor, "append_tables"):
+            copy_seconds = append_tables(
+                cursor, list(appended_files.values()), {
+                    stage_name: manifest["files"][name]["columns"]
+                    for name, stage_name in appended_files.items()
+                }
+            )
+        appended = {
+            name: copy_seconds[stage_name]
+            for name, stage_name in appended_files.items()
+            if stage_name in copy_seconds
+        }
+
+    # Record the outcome so that the next run can skip unchanged files
+    files = {}
+    for name, entry in local_files.items():
+        previous = manifest["files"].get(name, {})
+        load_seconds = dict(previous.get("load_seconds", {}))
+        if name in loaded:
+            load_seconds[stage_format] = round(loaded[name], 3)
+            report_load_time(name, stage_format, load_seconds)
+        if name in appended:
+            print(
+                f"Appended {entry['size'] - previous['loaded_size']} bytes "
+                f"of {name} in {appended[name]:.2f}s."
+            )
+            # The stage holds the file as its base file and deltas
+            files[name] = dict(
+                previous,
+                size=entry["size"],
+                mtime=entry["mtime"],
+                sha256=entry["sha256"],
+                uploaded=entry["sha256"],
+                loaded=entry["sha256"],
+                loaded_size=entry["size"],
+                deltas=previous.get("deltas", []) + entry["deltas"],
+            )
+            continue
+        files[name] = {
+            "size": entry["size"],
+            "mtime": entry["mtime"],
+            "sha256": entry["sha256"],
+            "uploaded": (entry["sha256"] if name in uploaded
+                         else previous.get("uploaded")),
+            "prepared": (signature if name in uploaded
+                         else previous.get("prepared")),
+            "loaded": (entry["sha256"] if name in loaded
+                       else previous.get("loaded")),
+            "load_seconds": load_seconds,
+            "parts": (entry.get("parts") if name in uploaded
+                      else previous.get("parts")),
+            "deltas": ([] if name in uploaded
+                       else previous.get("deltas", [])),
+            "loaded_size": (entry["size"] if name in loaded
+                            else previous.get("loaded_size")),
+            "columns": (schemas.get(entry["staged"]) if name in loaded
+                        else previous.get("columns")),
+            "schema_version": (SCHEMA_VERSION if name in loaded
+                               else previous.get("schema_version")),
+        }
+    manifest["files"] = files
+    save_manifest(manifest)
+
+
+def report_load_time(name, stage_format, load_seconds):
+    """
+    Print the load time of a file compared with its load time in the
+    other staging formats recorded in the manifest.
+
+    Args:
+        name (str): Local CSV file name.
+        stage_format (str): Staging format used for this load.
+        load_seconds (dict): COPY elapsed seconds keyed by staging format.
+    """
+    current = load_seconds[stage_format]
+    comparisons = ", ".join(
+        f"{current - seconds:+.2f}s vs {other}"
+        for other, seconds in sorted(load_seconds.items())
+        if other != stage_format
+    )
+    print(
+        f"Loaded {name} as {stage_format} in {current:.2f}s"
+        + (f" ({comparisons})." if comparisons else ".")
+    )
+
+
+def refresh_rollup_tables(cursor):
+    """
+    Create the rollup tables that are missing or older than the table they
+    summarize, in a single multi-statement request.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+    """
+    try:
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, LAST_ALTERED
+            FROM SWIFTAUTO_DB.INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = 'AUTOMOTIVE';
+            """
+        )
+        versions = {
+            row["table_name"]: row["last_altered"]
+            for row in fetch_dicts(cursor)
+        }
+
+        statements = []
+        for name, (source, query) in ROLLUP_TABLES.items():
+            if source not in versions:
+                print(f"Skipping rollup table {name}, {source} is missing.")
+            elif FORCE_RELOAD or name not in versions or (
+                    versions[name] < versions[source]):
+                statements.append(
+                    f"CREATE OR REPLACE TABLE {name} AS"
+                    f"{textwrap.dedent(query).rstrip()};"
+                )
+            else:
+                print(f"Rollup table {name} is up to date.")
+
+        for statement in statements:
+            print(f"Executing command: {statement}")
+        if statements:
+            execute_batch(cursor, statements)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+def condition_expression(condition):
+    """
+    Extract the expression compared by a filter condition, such as MODEL in
+    MODEL IN ({}) or DATE in DATE >= ? AND DATE < ?.
+
+    Args:
+        condition (str): Filter condition.
+
+    Returns:
+        str: Expression, or None when the condition is not an IN list or
+            a comparison.
+    """
+    match = re.match(
+        r"(.+?)\s*(?:\bIN\s*\(|\bBETWEEN\b|[<>=])", condition, re.I | re.S
+    )
+    return " ".join(match.group(1).split()) if match else None
+
+
+def expression_columns(expression):
+    """
+    Find the column names referenced by an expression.
+
+    Args:
+        expression (str): SQL expression.
+
+    Returns:
+        set: Uppercase column names.
+    """
+    # Drop the types of casts, then keep the names not called as functions
+    expression = re.sub(r"\bAS\s+\w+", "", expression, flags=re.I)
+    return {
+        name.upper()
+        for name in re.findall(r"\b([A-Za-z_]\w*)\b(?!\s*\()", expression)
+    }
+
+
+def estimate_partitions(total, ndvs, position):
+    """
+    Estimate the partitions scanned by an equality filter on a column of a
+    clustering key once the table is well clustered. The rows of each
+    combination of the leading key columns are stored together, so the
+    filter reads a run of partitions for every combination of the key
+    columns before it.
+
+    Args:
+        total (int): Partitions of the table.
+        ndvs (list): Distinct values of each column of the key.
+        position (int): Position of the filtered column in the key.
+
+    Returns:
+        int: Estimated partitions scanned.
+    """
+    ndvs = [max(1, ndv) for ndv in ndvs]
+    combinations = math.prod(ndvs[:position])
+    runs = max(1.0, total / (combinations * ndvs[position]))
+    return min(total, math.ceil(combinations * runs))
+
+
+def value_literal(value):
+    """
+    Write a value fetched from a query as a SQL literal.
+
+    Args:
+        value: Value of any type returned by the connector.
+
+    Returns:
+        str: SQL literal.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    return sql_literal(str(value))
+
+
+def explain_partitions(cursor, query):
+    """
+    Read the partitions a query would scan from its compiled plan, without
+    running it.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        query (str): SQL query.
+
+    Returns:
+        tuple: Partitions assigned to the query and partitions of the
+            tables it reads.
+    """
+    cursor.execute(f"EXPLAIN USING JSON {query.strip().rstrip(';')}")
+    stats = json.loads(cursor.fetchone()[0])["GlobalStats"]
+    return stats["partitionsAssigned"], stats["partitionsTotal"]
+
+
+def cluster_tables(cursor, workload=None):
+    """
+    Propose a clustering key for every table of at least CLUSTER_MIN_BYTES
+    filtered by the dashboard, made of the expressions its sidebar filters
+    compare, most used first and ordered by increasing cardinality. The
+    partitions each filter scans, as compiled by EXPLAIN, are reported with
+    the partitions it would scan once the table is clustered on the key,
+    and the partitions it scanned when the key was applied by an earlier
+    run. The key is applied when CLUSTER_APPLY is set.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        workload (list): Dashboard queries, as returned by
+            dashboard_workload. Defaults to the queries of the app.
+    """
+    try:
+        if workload is None:
+            workload = dashboard.dashboard_workload()
+
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, BYTES, ROW_COUNT, CLUSTERING_KEY
+            FROM SWIFTAUTO_DB.INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = 'AUTOMOTIVE';
+            """
+        )
+        tables = {row["table_name"]: row for row in fetch_dicts(cursor)}
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM SWIFTAUTO_DB.INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = 'AUTOMOTIVE';
+            """
+        )
+        columns = {}
+        for row in fetch_dicts(cursor):
+            columns.setdefault(row["table_name"], set()).add(
+                row["column_name"].upper()
+            )
+
+        # Expressions compared by the filters of each table, with the
+        # number of filtered queries using them and the first such query
+        candidates = {}
+        for query in workload:
+            for condition in query["conditions"]:
+                expression = condition_expression(condition)
+                if expression is None or not expression_columns(
+                        expression) <= columns.get(query["table"], set()):
+                    continue
+                uses, sql = candidates.setdefault(query["table"], {}).get(
+                    expression, (0, query["sql"])
+                )
+                candidates[query["table"]][expression] = (uses + 1, sql)
+
+        manifest = load_manifest()
+        clustering = manifest.setdefault("clustering", {})
+        for table, expressions in sorted(candidates.items()):
+            size = tables.get(table, {}).get("bytes") or 0
+            if size < CLUSTER_MIN_BYTES:
+                print(
+                    f"Skipping clustering of {table}, {size / 2**20:.1f} MB "
+                    f"is below {CLUSTER_MIN_BYTES / 2**20:.1f} MB."
+                )
+                continue
+
+            # Cardinality and most common value of every filtered expression
+            names = list(expressions)
+            cursor.execute(
+                "SELECT "
+                + ", ".join(
+                    f"APPROX_COUNT_DISTINCT({expression}) AS NDV_{i}, "
+                    f"MODE({expression}) AS VALUE_{i}"
+                    for i, expression in enumerate(names)
+                )
+                + f" FROM AUTOMOTIVE.{table};"
+            )
+            stats = fetch_dicts(cursor)[0]
+            ndv = {name: stats[f"ndv_{i}"] for i, name in enumerate(names)}
+            value = {name: stats[f"value_{i}"] for i, name in enumerate(names)}
+
+            key = sorted(
+                names, key=lambda name: (-expressions[name][0], ndv[name])
+            )[:CLUSTER_KEY_COLUMNS]
+            key.sort(key=lambda name: ndv[name])
+            key_text = ", ".join(key)
+            current = tables[table].get("clustering_key") or ""
+            applied = (
+                re.sub(r"\s+", "", current.upper())
+                == re.sub(r"\s+", "", f"LINEAR({key_text})".upper())
+            )
+
+            cursor.execute(
+                "SELECT SYSTEM$CLUSTERING_INFORMATION("
+                f"{sql_literal(f'AUTOMOTIVE.{table}')}, "
+                f"{sql_literal(f'({key_text})')}) AS INFO;"
+            )
+            info = json.loads(cursor.fetchone()[0])
+            print(
+                f"Table {table} ({tables[table].get('row_count') or 0:,} "
+                f"rows, {size / 2**20:.1f} MB): proposed clustering key "
+                f"({key_text}), current {current or 'none'}, average depth "
+                f"{info['average_depth']:.1f} over "
+                f"{info['total_partition_count']:,} partitions."
+            )
+
+            # Partitions scanned by each filter, now and once clustered
+            previous = clustering.get(table, {})
+            partitions = {}
+            for name in names:
+                assigned, total = explain_partitions(
+                    cursor,
+                    expressions[name][1].format(
+                        where=f"WHERE {name} = {value_literal(value[name])}"
+                    )
+                )
+                partitions[name] = [assigned, total]
+                estimate = (
+                    estimate_partitions(
+                        total, [ndv[column] for column in key], key.index(name)
+                    )
+                    if name in key else total
+                )
+                before = previous.get("partitions", {}).get(name)
+                print(
+                    f"   {name} = {value_literal(value[name])}: "
+                    f"{assigned:,} of {total:,} partitions scanned, "
+                    f"{estimate:,} estimated once clustered"
+                    + (
+                        f", {before[0]:,} of {before[1]:,} when the key was "
+                        f"applied." if applied and before
+                        and previous.get("key") == key_text else "."
+                    )
+                )
+
+            if applied:
+                print(f"Clustering key of {table} is up to date.")
+            elif CLUSTER_APPLY:
+                statement = f"ALTER TABLE AUTOMOTIVE.{table} CLUSTER BY "
+                statement += f"({key_text});"
+                print(f"Executing command: {statement}")
+                cursor.execute(statement)
+                clustering[table] = {"key": key_text, "partitions": partitions}
+                print(
+                    f"Clustering key of {table} applied, Automatic "
+                    f"Clustering reclusters it in the background."
+                )
+            else:
+                print(
+                    "Set SWIFTAUTO_CLUSTER_APPLY=1 to apply the clustering "
+                    f"key of {table}."
+                )
+        save_manifest(manifest)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
+def statement_kind(statement):
+    """
+    Describe a statement by its leading keywords, without its arguments.
+
+    Args:
+        statement (str): SQL statement.
+
+    Returns:
+        str: Statement kind, such as COPY INTO or CREATE TABLE.
+    """
+    words = statement.upper().replace("(", " ").split()
+    if words[1:3] == ["OR", "REPLACE"]:
+        del words[1:3]
+    if not words:
+        return ""
+    if words[0] in ("ALTER", "COPY", "CREATE", "SHOW", "USE"):
+        return " ".join(words[:2])
+    return words[0]
+
+
+def result_totals(description, rows):
+    """
+    Sum the rows loaded by COPY and the bytes uploaded by PUT from the
+    result rows of a statement.
+
+    Args:
+        description (list): Cursor description of the result.
+        rows (list): Result rows.
+
+    Returns:
+        tuple: Rows loaded and bytes uploaded, None when the result has
+            no such column.
+    """
+    columns = [column[0].lower() for column in description or ()]
+    rows_loaded = bytes_uploaded = None
+    if "rows_loaded" in columns:
+        index = columns.index("rows_loaded")
+        rows_loaded = sum(int(row[index] or 0) for row in rows)
+    if "target_size" in columns and "status" in columns:
+        index, status = columns.index("target_size"), columns.index("status")
+        bytes_uploaded = sum(
+            int(row[index] or 0) for row in rows
+            if row[status] == "UPLOADED"
+        )
+    return rows_loaded, bytes_uploaded
+
+
+class Telemetry:
+    """
+    Collect the timing of the setup steps and of every statement executed
+    through an InstrumentedConnection.
+    """
+
+    def __init__(self):
+        self.run_id = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        )
+        self.records = []
+        self.steps = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Each thread, and each context copied into a worker, has its own
+        # current step
+        self._step_name = contextvars.ContextVar(
+            f"telemetry_step_{self.run_id}", default="main"
+        )
+
+    @property
+    def step_name(self):
+        """
+        str: Current step of the calling thread.
+        """
+        return self._step_name.get()
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """
+        Attribute the statements executed in the block to a step, nested
+        in the current step of the calling thread.
+
+        Args:
+            name (str): Step name.
+        """
+        previous = self.step_name
+        step_name = name if previous == "main" else f"{previous}/{name}"
+        token = self._step_name.set(step_name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.steps[step_name] = self.steps.get(
+                    step_name, 0.0
+                ) + time.perf_counter() - start
+            self._step_name.reset(token)
+
+    def record(self, statement, query_id, seconds=None, mode="sync",
+               **values):
+        """
+        Record an executed statement.
+
+        Args:
+            statement (str): SQL statement.
+            query_id (str): Snowflake query ID.
+            seconds (float): Wall time, None until an asynchronous
+                statement completes.
+            mode (str): sync, async or batch.
+            **values: Rows, rows loaded, bytes uploaded or error.
+
+        Returns:
+            dict: Recorded entry.
+        """
+        normalized = " ".join(statement.split())
+        entry = {
+            "type": "statement",
+            "run_id": self.run_id,
+            "step": self.step_name,
+            "kind": statement_kind(normalized),
+            "statement_hash": hashlib.sha256(
+                normalized.encode("utf-8")
+            ).hexdigest()[:16],
+            "query_id": query_id,
+            "mode": mode,
+            "seconds": seconds,
+            "rows": None,
+            "rows_loaded": None,
+            "bytes_uploaded": None,
+            "error": None,
+        }
+        entry.update(values)
+        with self._lock:
+            self.records.append(entry)
+            if seconds is None:
+                self._pending[query_id] = (entry, time.perf_counter())
+        return entry
+
+    def complete(self, query_id, error=None, **values):
+        """
+        Record the completion of an asynchronous statement.
+
+        Args:
+            query_id (str): Snowflake query ID.
+            error (str): Error message, None on success.
+            **values: Rows loaded or bytes uploaded.
+        """
+        with self._lock:
+            if query_id in self._pending:
+                entry, start = self._pending.pop(query_id)
+                entry["seconds"] = time.perf_counter() - start
+                entry["error"] = error
+            else:
+                entry = next(
+                    (entry for entry in self.records
+                     if entry["query_id"] == query_id), {}
+                )
+            entry.update(
+                (key, value) for key, value in values.items()
+                if value is not None
+            )
+
+    def write(self, path):
+        """
+        Append the statement and step records to a JSON-lines file.
+
+        Args:
+            path (str): Output file path.
+        """
+        steps = [
+            {"type": "step", "run_id": self.run_id, "step": name,
+             "seconds": seconds}
+            for name, seconds in self.steps.items()
+        ]
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in self.records + steps:
+                f.write(json.dumps(entry) + "\n")
+
+    def print_summary(self, top=None):
+        """
+        Print the slowest steps, with the statements of their nested
+        steps, and the slowest statements.
+
+        Args:
+            top (int): Number of slowest statements printed.
+        """
+        top = TELEMETRY_TOP if top is None else top
+        print(
+            f"{'STEP':<36} {'SECONDS':>8} {'QUERIES':>8} {'QUERY S':>8} "
+            f"{'ROWS LOADED':>12} {'BYTES':>12}"
+        )
+        for name, seconds in sorted(self.steps.items(),
+                                    key=lambda item: -item[1]):
+            entries = [
+                entry for entry in self.records
+                if f"{entry['step']}/".startswith(f"{name}/")
+            ]
+            print(
+                f"{name:<36} {seconds:>8.2f} {len(entries):>8} "
+                f"{sum(e['seconds'] or 0 for e in entries):>8.2f} "
+                f"{sum(e['rows_loaded'] or 0 for e in entries):>12} "
+                f"{sum(e['bytes_uploaded'] or 0 for e in entries):>12}"
+            )
+
+        slowest = sorted(
+            self.records, key=lambda entry: -(entry["seconds"] or 0)
+        )[:top]
+        print(
+            f"{'SLOWEST STATEMENT':<24} {'STEP':<36} {'SECONDS':>8}  "
+            "QUERY ID"
+        )
+        for entry in slowest:
+            print(
+                f"{entry['kind']:<24} {entry['step']:<36} "
+                f"{entry['seconds'] or 0:>8.2f}  {entry['query_id']}"
+            )
+
+
+class InstrumentedCursor:
+    """
+    Cursor wrapper recording every statement in a Telemetry object. COPY
+    and PUT results are read to record the rows loaded and bytes uploaded,
+    and kept for the caller to fetch.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        connection (InstrumentedConnection): Owning connection.
+    """
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._rows = None
+        self.connection = connection
+        self.telemetry = connection.telemetry
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, command, *args, **kwargs):
+        """
+        Execute and record a statement.
+
+        Args:
+            command (str): SQL statement.
+
+        Returns:
+            InstrumentedCursor: The cursor itself.
+        """
+        self._rows = None
+        mode = "batch" if kwargs.get("num_statements") else "sync"
+        start = time.perf_counter()
+        try:
+            self._cursor.execute(command, *args, **kwargs)
+        except Exception as e:
+            self.telemetry.record(
+                command, getattr(e, "sfqid", None),
+                time.perf_counter() - start, mode, error=str(e)
+            )
+            raise
+        seconds = time.perf_counter() - start
+
+        rows_loaded = bytes_uploaded = None
+        kind = statement_kind(command)
+        if mode == "sync" and kind in ("COPY INTO", "PUT"):
+            self._rows = self._cursor.fetchall()
+            rows_loaded, bytes_uploaded = result_totals(
+                self._cursor.description, self._rows
+            )
+        self.telemetry.record(
+            command, self._cursor.sfqid, seconds, mode,
+            rows=self._cursor.rowcount, rows_loaded=rows_loaded,
+            bytes_uploaded=bytes_uploaded
+        )
+        return self
+
+    def execute_async(self, command, *args, **kwargs):
+        """
+        Submit and record an asynchronous statement, timed until the
+        connection reports its completion.
+
+        Args:
+            command (str): SQL statement.
+
+        Returns:
+            dict: Submission details with the query ID.
+        """
+        self._rows = None
+        result = self._cursor.execute_async(command, *args, **kwargs)
+        self.telemetry.record(command, self._cursor.sfqid, mode="async")
+        return result
+
+    def get_results_from_sfqid(self, query_id):
+        """
+        Fetch the results of an asynchronous statement, recording the
+        rows loaded or bytes uploaded.
+
+        Args:
+            query_id (str): Snowflake query ID.
+        """
+        self._cursor.get_results_from_sfqid(query_id)
+        self._rows = self._cursor.fetchall()
+        rows_loaded, bytes_uploaded = result_totals(
+            self._cursor.description, self._rows
+        )
+        self.telemetry.complete(
+            query_id, rows_loaded=rows_loaded, bytes_uploaded=bytes_uploaded
+        )
+
+    def fetchone(self):
+        """
+        Fetch the next row of the last result.
+
+        Returns:
+            tuple: Row, or None when exhausted.
+        """
+        if self._rows is None:
+            return self._cursor.fetchone()
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        """
+        Fetch the remaining rows of the last result.
+
+        Returns:
+            list: Rows.
+        """
+        if self._rows is None:
+            return self._cursor.fetchall()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def nextset(self):
+        """
+        Move to the results of the next statement of a multi-statement
+        request.
+
+        Returns:
+            InstrumentedCursor: The cursor itself, or None when exhausted.
+        """
+        self._rows = None
+        return self if self._cursor.nextset() else None
+
+
+class InstrumentedConnection:
+    """
+    Connection wrapper handing out instrumented cursors and recording the
+    completion of asynchronous statements when their status is polled.
+
+    Args:
+        connection (snowflake.connector.connection.SnowflakeConnection):
+            Snowflake connection object.
+        telemetry (Telemetry): Telemetry receiving the records.
+    """
+
+    def __init__(self, connection, telemetry):
+        self._connection = connection
+        self.telemetry = telemetry
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self):
+        """
+        Open a new instrumented cursor on the connection.
+
+        Returns:
+            InstrumentedCursor: Cursor object.
+        """
+        return InstrumentedCursor(self._connection.cursor(), self)
+
+    def get_query_status(self, query_id):
+        """
+        Return the status of an asynchronous query, recording its wall time
+        once it is no longer running.
+
+        Args:
+            query_id (str): Snowflake query ID.
+
+        Returns:
+            snowflake.connector.constants.QueryStatus: Query status.
+        """
+        status = self._connection.get_query_status(query_id)
+        if not self._connection.is_still_running(status):
+            self.telemetry.complete(
+                query_id,
+                f"Query status {status}"
+                if self._connection.is_an_error(status) else None
+            )
+        return status
+
+
+def telemetry_step(cursor, name):
+    """
+    Attribute the statements executed in a block to a step, when the
+    cursor is instrumented.
+
+    Args:
+        cursor (snowflake.connector.cursor.SnowflakeCursor):
+            Snowflake cursor object.
+        name (str): Step name.
+
+    Returns:
+        contextlib.AbstractContextManager: Step context.
+    """
+    telemetry = getattr(cursor, "telemetry", None)
+    if telemetry is None:
+        return contextlib.nullcontext()
+    return telemetry.step(name)
+
+
+def main():
+    """
+    Main function to execute the Snowflake operations.
+    """
+    telemetry = Telemetry()
+    ctx = InstrumentedConnection(get_snowflake_connection(), telemetry)
+    cs = ctx.cursor()
+    steps = [
+        (create_warehouse, ()),
+        (create_database, ()),
+        (create_schema, ()),
+        (print_environment_details, ()),
+        (create_stage, ()),
+        (sync_csv_files, (DATASET_DIR,)),
+        (refresh_rollup_tables, ()),
+        (cluster_tables, ()),
+        (sync_roles_and_users, ()),
+    ]
+    try:
+        for step, args in steps:
+            with telemetry.step(step.__name__):
+                step(cs, *args)
+    finally:
+        # Close the cursor and connection
+        cs.close()
+        ctx.close()
+
+        # Report where the time went
+        telemetry.write(TELEMETRY_PATH)
+        telemetry.print_summary()
 
 
 if __name__ == "__main__":
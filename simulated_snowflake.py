@@ -0,0 +1,805 @@
+#!/usr/bin/env python
+
+"""
+SCRIPT: simulated_snowflake.py
+AUTHOR: Pravin Regismond
+DATE: 2026-10-18
+DESCRIPTION: This module provides a local stand-in for the Snowflake
+             Connector for Python. It accepts the statements issued by
+             setup_swiftauto_traders.py, simulates per-call latency and
+             keeps an in-memory stage, so the setup steps can be exercised
+             and timed without a Snowflake account.
+
+AUDIT TRAIL START                               INIT  DATE
+----------------------------------------------  ----- -----------
+1. Initial version                              PR    2026-10-18
+2. Added REMOVE support for stage               PR    2026-10-18
+   reconciliation.
+3. Added stage path prefixes for split files.   PR    2026-10-18
+4. Added asynchronous query execution and       PR    2026-10-18
+   query status polling.
+5. Added multi-statement requests and the       PR    2026-10-18
+   roles, grants and users read by SHOW.
+6. Added COPY and PUT result columns and the    PR    2026-10-18
+   results of asynchronous queries.
+7. Added failure injection for benchmarks.      PR    2026-10-18
+8. Added LAST_ALTERED times of tables read      PR    2026-10-18
+   from INFORMATION_SCHEMA.TABLES.
+9. Added the table sizes, columns, clustering   PR    2026-10-18
+   keys and plans read by the clustering step.
+
+AUDIT TRAIL END
+"""
+
+# Importing the required libraries
+import glob
+import gzip
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+# Raise the connector's own error type when it is installed, so the error
+# handling of the setup script is exercised as against Snowflake
+try:
+    from snowflake.connector.errors import ProgrammingError
+except ImportError:
+    class ProgrammingError(Exception):
+        """
+        Stand-in for snowflake.connector.errors.ProgrammingError.
+        """
+
+# Bytes of table data held by each simulated micro-partition
+PARTITION_BYTES = 16 * 2**20
+
+
+def count_rows(path):
+    """
+    Count the data rows of a CSV file, optionally gzip compressed.
+
+    Args:
+        path (str): Local file path.
+
+    Returns:
+        int: Number of lines after the header, 0 for other formats.
+    """
+    if path.endswith(".csv.gz"):
+        opener = gzip.open
+    elif path.endswith(".csv"):
+        opener = open
+    else:
+        return 0
+    with opener(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+class SimulatedConnection:
+    """
+    Stand-in for snowflake.connector.connection.SnowflakeConnection.
+
+    Args:
+        latency (float): Seconds spent on every statement round trip.
+        byte_cost (float): Seconds spent per byte uploaded by PUT.
+        failure_rate (float): Probability that a statement fails.
+        failure_pattern (str): Regular expression restricting the failures
+            to the matching statements, None for any statement.
+        seed (int): Seed of the failure injection.
+
+    Attributes:
+        column_stats (dict): Distinct values and most common value of the
+            expressions profiled by the clustering step, by uppercase
+            expression. Other expressions have a single NULL value.
+    """
+
+    def __init__(self, latency=0.05, byte_cost=0.0, failure_rate=0.0,
+                 failure_pattern=None, seed=None):
+        self.latency = latency
+        self.byte_cost = byte_cost
+        self.failure_rate = failure_rate
+        self.failure_pattern = failure_pattern
+        self.failures = 0
+        self._random = random.Random(seed)
+        self.statements = []
+        self.stage = {}
+        self.stage_rows = {}
+        self.queries = {}
+        self.tables = {}
+        self.columns = {}
+        self.table_bytes = {}
+        self.table_rows = {}
+        self.clustering_keys = {}
+        self.column_stats = {}
+        self._last_altered = 0.0
+        self.roles = {}
+        self.users = {}
+        self.grants = set()
+        self.privileges = set()
+        self.closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def round_trips(self):
+        """
+        Number of statements executed on this connection.
+
+        Returns:
+            int: Statement count.
+        """
+        return len(self.statements)
+
+    def cursor(self):
+        """
+        Open a new cursor on the connection.
+
+        Returns:
+            SimulatedCursor: Cursor object.
+        """
+        return SimulatedCursor(self)
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self.closed = True
+
+    def get_query_status(self, query_id):
+        """
+        Return the status of an asynchronous query.
+
+        Args:
+            query_id (str): Query ID.
+
+        Returns:
+            str: RUNNING until the simulated latency has elapsed, then
+                SUCCESS or FAILED_WITH_ERROR.
+        """
+        with self._lock:
+            finish_time, _, failed = self.queries[query_id]
+        if time.monotonic() < finish_time:
+            return "RUNNING"
+        return "FAILED_WITH_ERROR" if failed else "SUCCESS"
+
+    @staticmethod
+    def is_still_running(status):
+        """
+        Check whether a query status denotes a running query.
+
+        Args:
+            status (str): Query status.
+
+        Returns:
+            bool: Whether the query is still running.
+        """
+        return status == "RUNNING"
+
+    @staticmethod
+    def is_an_error(status):
+        """
+        Check whether a query status denotes a failed query.
+
+        Args:
+            status (str): Query status.
+
+        Returns:
+            bool: Whether the query failed.
+        """
+        return status == "FAILED_WITH_ERROR"
+
+    def inject_failure(self, sql):
+        """
+        Decide whether a statement fails, counting the failures.
+
+        Args:
+            sql (str): Statement text.
+
+        Returns:
+            bool: Whether the statement fails.
+        """
+        if not self.failure_rate or (
+                self.failure_pattern
+                and not re.search(self.failure_pattern, sql, re.I)):
+            return False
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+            self.failures += failed
+        return failed
+
+    def touch(self, name):
+        """
+        Record a change to a table. Must be called with the lock held.
+
+        Args:
+            name (str): Fully qualified table name.
+        """
+        self._last_altered = max(time.time(), self._last_altered + 0.001)
+        self.tables[name] = self._last_altered
+
+    def partitions(self, name):
+        """
+        Count the micro-partitions of a table.
+
+        Args:
+            name (str): Fully qualified table name.
+
+        Returns:
+            int: Partition count, at least 1.
+        """
+        return max(1, math.ceil(
+            self.table_bytes.get(name, 0) / PARTITION_BYTES
+        ))
+
+    def record(self, sql):
+        """
+        Record an executed statement.
+
+        Args:
+            sql (str): Statement text.
+        """
+        with self._lock:
+            self.statements.append(" ".join(sql.split()))
+
+
+class SimulatedCursor:
+    """
+    Stand-in for snowflake.connector.cursor.SnowflakeCursor.
+
+    Args:
+        connection (SimulatedConnection): Owning connection.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.sfqid = None
+        self.description = []
+        self.rowcount = None
+        self._rows = []
+        self._results = []
+        self._statement_results = []
+
+    def execute(self, command, *args, num_statements=None, **kwargs):
+        """
+        Simulate the execution of a statement, or of several statements
+        sent in a single request.
+
+        Args:
+            command (str): SQL statement, or statements separated by
+                semicolons at the end of lines.
+            num_statements (int, optional): Number of statements in a
+                multi-statement request.
+
+        Returns:
+            SimulatedCursor: The cursor itself.
+
+        Raises:
+            ProgrammingError: When a failure is injected.
+        """
+        if self.connection.inject_failure(command):
+            self._fail(command)
+            time.sleep(self.connection.latency)
+            raise ProgrammingError(
+                f"Simulated failure of query {self.sfqid}"
+            )
+        self._run(command, num_statements)
+        time.sleep(self.connection.latency)
+        return self
+
+    def execute_async(self, command, *args, **kwargs):
+        """
+        Simulate the submission of an asynchronous statement, which
+        completes once the simulated latency has elapsed.
+
+        Args:
+            command (str): SQL statement.
+
+        Returns:
+            dict: Submission details with the query ID.
+        """
+        failed = self.connection.inject_failure(command)
+        if failed:
+            self._fail(command)
+        else:
+            self._run(command)
+        with self.connection._lock:
+            self.connection.queries[self.sfqid] = (
+                time.monotonic() + self.connection.latency,
+                self._statement_results, failed
+            )
+        return {"queryId": self.sfqid}
+
+    def get_results_from_sfqid(self, query_id):
+        """
+        Make the results of a completed asynchronous query available.
+
+        Args:
+            query_id (str): Query ID.
+
+        Raises:
+            ProgrammingError: When the query failed.
+        """
+        self.sfqid = query_id
+        with self.connection._lock:
+            _, results, failed = self.connection.queries[query_id]
+        if failed:
+            raise ProgrammingError(f"Simulated failure of query {query_id}")
+        self._results = list(results)
+        self.nextset()
+
+    def _fail(self, command):
+        """
+        Record a statement that fails without any effect.
+
+        Args:
+            command (str): SQL statement.
+        """
+        self.connection.record(command)
+        self.sfqid = str(uuid.uuid4())
+        self._results = []
+        self._statement_results = []
+        self._rows = []
+        self.description = []
+
+    def _run(self, command, num_statements=None):
+        """
+        Record a request and prepare the results of its statements.
+
+        Args:
+            command (str): SQL statement, or statements for a
+                multi-statement request.
+            num_statements (int, optional): Number of statements in a
+                multi-statement request.
+        """
+        self.connection.record(command)
+        self.sfqid = str(uuid.uuid4())
+        statements = [command]
+        if num_statements:
+            statements = [
+                statement for statement in re.split(r";\s*\n", command)
+                if statement.strip()
+            ]
+
+        self._results = []
+        for statement in statements:
+            self._rows = []
+            self.description = []
+            self._dispatch(statement.strip())
+            self._results.append((self.description, self._rows))
+        self._statement_results = list(self._results)
+        self.nextset()
+
+    def nextset(self):
+        """
+        Move to the results of the next statement of a multi-statement
+        request.
+
+        Returns:
+            SimulatedCursor: The cursor itself, or None when exhausted.
+        """
+        if not self._results:
+            return None
+        self.description, self._rows = self._results.pop(0)
+        self._rows = list(self._rows)
+        self.rowcount = len(self._rows)
+        return self
+
+    def _dispatch(self, statement):
+        """
+        Prepare the results of a single statement.
+
+        Args:
+            statement (str): SQL statement.
+        """
+        keyword = statement.split(None, 1)[0].upper() if statement else ""
+        if keyword == "SHOW":
+            self._show(statement.rstrip(";"))
+        elif keyword in ("CREATE", "ALTER", "GRANT"):
+            self._access(statement.rstrip(";"))
+        elif keyword == "PUT":
+            self._put(statement)
+        elif keyword == "COPY":
+            self._copy(statement)
+        elif keyword == "LIST":
+            self._list()
+        elif keyword in ("REMOVE", "RM"):
+            self._remove(statement)
+        elif keyword == "EXPLAIN":
+            self._explain(statement)
+        elif "INFORMATION_SCHEMA.TABLES" in statement.upper():
+            self._information_schema_tables()
+        elif "INFORMATION_SCHEMA.COLUMNS" in statement.upper():
+            self._information_schema_columns()
+        elif "APPROX_COUNT_DISTINCT(" in statement.upper():
+            self._column_stats(statement)
+        elif "SYSTEM$CLUSTERING_INFORMATION(" in statement.upper():
+            self._clustering_information(statement)
+        elif statement.upper().startswith("SELECT CURRENT_USER()"):
+            self._rows = [(
+                "SIMULATED", "SYSADMIN", "SWIFTAUTO_DB", "AUTOMOTIVE",
+                "SWIFTAUTO_WH", "0.0.0", "PythonConnector 0.0.0"
+            )]
+
+    def _put(self, statement):
+        """
+        Copy the local files matched by a PUT statement to the stage.
+
+        Args:
+            statement (str): PUT statement.
+        """
+        match = re.match(r"PUT\s+'?file://(\S+?)'?\s+'?@(\S+?)'?\s", statement)
+        source, location = match.group(1), match.group(2)
+        parallel = re.search(r"PARALLEL\s*=\s*(\d+)", statement, re.I)
+        parallel = int(parallel.group(1)) if parallel else 4
+
+        files = sorted(glob.glob(source))
+        total_bytes = sum(os.path.getsize(path) for path in files)
+        time.sleep(total_bytes * self.connection.byte_cost / parallel)
+
+        prefix = location.split("/", 1)[1] if "/" in location else ""
+        for path in files:
+            name = os.path.basename(path)
+            size = os.path.getsize(path)
+            stage_path = "/".join(
+                part for part in prefix.split("/") + [name] if part
+            )
+            rows = count_rows(path)
+            with self.connection._lock:
+                self.connection.stage[stage_path] = size
+                self.connection.stage_rows[stage_path] = rows
+            self._rows.append(
+                (name, name, size, size, "NONE", "NONE", "UPLOADED", "")
+            )
+        self.description = [(column,) for column in (
+            "source", "target", "source_size", "target_size",
+            "source_compression", "target_compression", "status", "message"
+        )]
+
+    def _copy(self, statement):
+        """
+        Report the stage files matched by a COPY statement as loaded into
+        its table.
+
+        Args:
+            statement (str): COPY statement.
+        """
+        location = re.search(r"FROM\s+@(\S+)", statement, re.I)
+        prefix = location.group(1).partition("/")[2]
+        pattern = re.search(r"PATTERN\s*=\s*'([^']*)'", statement, re.I)
+        table = re.match(r"COPY\s+INTO\s+([\w.\"]+)", statement, re.I)
+        name = table.group(1).replace('"', "").upper()
+        if "." not in name:
+            name = f"SWIFTAUTO_DB.AUTOMOTIVE.{name}"
+        with self.connection._lock:
+            staged = sorted(self.connection.stage_rows.items())
+            self.connection.touch(name)
+            for path, rows in staged:
+                listed = f"automotive_industry/{path}"
+                if path.startswith(prefix) and (
+                        pattern is None
+                        or re.fullmatch(pattern.group(1), listed)):
+                    self._rows.append((listed, "LOADED", rows, rows, 1, 0))
+                    self.connection.table_rows[name] = (
+                        self.connection.table_rows.get(name, 0) + rows
+                    )
+                    self.connection.table_bytes[name] = (
+                        self.connection.table_bytes.get(name, 0)
+                        + self.connection.stage.get(path, 0)
+                    )
+        self.description = [(column,) for column in (
+            "file", "status", "rows_parsed", "rows_loaded", "error_limit",
+            "errors_seen"
+        )]
+
+    def _information_schema_tables(self):
+        """
+        Return the name, LAST_ALTERED time, size and clustering key of the
+        tables of the schema.
+        """
+        connection = self.connection
+        with connection._lock:
+            self._rows = [
+                (name.rsplit(".", 1)[1], last_altered,
+                 connection.table_bytes.get(name, 0),
+                 connection.table_rows.get(name, 0),
+                 connection.clustering_keys.get(name))
+                for name, last_altered in sorted(connection.tables.items())
+                if name.startswith("SWIFTAUTO_DB.AUTOMOTIVE.")
+            ]
+        self.description = [(column,) for column in (
+            "TABLE_NAME", "LAST_ALTERED", "BYTES", "ROW_COUNT",
+            "CLUSTERING_KEY"
+        )]
+
+    def _information_schema_columns(self):
+        """
+        Return the columns of the tables of the schema.
+        """
+        with self.connection._lock:
+            self._rows = [
+                (name.rsplit(".", 1)[1], column)
+                for name, columns in sorted(self.connection.columns.items())
+                if name.startswith("SWIFTAUTO_DB.AUTOMOTIVE.")
+                for column in columns
+            ]
+        self.description = [("TABLE_NAME",), ("COLUMN_NAME",)]
+
+    def _column_stats(self, statement):
+        """
+        Return the distinct values and most common value of the expressions
+        profiled by a statement, from the column_stats of the connection.
+
+        Args:
+            statement (str): SELECT statement with APPROX_COUNT_DISTINCT
+                and MODE columns.
+        """
+        row, self.description = [], []
+        for expression, i in re.findall(
+                r"APPROX_COUNT_DISTINCT\((.+?)\)\s+AS\s+NDV_(\d+)",
+                statement, re.I | re.S):
+            ndv, value = self.connection.column_stats.get(
+                " ".join(expression.split()).upper(), (1, None)
+            )
+            row += [ndv, value]
+            self.description += [(f"NDV_{i}",), (f"VALUE_{i}",)]
+        self._rows = [tuple(row)]
+
+    def _clustering_information(self, statement):
+        """
+        Return the clustering depth of a table for a clustering key: 1 when
+        the table is clustered on that key, and its partition count
+        otherwise.
+
+        Args:
+            statement (str): SELECT SYSTEM$CLUSTERING_INFORMATION statement.
+        """
+        match = re.search(
+            r"CLUSTERING_INFORMATION\(\s*'(?:\w+\.)*(\w+)'\s*,\s*"
+            r"'\((.*?)\)'", statement, re.I | re.S
+        )
+        name = f"SWIFTAUTO_DB.AUTOMOTIVE.{match.group(1).upper()}"
+        key = "".join(match.group(2).split()).upper()
+        with self.connection._lock:
+            partitions = self.connection.partitions(name)
+            current = self.connection.clustering_keys.get(name) or ""
+        depth = 1.0 if current == f"LINEAR({key})" else float(partitions)
+        self._rows = [(json.dumps({
+            "total_partition_count": partitions, "average_depth": depth
+        }),)]
+        self.description = [("INFO",)]
+
+    def _explain(self, statement):
+        """
+        Return the compiled plan of a query, which is assigned every
+        partition of the tables it reads.
+
+        Args:
+            statement (str): EXPLAIN USING JSON statement.
+        """
+        with self.connection._lock:
+            total = sum(
+                self.connection.partitions(
+                    f"SWIFTAUTO_DB.AUTOMOTIVE.{table.upper()}"
+                )
+                for table in re.findall(
+                    r"FROM\s+AUTOMOTIVE\.(\w+)", statement, re.I
+                )
+            )
+        self._rows = [(json.dumps({"GlobalStats": {
+            "partitionsAssigned": total, "partitionsTotal": total
+        }}),)]
+        self.description = [("content",)]
+
+    def _list(self):
+        """
+        Return the files currently held in the simulated stage.
+        """
+        with self.connection._lock:
+            staged = sorted(self.connection.stage.items())
+        self._rows = [
+            (f"automotive_industry/{path}", size, "", "")
+            for path, size in staged
+        ]
+
+    def _remove(self, statement):
+        """
+        Remove the stage files matched by a REMOVE statement.
+
+        Args:
+            statement (str): REMOVE statement.
+        """
+        location = re.match(r"(?:REMOVE|RM)\s+@(\S+)", statement, re.I)
+        prefix = location.group(1).rstrip(";").partition("/")[2]
+        pattern = re.search(r"PATTERN\s*=\s*'([^']*)'", statement, re.I)
+        with self.connection._lock:
+            for path in list(self.connection.stage):
+                listed = f"automotive_industry/{path}"
+                if path.startswith(prefix) and (
+                        pattern is None
+                        or re.fullmatch(pattern.group(1), listed)):
+                    del self.connection.stage[path]
+                    self._rows.append((listed, "removed"))
+
+    def _access(self, statement):
+        """
+        Apply the tables, roles, users and grants created by a statement.
+
+        Args:
+            statement (str): CREATE, ALTER or GRANT statement.
+        """
+        connection = self.connection
+        table = re.match(
+            r"CREATE\s+(OR\s+REPLACE\s+)?TABLE\s+(IF\s+NOT\s+EXISTS\s+)?"
+            r"([\w.\"]+)", statement, re.I
+        )
+        role = re.match(
+            r"(?:CREATE\s+ROLE\s+IF\s+NOT\s+EXISTS|ALTER\s+ROLE)\s+(\w+)"
+            r".*?COMMENT\s*=\s*'((?:[^']|'')*)'", statement, re.I | re.S
+        )
+        user = re.match(
+            r"(?:CREATE\s+USER\s+IF\s+NOT\s+EXISTS|ALTER\s+USER)\s+(\w+)"
+            r"(.*)", statement, re.I | re.S
+        )
+        grant_role = re.match(
+            r"GRANT\s+ROLE\s+(\w+)\s+TO\s+(ROLE|USER)\s+(\w+)",
+            statement, re.I
+        )
+        grant = re.match(
+            r"GRANT\s+(.+?)\s+ON\s+(.+?)\s+TO\s+ROLE\s+(\w+)",
+            statement, re.I | re.S
+        )
+        cluster = re.match(
+            r"ALTER\s+TABLE\s+([\w.\"]+)\s+CLUSTER\s+BY\s*\((.*)\)",
+            statement, re.I | re.S
+        )
+
+        with connection._lock:
+            if table:
+                name = table.group(3).replace('"', "").upper()
+                if "." not in name:
+                    name = f"SWIFTAUTO_DB.AUTOMOTIVE.{name}"
+                if table.group(1) or name not in connection.tables:
+                    # Replacing a table drops the privileges granted on it,
+                    # its data and its clustering key
+                    connection.privileges = {
+                        privilege for privilege in connection.privileges
+                        if privilege[2:] != ("TABLE", name)
+                    }
+                    connection.columns[name] = re.findall(
+                        r'^\s*"(\w+)"', statement, re.M
+                    )
+                    connection.table_bytes.pop(name, None)
+                    connection.table_rows.pop(name, None)
+                    connection.clustering_keys.pop(name, None)
+                connection.touch(name)
+            elif cluster:
+                name = cluster.group(1).replace('"', "").upper()
+                if name.count(".") < 2:
+                    name = f"SWIFTAUTO_DB.{name}" if "." in name else (
+                        f"SWIFTAUTO_DB.AUTOMOTIVE.{name}"
+                    )
+                connection.clustering_keys[name] = (
+                    f"LINEAR({''.join(cluster.group(2).split()).upper()})"
+                )
+            elif role:
+                comment = role.group(2).replace("''", "'")
+                connection.roles[role.group(1).upper()] = comment
+            elif user:
+                properties = connection.users.setdefault(
+                    user.group(1).upper(), {}
+                )
+                for key, value in re.findall(
+                        r"(\w+)\s*=\s*('(?:[^']|'')*'|\S+)", user.group(2)):
+                    if value.startswith("'"):
+                        value = value[1:-1].replace("''", "'")
+                    if key.upper() != "PASSWORD":
+                        properties[key.lower()] = value
+            elif grant_role:
+                connection.grants.add((
+                    grant_role.group(1).upper(),
+                    grant_role.group(2).upper(),
+                    grant_role.group(3).upper()
+                ))
+            elif grant:
+                target = " ".join(grant.group(2).split()).upper()
+                if target.startswith("ALL TABLES IN SCHEMA "):
+                    schema = target.rsplit(" ", 1)[1]
+                    objects = [
+                        ("TABLE", name) for name in connection.tables
+                        if name.startswith(f"{schema}.")
+                    ]
+                elif target == "ACCOUNT":
+                    objects = [("ACCOUNT", None)]
+                else:
+                    objects = [tuple(target.split(None, 1))]
+                for privilege in grant.group(1).split(","):
+                    for granted_on, name in objects:
+                        connection.privileges.add((
+                            grant.group(3).upper(),
+                            " ".join(privilege.split()).upper(),
+                            granted_on, name
+                        ))
+
+    def _show(self, statement):
+        """
+        Return the tables, roles, users or grants listed by a SHOW
+        statement.
+
+        Args:
+            statement (str): SHOW statement.
+        """
+        connection = self.connection
+        words = statement.upper().split()
+        with connection._lock:
+            if words[1] == "TABLES":
+                columns = ("created_on", "name", "database_name",
+                           "schema_name")
+                schema = words[-1] if len(words) > 2 else ""
+                rows = [
+                    ("", table, database, schema_name)
+                    for database, schema_name, table in (
+                        name.split(".") for name in sorted(connection.tables)
+                    )
+                    if f"{database}.{schema_name}" == schema
+                ]
+            elif words[1] == "ROLES":
+                columns = ("created_on", "name", "comment")
+                rows = [
+                    ("", name, comment)
+                    for name, comment in sorted(connection.roles.items())
+                ]
+            elif words[1] == "USERS":
+                columns = ("name", "comment", "default_warehouse",
+                           "default_role")
+                rows = [
+                    (name, *(properties.get(column) for column in columns[1:]))
+                    for name, properties in sorted(connection.users.items())
+                ]
+            elif words[1:3] == ["GRANTS", "OF"]:
+                columns = ("created_on", "role", "granted_to",
+                           "grantee_name", "granted_by")
+                rows = [
+                    ("", *grant, "SECURITYADMIN")
+                    for grant in sorted(connection.grants)
+                    if grant[0] == words[-1]
+                ]
+            elif words[1:3] == ["GRANTS", "TO"]:
+                columns = ("created_on", "privilege", "granted_on", "name",
+                           "granted_to", "grantee_name")
+                rows = [
+                    ("", privilege, granted_on, name or "SIMULATED", "ROLE",
+                     role)
+                    for role, privilege, granted_on, name
+                    in sorted(connection.privileges, key=str)
+                    if role == words[-1]
+                ]
+            else:
+                columns, rows = (), []
+        self.description = [(column,) for column in columns]
+        self._rows = rows
+
+    def fetchone(self):
+        """
+        Fetch the next row of the last result.
+
+        Returns:
+            tuple: Row, or None when exhausted.
+        """
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        """
+        Fetch the remaining rows of the last result.
+
+        Returns:
+            list: Rows.
+        """
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        """
+        Close the cursor.
+        """
+        self._rows = []
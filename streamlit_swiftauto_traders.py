@@ -9,423 +9,1760 @@ DESCRIPTION: This Streamlit app demonstrates how to create visualizations
 AUDIT TRAIL START                               INIT  DATE
 ----------------------------------------------  ----- -----------
 1. Initial version                              PR    2024-10-25
+2. Computed the sales panels from a single      PR    2026-10-18
+   GROUPING SETS query.
+3. Cached the query results across reruns,      PR    2026-10-18
+   invalidated when a source table changes.
+4. Submitted the queries concurrently and drew  PR    2026-10-18
+   each panel as its result arrives.
+5. Read the rollup tables created by the setup  PR    2026-10-18
+   script when they are up to date.
+6. Fetched every result as Arrow record         PR    2026-10-18
+   batches with per-query transfer statistics.
+7. Moved the month names, ordering and heatmap  PR    2026-10-18
+   cells from pandas into the queries.
+8. Added sidebar filters applied in the         PR    2026-10-18
+   queries through bind parameters.
+9. Fell back to the DuckDB local session when   PR    2026-10-18
+   no Snowflake session is active.
+10. Timed the query, transfer, reshaping and     PR    2026-10-18
+    chart building of every panel, with query
+    tags and a JSON-lines sink.
+11. Bounded the rows of every chart by a pixel   PR    2026-10-18
+    budget with top-N, binning and LTTB.
+12. Split the dashboard into sections, only     PR    2026-10-18
+    querying and drawing the one viewed.
+13. Added a Date range filter and filtered the  PR    2026-10-18
+    recalls by year on their DATE column.
+14. Moved the raw table queries and the         PR    2026-10-18
+    filters to queries_swiftauto_traders.py.
+15. Moved the page into main so the helpers     PR    2026-10-18
+    can be imported by the tests.
+16. Read the filter options from the sources    PR    2026-10-18
+    of the section viewed only.
 
 AUDIT TRAIL END
 """
 
 # Import Python packages
+import contextlib
+import datetime
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import streamlit as st
 import altair as alt
 import plotly.graph_objects as go
-from snowflake.snowpark.context import get_active_session
+from queries_swiftauto_traders import (
+    FILTERS, MODEL_AFFECTED_SYSTEM_QUERY, QUERY_SOURCES,
+    RECALLS_BY_MODEL_QUERY, SALES_AGGREGATES_QUERY, SENTIMENT_HIERARCHY_QUERY,
+    SOURCE_TABLES
+)
+try:
+    from snowflake.snowpark.context import get_active_session
+except ImportError:
+    get_active_session = None
+
+# Query results are kept for CACHE_TTL seconds, or until a source table
+# changes, and at most CACHE_SIZE results are kept
+CACHE_TTL = float(os.getenv('SWIFTAUTO_CACHE_TTL', '3600'))
+CACHE_SIZE = int(os.getenv('SWIFTAUTO_CACHE_SIZE', '64'))
+
+# Seconds between status checks of the running queries
+POLL_INTERVAL = float(os.getenv('SWIFTAUTO_POLL_INTERVAL', '0.1'))
+
+# Every query carries a QUERY_TAG naming the app, the query and its panels,
+# so its cost can be found in QUERY_HISTORY
+QUERY_TAG = os.getenv('SWIFTAUTO_QUERY_TAG', 'swiftauto_traders')
+
+# Panel timings are shown in the Panel timings section when DEBUG is set,
+# with percentiles over the last TIMINGS_HISTORY panels drawn by the app,
+# and appended to TIMINGS_PATH as JSON lines when it is set
+DEBUG = os.getenv('SWIFTAUTO_DEBUG', '0') == '1'
+TIMINGS_HISTORY = int(os.getenv('SWIFTAUTO_TIMINGS_HISTORY', '1000'))
+TIMINGS_PATH = os.getenv('SWIFTAUTO_TIMINGS', '')
+
+# Shown in place of the panels whose query returns no data for the filters
+NO_DATA_MESSAGE = "No data for this filter."
+
+# Metadata probe returning when each table of the schema last changed
+TABLE_VERSIONS_QUERY = """
+    SELECT TABLE_NAME,
+           LAST_ALTERED
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = 'AUTOMOTIVE';
+"""
+
+# Pixel budget of the charts, bounding the rows sent to the browser whatever
+# the data volume: a bar takes at least BAR_PIXELS, a heatmap cell
+# CELL_PIXELS and a time series point POINT_PIXELS of a chart CHART_WIDTH
+# pixels wide, or of its fixed size
+CHART_WIDTH = int(os.getenv('SWIFTAUTO_CHART_WIDTH', '1200'))
+BAR_PIXELS = int(os.getenv('SWIFTAUTO_BAR_PIXELS', '16'))
+CELL_PIXELS = int(os.getenv('SWIFTAUTO_CELL_PIXELS', '20'))
+POINT_PIXELS = int(os.getenv('SWIFTAUTO_POINT_PIXELS', '4'))
+
+# Marks that fit in each chart. Bar charts keep their largest groups and
+# sum the others into an Other group, the heatmap bins its models and
+# affected systems the same way, and time series are downsampled
+MARK_BUDGETS = {
+    'dealer_bars': max(2, CHART_WIDTH // BAR_PIXELS),
+    'model_bars': max(2, 300 // BAR_PIXELS),
+    'recall_bars': max(2, 800 // BAR_PIXELS),
+    'heatmap_models': max(2, 500 // CELL_PIXELS),
+    'heatmap_systems': max(2, 800 // CELL_PIXELS),
+    'month_points': max(3, 800 // POINT_PIXELS),
+}
+
+# The results of the queries of the raw tables, shared with the setup script
+# by queries_swiftauto_traders.py, read from the rollup tables it creates
+SALES_AGGREGATES_ROLLUP_QUERY = """
+    SELECT 'Total' AS "Grain",
+           NULL AS "Model",
+           NULL AS "Dealer ID",
+           NULL AS "Month",
+           NULL AS "Month Number",
+           SUM(QUANTITY_SOLD) AS "Quantity Sold (Sum)",
+           SUM(PROFIT) AS "Profit (Sum)",
+           ROUND(SUM(QUANTITY_SOLD) / SUM(SALES), 3)
+               AS "Average Quantity Sold"
+    FROM AUTOMOTIVE.AU_SALES_BY_MONTH_ROLLUP
+    UNION ALL
+    SELECT 'Model', MODEL, NULL, NULL, NULL, QUANTITY_SOLD, PROFIT, NULL
+    FROM AUTOMOTIVE.AU_SALES_BY_MODEL_ROLLUP
+    UNION ALL
+    SELECT 'Dealer ID', NULL, DEALER_ID, NULL, NULL, QUANTITY_SOLD, PROFIT,
+           NULL
+    FROM AUTOMOTIVE.AU_SALES_BY_DEALER_ROLLUP
+    UNION ALL
+    SELECT 'Month', NULL, NULL, MONTH, MONTH_NUMBER, QUANTITY_SOLD, PROFIT,
+           NULL
+    FROM AUTOMOTIVE.AU_SALES_BY_MONTH_ROLLUP
+"""
+
+RECALLS_BY_MODEL_ROLLUP_QUERY = """
+    SELECT MODEL AS "Model"
+    , SUM(UNITS) AS "Total Recalls"
+    FROM AUTOMOTIVE.AU_RECALLS_BY_MODEL_SYSTEM_ROLLUP
+    GROUP BY MODEL
+"""
+
+SENTIMENT_HIERARCHY_ROLLUP_QUERY = """
+    SELECT SENTIMENT AS "Sentiment",
+           REVIEWS AS "Sentiment (Count)"
+    FROM AUTOMOTIVE.AU_SENTIMENT_ROLLUP
+    ORDER BY "Sentiment (Count)" DESC;
+"""
+
+MODEL_AFFECTED_SYSTEM_ROLLUP_QUERY = """
+    SELECT MODEL,
+        SYSTEM_AFFECTED,
+        UNITS
+    FROM AUTOMOTIVE.AU_RECALLS_BY_MODEL_SYSTEM_ROLLUP
+"""
+
+# Values offered by the sidebar filters: the years of the sales and the
+# models, dealers and states of the dimension tables, each offered when the
+# filter applies to a source of the section viewed, and the range of days
+# of the section's sources, {days} receiving one SELECT per table
+FILTER_OPTION_QUERIES = {
+    'Year': """
+    SELECT DISTINCT 'Year' AS "Filter", CAST(YEAR AS VARCHAR) AS "Value"
+    FROM AUTOMOTIVE.AU_SALES_BY_MODEL
+""",
+    'Model': """
+    SELECT DISTINCT 'Model' AS "Filter", MODEL AS "Value"
+    FROM AUTOMOTIVE.AU_CAR_MODELS
+""",
+    'Dealer ID': """
+    SELECT DISTINCT 'Dealer ID' AS "Filter",
+           CAST(DEALER_ID AS VARCHAR) AS "Value"
+    FROM AUTOMOTIVE.AU_DEALERS
+""",
+    'State': """
+    SELECT DISTINCT 'State' AS "Filter", STATE AS "Value"
+    FROM AUTOMOTIVE.AU_DEALERS
+""",
+    'Date': """
+    SELECT DISTINCT 'Date' AS "Filter", CAST(DAY AS VARCHAR) AS "Value"
+    FROM (
+{days}
+    ) AS DAYS
+    WHERE DAY IS NOT NULL
+""",
+}
+DAYS_QUERY = """\
+        SELECT CAST(MIN(DATE) AS DATE) AS DAY
+        FROM AUTOMOTIVE.{table}
+        UNION ALL
+        SELECT CAST(MAX(DATE) AS DATE)
+        FROM AUTOMOTIVE.{table}"""
+
+# Filters holding numbers, whose values are bound as integers, and filters
+# holding a range of days, picked with a date input
+NUMERIC_FILTERS = ('Year', 'Dealer ID')
+DATE_FILTERS = ('Date',)
+
+# Rollup tables created by the setup script, with the table each one
+# summarizes
+ROLLUP_SOURCES = {
+    'AU_SALES_BY_MONTH_ROLLUP': 'AU_SALES_BY_MODEL',
+    'AU_SALES_BY_MODEL_ROLLUP': 'AU_SALES_BY_MODEL',
+    'AU_SALES_BY_DEALER_ROLLUP': 'AU_SALES_BY_MODEL',
+    'AU_RECALLS_BY_MODEL_SYSTEM_ROLLUP': 'AU_CAR_RECALLS',
+    'AU_SENTIMENT_ROLLUP': 'AU_SENTIMENT',
+}
+
+
+def top_n_query(groups_query, category, measure, limit):
+    """
+    Keep the groups of a query that fit in a bar chart: when there are
+    more groups than bars, the largest groups but one are kept and the
+    others are summed into an Other group. Groups are sorted by category.
+
+    Args:
+        groups_query (str): Query returning one row per category.
+        category (str): Category column.
+        measure (str): Measure column, ranking and summed.
+        limit (int): Bars of the chart.
+
+    Returns:
+        str: SQL query.
+    """
+    return f"""
+    SELECT CASE
+               WHEN "Groups" > {limit} AND "Rank" >= {limit} THEN 'Other'
+               ELSE "{category}"
+           END AS "{category}",
+           SUM("{measure}") AS "{measure}"
+    FROM (
+        SELECT GROUPS.*,
+               ROW_NUMBER() OVER (
+                   ORDER BY "{measure}" DESC, "{category}"
+               ) AS "Rank",
+               COUNT(*) OVER () AS "Groups"
+        FROM ({groups_query}) AS GROUPS
+    ) AS RANKED
+    GROUP BY 1
+    ORDER BY 1;
+"""
+
+
+def sales_top_n_query(aggregates_query, models, dealers):
+    """
+    Keep the models and dealers of a sales aggregates query that fit in
+    their bar charts, as top_n_query does, models being ranked by quantity
+    sold and dealers by profit. Dealer IDs are returned as text to hold
+    the Other group.
+
+    Args:
+        aggregates_query (str): Sales aggregates query, one row per group.
+        models (int): Bars of the Quantity Sold by Model chart.
+        dealers (int): Bars of the Profit by Dealer ID chart.
+
+    Returns:
+        str: SQL query.
+    """
+    # Average Quantity Sold is only read from the single Total row
+    return f"""
+    SELECT "Grain",
+           CASE
+               WHEN "Grain" = 'Model' AND "Groups" > {models}
+                   AND "Rank" >= {models} THEN 'Other'
+               ELSE "Model"
+           END AS "Model",
+           CASE
+               WHEN "Grain" = 'Dealer ID' AND "Groups" > {dealers}
+                   AND "Rank" >= {dealers} THEN 'Other'
+               ELSE CAST("Dealer ID" AS VARCHAR)
+           END AS "Dealer ID",
+           "Month",
+           "Month Number",
+           SUM("Quantity Sold (Sum)") AS "Quantity Sold (Sum)",
+           SUM("Profit (Sum)") AS "Profit (Sum)",
+           MAX("Average Quantity Sold") AS "Average Quantity Sold"
+    FROM (
+        SELECT AGGREGATES.*,
+               ROW_NUMBER() OVER (
+                   PARTITION BY "Grain"
+                   ORDER BY CASE "Grain"
+                                WHEN 'Model' THEN "Quantity Sold (Sum)"
+                                ELSE "Profit (Sum)"
+                            END DESC,
+                            "Model",
+                            "Dealer ID"
+               ) AS "Rank",
+               COUNT(*) OVER (PARTITION BY "Grain") AS "Groups"
+        FROM ({aggregates_query}) AS AGGREGATES
+    ) AS RANKED
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def sales_panels_query(aggregates_query):
+    """
+    Shape the result of a sales aggregates query for the panels: the month
+    rows are returned in long format, one row per metric, and every grain
+    is sorted in display order.
+
+    Args:
+        aggregates_query (str): Sales aggregates query, one row per group.
+
+    Returns:
+        str: SQL query.
+    """
+    return f"""
+    SELECT AGGREGATES.*,
+           METRICS.METRIC AS "Metric",
+           CASE METRICS.METRIC
+               WHEN 'Quantity Sold (Sum)' THEN "Quantity Sold (Sum)"
+               WHEN 'Profit (Sum)' THEN "Profit (Sum)"
+           END AS "Value"
+    FROM ({aggregates_query}) AS AGGREGATES
+    LEFT JOIN (
+        VALUES ('Quantity Sold (Sum)'), ('Profit (Sum)')
+    ) AS METRICS (METRIC)
+        ON AGGREGATES."Grain" = 'Month'
+    ORDER BY "Grain", "Month Number", "Model", "Profit (Sum)", "Metric";
+"""
+
+
+def heatmap_cells_query(cells_query, models, systems):
+    """
+    Bin the result of a recalls by model and affected system query into
+    the rows and columns that fit in the heatmap, the models and affected
+    systems beyond them being summed into an Other row or column as
+    top_n_query does, and complete it with a zero for every combination
+    without recalls, sorted by model and affected system.
+
+    Args:
+        cells_query (str): Query returning the MODEL, SYSTEM_AFFECTED and
+            UNITS columns.
+        models (int): Rows of the heatmap.
+        systems (int): Columns of the heatmap.
+
+    Returns:
+        str: SQL query.
+    """
+    return f"""
+    WITH RAW_CELLS AS ({cells_query}),
+    MODEL_BINS AS (
+        SELECT MODEL,
+               CASE
+                   WHEN COUNT(*) OVER () > {models}
+                       AND ROW_NUMBER() OVER (
+                           ORDER BY SUM(UNITS) DESC, MODEL
+                       ) >= {models} THEN 'Other'
+                   ELSE MODEL
+               END AS BIN
+        FROM RAW_CELLS
+        GROUP BY MODEL
+    ),
+    SYSTEM_BINS AS (
+        SELECT SYSTEM_AFFECTED,
+               CASE
+                   WHEN COUNT(*) OVER () > {systems}
+                       AND ROW_NUMBER() OVER (
+                           ORDER BY SUM(UNITS) DESC, SYSTEM_AFFECTED
+                       ) >= {systems} THEN 'Other'
+                   ELSE SYSTEM_AFFECTED
+               END AS BIN
+        FROM RAW_CELLS
+        GROUP BY SYSTEM_AFFECTED
+    ),
+    CELLS AS (
+        SELECT MODEL_BINS.BIN AS MODEL,
+               SYSTEM_BINS.BIN AS SYSTEM_AFFECTED,
+               SUM(RAW_CELLS.UNITS) AS UNITS
+        FROM RAW_CELLS
+        JOIN MODEL_BINS
+            ON RAW_CELLS.MODEL = MODEL_BINS.MODEL
+        JOIN SYSTEM_BINS
+            ON RAW_CELLS.SYSTEM_AFFECTED = SYSTEM_BINS.SYSTEM_AFFECTED
+        GROUP BY 1, 2
+    )
+    SELECT MODELS.MODEL AS "Model",
+           SYSTEMS.SYSTEM_AFFECTED AS "Affected System",
+           COALESCE(CELLS.UNITS, 0) AS "# of Recalls (Sum)"
+    FROM (SELECT DISTINCT MODEL FROM CELLS) AS MODELS
+    CROSS JOIN (SELECT DISTINCT SYSTEM_AFFECTED FROM CELLS) AS SYSTEMS
+    LEFT JOIN CELLS
+        ON CELLS.MODEL = MODELS.MODEL
+        AND CELLS.SYSTEM_AFFECTED = SYSTEMS.SYSTEM_AFFECTED
+    ORDER BY "Model", "Affected System";
+"""
+
+
+class ResultCache:
+    """
+    Least recently used cache of query results, keyed by the SQL text and
+    bind parameters. A result expires after the time to live, or as soon
+    as one of the tables it was read from has a new LAST_ALTERED time.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, size=CACHE_SIZE, clock=time.monotonic):
+        """
+        Args:
+            ttl (float): Seconds a result is kept.
+            size (int): Maximum number of results kept.
+            clock (callable): Function returning the current time in
+                seconds.
+        """
+        self.ttl = ttl
+        self.size = size
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(query, params=None):
+        """
+        Build the cache key of a query, ignoring differences in whitespace.
+
+        Args:
+            query (str): SQL query.
+            params (list): Bind parameters.
+
+        Returns:
+            tuple: Normalized SQL text and bind parameters.
+        """
+        return " ".join(query.split()), tuple(params or ())
+
+    def get(self, key, versions):
+        """
+        Get a cached result.
+
+        Args:
+            key (tuple): Cache key.
+            versions (dict): Current LAST_ALTERED time of the tables the
+                query reads.
+
+        Returns:
+            pandas.DataFrame: Cached result, or None if there is no fresh
+                result.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if (
+                entry is None
+                or self.clock() - entry[0] > self.ttl
+                or entry[1] != versions
+            ):
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, versions, result):
+        """
+        Cache a result, evicting the least recently used results beyond the
+        cache size.
+
+        Args:
+            key (tuple): Cache key.
+            versions (dict): LAST_ALTERED time of the tables the query
+                reads, as of the query.
+            result (pandas.DataFrame): Query result.
+        """
+        with self.lock:
+            self.entries[key] = (self.clock(), versions, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_result_cache():
+    """
+    Get the result cache shared by every rerun and session of the app.
+
+    Returns:
+        ResultCache: Result cache.
+    """
+    return ResultCache()
+
+
+@st.cache_resource
+def get_timing_history():
+    """
+    Get the timings of the last panels drawn by every rerun and session of
+    the app.
+
+    Returns:
+        collections.deque: Panel timing records, oldest first.
+    """
+    return deque(maxlen=TIMINGS_HISTORY)
+
+
+@st.cache_resource
+def get_local_session():
+    """
+    Get the DuckDB session shared by every rerun and session of the app when
+    it runs outside Snowflake, loading the CSV files of the dataset once.
+
+    Returns:
+        LocalSession: Local session.
+    """
+    # Imported here as DuckDB is not available in Streamlit in Snowflake
+    from local_session_swiftauto_traders import LocalSession
+    return LocalSession()
+
+
+def get_session():
+    """
+    Get the active Snowpark session, or the local session when the app runs
+    outside Snowflake.
+
+    Returns:
+        snowflake.snowpark.Session: Snowpark or local session.
+    """
+    if get_active_session is not None:
+        try:
+            return get_active_session()
+        except Exception:
+            pass
+    return get_local_session()
+
 
-# Get the current credentials
-session = get_active_session()
+def query_tables(query):
+    """
+    List the tables of the schema read by a query.
+
+    Args:
+        query (str): SQL query.
+
+    Returns:
+        list: Table names.
+    """
+    return re.findall(r'AUTOMOTIVE\.(\w+)', query.upper())
+
+
+def numeric_columns(table):
+    """
+    Cast the decimal columns of an Arrow table to integers when they have no
+    scale and to floats otherwise, as the connector does when fetching
+    pandas dataframes, so they are not converted into Python objects.
+
+    Args:
+        table (pyarrow.Table): Query result.
+
+    Returns:
+        pyarrow.Table: Query result with native numeric columns.
+    """
+    return table.cast(pa.schema([
+        field.with_type(pa.int64() if field.type.scale == 0 else pa.float64())
+        if pa.types.is_decimal(field.type) else field
+        for field in table.schema
+    ]))
+
+
+def fetch_result(session, query_id):
+    """
+    Fetch the result of a query as Arrow record batches and convert them
+    into a single pandas dataframe, without creating row objects.
 
-# Streamlit app
-st.set_page_config(layout="wide")
+    Args:
+        session (snowflake.snowpark.Session): Snowpark session.
+        query_id (str): Query ID.
 
-# Custom CSS to remove whitespace above the title
-st.markdown(
+    Returns:
+        tuple: Query result as a pandas dataframe, and its transfer
+            statistics: Arrow batches and bytes, rows, and the seconds
+            spent fetching and converting the batches.
     """
-    <style>
-    .block-container {
-        padding-top: 0rem;
+    cursor = session.connection.cursor()
+    try:
+        start = time.perf_counter()
+        cursor.get_results_from_sfqid(query_id)
+        batches = list(cursor.fetch_arrow_batches())
+        fetched = time.perf_counter()
+        if batches:
+            result = numeric_columns(pa.concat_tables(batches)).to_pandas()
+        else:
+            result = pd.DataFrame(
+                columns=[column[0] for column in cursor.description]
+            )
+        converted = time.perf_counter()
+    finally:
+        cursor.close()
+    return result, {
+        'batches': len(batches),
+        'bytes': sum(batch.nbytes for batch in batches),
+        'rows': len(result),
+        'fetch_seconds': round(fetched - start, 3),
+        'convert_seconds': round(converted - fetched, 3),
     }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
 
-st.title(":car::dash: SwiftAuto Traders Dashboard")
-st.header("Sales")
+
+def query_tag(name, panels=()):
+    """
+    Build the QUERY_TAG of a query of the app.
+
+    Args:
+        name (str): Query name.
+        panels (iterable): Names of the panels drawn from the query.
+
+    Returns:
+        str: Query tag, a JSON object.
+    """
+    return json.dumps(
+        {'app': QUERY_TAG, 'query': name, 'panels': list(panels)}
+    )
+
+
+def get_table_versions(session):
+    """
+    Get when each table of the schema last changed.
+
+    Args:
+        session (snowflake.snowpark.Session): Snowpark session.
+
+    Returns:
+        dict: LAST_ALTERED time by table name.
+    """
+    job = session.sql(TABLE_VERSIONS_QUERY).collect_nowait(
+        statement_params={'QUERY_TAG': query_tag('versions')}
+    )
+    versions_df, _ = fetch_result(session, job.query_id)
+    return dict(zip(
+        versions_df['TABLE_NAME'].str.upper(), versions_df['LAST_ALTERED']
+    ))
+
+
+class PendingQuery:
+    """
+    Query submitted without waiting for its result, or answered from the
+    result cache.
+    """
+
+    def __init__(self, session, cache, key, sources, job=None, result=None):
+        """
+        Args:
+            session (snowflake.snowpark.Session): Snowpark session.
+            cache (ResultCache): Result cache receiving the result.
+            key (tuple): Cache key.
+            sources (dict): LAST_ALTERED time of the tables the query reads.
+            job (snowflake.snowpark.AsyncJob): Running query, None for a
+                cached result.
+            result (pandas.DataFrame): Cached result.
+        """
+        self.session = session
+        self.cache = cache
+        self.key = key
+        self.sources = sources
+        self.job = job
+        self._result = result
+        self.stats = {'cached': job is None}
+        self.submitted = time.perf_counter()
+
+    def is_done(self):
+        """
+        Check whether the result is available.
+
+        Returns:
+            bool: True if the query has completed.
+        """
+        if self.job is None:
+            return True
+        if not self.job.is_done():
+            return False
+        # Time of the first status check finding the query complete
+        self.stats.setdefault(
+            'query_seconds', round(time.perf_counter() - self.submitted, 3)
+        )
+        return True
+
+    def result(self):
+        """
+        Get the result, caching it once the query has completed.
+
+        Returns:
+            pandas.DataFrame: Query result, which must not be modified.
+        """
+        if self.job is not None:
+            self._result, stats = fetch_result(self.session, self.job.query_id)
+            self.stats.update(stats)
+            self.cache.put(self.key, self.sources, self._result)
+            self.job = None
+        return self._result
+
+
+def submit_query(session, cache, versions, query, params=None, tag=None):
+    """
+    Submit a query without waiting for its result, unless the cache holds a
+    result read from the current version of its tables.
+
+    Args:
+        session (snowflake.snowpark.Session): Snowpark session.
+        cache (ResultCache): Result cache.
+        versions (dict): LAST_ALTERED time by table name.
+        query (str): SQL query.
+        params (list): Bind parameters.
+        tag (str): QUERY_TAG of the query.
+
+    Returns:
+        PendingQuery: Submitted or cached query.
+    """
+    key = ResultCache.key(query, params)
+    sources = {table: versions.get(table) for table in query_tables(query)}
+    result = cache.get(key, sources)
+    if result is not None:
+        return PendingQuery(session, cache, key, sources, result=result)
+    job = session.sql(query, params=params).collect_nowait(
+        statement_params={'QUERY_TAG': tag} if tag else None
+    )
+    return PendingQuery(session, cache, key, sources, job=job)
+
+
+def wait_for_results(pending, poll_interval=POLL_INTERVAL):
+    """
+    Wait for submitted queries, in the order they complete.
+
+    Args:
+        pending (dict): Submitted queries by name.
+        poll_interval (float): Seconds between query status checks.
+
+    Yields:
+        tuple: Query name, result and error, the result being None if the
+            query failed.
+    """
+    pending = dict(pending)
+    while pending:
+        done = [name for name, query in pending.items() if query.is_done()]
+        for name in done:
+            query = pending.pop(name)
+            try:
+                result, error = query.result(), None
+            except Exception as e:
+                result, error = None, e
+            yield name, result, error
+        if pending and not done:
+            time.sleep(poll_interval)
+
+
+def lttb(x, y, points):
+    """
+    Choose the points of a series that best preserve its shape with the
+    Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (numpy.ndarray): Increasing x values.
+        y (numpy.ndarray): y values.
+        points (int): Number of points kept, at least 3.
+
+    Returns:
+        numpy.ndarray: Indices of the points kept, in order.
+    """
+    count = len(x)
+    if points >= count:
+        return np.arange(count)
+
+    # The first and last points are kept, and one point of each bucket
+    # between them, forming the largest triangle with the point kept in
+    # the previous bucket and the average of the next bucket
+    size = (count - 2) / (points - 2)
+    indices = [0]
+    for bucket in range(points - 2):
+        start = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        next_end = min(int((bucket + 2) * size) + 1, count)
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        previous = indices[-1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        indices.append(start + int(areas.argmax()))
+    indices.append(count - 1)
+    return np.array(indices)
+
+
+def downsample_series(series_df, x, y, points, by=None):
+    """
+    Downsample a time series with LTTB when it has more points than fit in
+    its chart.
+
+    Args:
+        series_df (pandas.DataFrame): Series sorted by x.
+        x (str): Numeric or datetime x column.
+        y (str): y column.
+        points (int): Points that fit in the chart, per series.
+        by (str): Column holding the name of each series, if several.
+
+    Returns:
+        pandas.DataFrame: Downsampled series.
+    """
+    groups = [series_df] if by is None else [
+        group for _, group in series_df.groupby(by, sort=False)
+    ]
+    if all(len(group) <= points for group in groups):
+        return series_df
+    return pd.concat([
+        group.iloc[lttb(
+            group[x].to_numpy(dtype='float64'),
+            group[y].to_numpy(dtype='float64'),
+            points
+        )]
+        for group in groups
+    ], ignore_index=True)
+
+
+def split_sales_aggregates(sales_df):
+    """
+    Split the result of the sales panels query into one dataframe per
+    panel. When no sales match the filters, the Total row is missing or
+    holds NULL sums, and there is nothing to draw.
+
+    Args:
+        sales_df (pandas.DataFrame): Sales aggregates, one row per group
+            and two rows per month, sorted for display.
+
+    Returns:
+        dict: Totals row and the by model, by dealer and by month
+            dataframes, or None when no sales match the filters.
+    """
+    def grain(name, columns):
+        return sales_df.loc[
+            sales_df['Grain'] == name, columns
+        ].reset_index(drop=True)
+
+    total = grain(
+        'Total',
+        ['Profit (Sum)', 'Quantity Sold (Sum)', 'Average Quantity Sold']
+    )
+    if total.empty or total.iloc[0].isna().any():
+        return None
+
+    # Key columns holding NULL for the other grains come back as floats
+    by_month = grain('Month', ['Month', 'Month Number', 'Metric', 'Value'])
+    by_month['Month Number'] = by_month['Month Number'].astype('int64')
+    by_month = downsample_series(
+        by_month, 'Month Number', 'Value', MARK_BUDGETS['month_points'],
+        by='Metric'
+    )
+
+    return {
+        'total': total.iloc[0],
+        'by_model': grain('Model', ['Model', 'Quantity Sold (Sum)']),
+        'by_dealer': grain('Dealer ID', ['Dealer ID', 'Profit (Sum)']),
+        'by_month': by_month,
+    }
+
+
+def panel_data(name, result):
+    """
+    Prepare the result of a query for the panels drawn from it.
+
+    Args:
+        name (str): Query name.
+        result (pandas.DataFrame): Query result.
+
+    Returns:
+        object: Data the panels are built from, or None when no data
+            matches the filters.
+    """
+    if name == 'sales':
+        return split_sales_aggregates(result)
+    return None if result.empty else result
+
 
 ######################################################################
 # Profit
 ######################################################################
 
-# Execute the SQL query to get the profit value
-profit_value = session.sql(
-    """
-    SELECT CONCAT('US$', TO_CHAR(SUM(profit) / 1000000, 'FM999999999.0'), 'M')
-    AS "Profit"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL;
-    """
-).collect()[0]['Profit']
-
-# Create data directly for Altair
-profit_data = [{'Metric': 'Profit', 'Value': profit_value}]
-
-# Create a Profit scorecard in Altair
-profit_chart = alt.Chart(alt.Data(values=profit_data)).mark_text(
-    align='center',
-    baseline='middle',
-    fontSize=40
-).encode(
-    x=alt.value(200),
-    y=alt.value(100),
-    text='Value:N'
-).properties(
-    width=300,
-    height=300,
-    title='Profit'
-)
+def build_profit_chart(sales):
+    """
+    Create the Profit scorecard.
+
+    Args:
+        sales (dict): Sales aggregates split by panel.
+
+    Returns:
+        altair.Chart: Profit scorecard.
+    """
+    # Format the profit value in millions
+    profit_value = f"US${sales['total']['Profit (Sum)'] / 1000000:.1f}M"
+
+    # Create a single-row dataframe for Altair
+    profit_df = pd.DataFrame({'Metric': ['Profit'], 'Value': [profit_value]})
+
+    # Create a Profit scorecard in Altair
+    return alt.Chart(profit_df).mark_text(
+        align='center',
+        baseline='middle',
+        fontSize=40
+    ).encode(
+        x=alt.value(200),
+        y=alt.value(100),
+        text='Value:N'
+    ).properties(
+        width=300,
+        height=300,
+        title='Profit'
+    )
+
 
 ######################################################################
 # Quantity Sold
 ######################################################################
 
-# Execute the SQL query to get the quantity sold value
-quantity_sold_value = float(session.sql(
-    """
-    SELECT SUM(QUANTITY_SOLD) AS "Quantity Sold"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL;
-    """
-).collect()[0]['Quantity Sold'])
-
-# Create data directly for Altair
-quantity_sold_data = [
-    {'Metric': 'Quantity Sold', 'Value': quantity_sold_value}
-]
-
-# Create a Quantity Sold scorecard in Altair
-quantity_sold_chart = alt.Chart(alt.Data(values=quantity_sold_data)).mark_text(
-    align='center',
-    baseline='middle',
-    fontSize=40
-).encode(
-    x=alt.value(200),
-    y=alt.value(100),
-    text='Value:Q'
-).properties(
-    width=300,
-    height=300,
-    title='Quantity Sold'
-)
+def build_quantity_sold_chart(sales):
+    """
+    Create the Quantity Sold scorecard.
+
+    Args:
+        sales (dict): Sales aggregates split by panel.
+
+    Returns:
+        altair.Chart: Quantity Sold scorecard.
+    """
+    # Get the quantity sold value
+    quantity_sold_value = float(sales['total']['Quantity Sold (Sum)'])
+
+    # Create a single-row dataframe for Altair
+    quantity_sold_df = pd.DataFrame(
+        {'Metric': ['Quantity Sold'], 'Value': [quantity_sold_value]}
+    )
+
+    # Create a Quantity Sold scorecard in Altair
+    return alt.Chart(quantity_sold_df).mark_text(
+        align='center',
+        baseline='middle',
+        fontSize=40
+    ).encode(
+        x=alt.value(200),
+        y=alt.value(100),
+        text='Value:Q'
+    ).properties(
+        width=300,
+        height=300,
+        title='Quantity Sold'
+    )
+
 
 ######################################################################
 # Quantity Sold by Model
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-quantity_sold_by_model_df = session.sql(
+def build_quantity_sold_by_model_chart(sales):
     """
-    SELECT MODEL AS "Model",
-           SUM(QUANTITY_SOLD) AS "Quantity Sold (Sum)"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL
-    GROUP BY MODEL
-    ORDER BY MODEL;
-    """
-).to_pandas()
-
-# Create a Quantity Sold by Model bar chart in Altair
-quantity_sold_by_model_chart = alt.Chart(quantity_sold_by_model_df).mark_bar(
-    color='#55A4D4'
-).encode(
-    y=alt.Y(
-        'Model:N',
-        title='Model',
-        sort=alt.EncodingSortField(field='Model', order='ascending')
-    ),
-    x=alt.X(
-        'Quantity Sold (Sum):Q',
-        title='Quantity Sold (Sum)'
+    Create the Quantity Sold by Model bar chart.
+
+    Args:
+        sales (dict): Sales aggregates split by panel.
+
+    Returns:
+        altair.Chart: Quantity Sold by Model bar chart.
+    """
+    # Get the quantity sold by model dataframe
+    quantity_sold_by_model_df = sales['by_model']
+
+    # Create a Quantity Sold by Model bar chart in Altair
+    return alt.Chart(quantity_sold_by_model_df).mark_bar(
+        color='#55A4D4'
+    ).encode(
+        y=alt.Y(
+            'Model:N',
+            title='Model',
+            sort=alt.EncodingSortField(field='Model', order='ascending')
+        ),
+        x=alt.X(
+            'Quantity Sold (Sum):Q',
+            title='Quantity Sold (Sum)'
+        )
+    ).properties(
+        width=800,
+        height=300,
+        title='Quantity Sold by Model'
     )
-).properties(
-    width=800,
-    height=300,
-    title='Quantity Sold by Model'
-)
+
 
 ######################################################################
 # Average Quantity Sold
 ######################################################################
 
-# Execute the SQL query to get the average quantity sold value
-average_quantity_sold_value = float(session.sql(
-    """
-    SELECT ROUND(AVG(QUANTITY_SOLD), 3) AS "Average Quantity Sold"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL;
-    """
-).collect()[0]['Average Quantity Sold'])
-
-# Create data directly for Altair
-average_quantity_sold_data = [
-    {'Metric': 'Average Quantity Sold', 'Value': average_quantity_sold_value}
-]
-
-# Create an Average Quantity Sold scorecard in Altair
-average_quantity_sold_chart = alt.Chart(
-    alt.Data(values=average_quantity_sold_data)
-).mark_text(
-    align='center',
-    baseline='middle',
-    fontSize=40
-).encode(
-    x=alt.value(200),
-    y=alt.value(100),
-    text='Value:Q'
-).properties(
-    width=300,
-    height=300,
-    title='Average Quantity Sold'
-)
+def build_average_quantity_sold_chart(sales):
+    """
+    Create the Average Quantity Sold scorecard.
+
+    Args:
+        sales (dict): Sales aggregates split by panel.
+
+    Returns:
+        altair.Chart: Average Quantity Sold scorecard.
+    """
+    # Get the average quantity sold value
+    average_quantity_sold_value = float(
+        sales['total']['Average Quantity Sold']
+    )
+
+    # Create a single-row dataframe for Altair
+    average_quantity_sold_df = pd.DataFrame({
+        'Metric': ['Average Quantity Sold'],
+        'Value': [average_quantity_sold_value]
+    })
+
+    # Create an Average Quantity Sold scorecard in Altair
+    return alt.Chart(average_quantity_sold_df).mark_text(
+        align='center',
+        baseline='middle',
+        fontSize=40
+    ).encode(
+        x=alt.value(200),
+        y=alt.value(100),
+        text='Value:Q'
+    ).properties(
+        width=300,
+        height=300,
+        title='Average Quantity Sold'
+    )
 
-# Display charts side by side
-col1, col2, col3, col4 = st.columns(4)
-col1.altair_chart(profit_chart, use_container_width=True)
-col2.altair_chart(quantity_sold_chart, use_container_width=True)
-col3.altair_chart(quantity_sold_by_model_chart, use_container_width=True)
-col4.altair_chart(average_quantity_sold_chart, use_container_width=True)
 
 ######################################################################
 # Profit by Dealer ID
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-profit_by_dealer_df = session.sql(
+def build_profit_by_dealer_chart(sales):
     """
-    SELECT DEALER_ID AS "Dealer ID",
-        SUM(PROFIT) AS "Profit (Sum)"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL
-    GROUP BY DEALER_ID
-    ORDER BY SUM(PROFIT) ASC;
-    """
-).to_pandas()
-
-# Create a Profit by Dealer ID column chart in Altair
-profit_by_dealer_chart = alt.Chart(profit_by_dealer_df).mark_bar(
-    color='#55A4D4'
-).encode(
-    x=alt.X(
-        'Dealer ID:N',
-        title='Dealer ID',
-        axis=alt.Axis(labelAngle=0),
-        sort=alt.EncodingSortField(field='Profit (Sum)', order='ascending')
-    ),
-    y=alt.Y(
-        'Profit (Sum):Q',
-        title='Profit (Sum)'
+    Create the Profit by Dealer ID column chart.
+
+    Args:
+        sales (dict): Sales aggregates split by panel.
+
+    Returns:
+        altair.Chart: Profit by Dealer ID column chart.
+    """
+    # Get the profit by dealer dataframe
+    profit_by_dealer_df = sales['by_dealer']
+
+    # Create a Profit by Dealer ID column chart in Altair
+    return alt.Chart(profit_by_dealer_df).mark_bar(
+        color='#55A4D4'
+    ).encode(
+        x=alt.X(
+            'Dealer ID:N',
+            title='Dealer ID',
+            axis=alt.Axis(labelAngle=0),
+            sort=alt.EncodingSortField(field='Profit (Sum)', order='ascending')
+        ),
+        y=alt.Y(
+            'Profit (Sum):Q',
+            title='Profit (Sum)'
+        )
+    ).properties(
+        width='container',
+        height=400,
+        title='Profit by Dealer ID'
     )
-).properties(
-    width='container',
-    height=400,
-    title='Profit by Dealer ID'
-)
-st.altair_chart(profit_by_dealer_chart, use_container_width=True)
 
-st.header("Service")
 
 ######################################################################
 # # of Recalls by Model
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-recalls_by_model_df = session.sql(
+def build_recalls_by_model_chart(recalls_by_model_df):
     """
-    SELECT MODEL AS "Model"
-    , SUM(UNITS) AS "Total Recalls"
-    FROM AUTOMOTIVE.AU_CAR_RECALLS
-    GROUP BY MODEL
-    ORDER BY MODEL;
-    """
-).to_pandas()
-
-# Create a # of Recalls by Model column chart
-recalls_by_model_chart = alt.Chart(recalls_by_model_df).mark_bar(
-    color='#55A4D4'
-).encode(
-    x=alt.X('Model:N', title='Model', axis=alt.Axis(labelAngle=0)),
-    y=alt.Y('Total Recalls:Q', title='# of Recalls (Sum)')
-).properties(
-    width=800,
-    height=370,
-    title='# of Recalls by Model'
-)
+    Create the # of Recalls by Model column chart.
+
+    Args:
+        recalls_by_model_df (pandas.DataFrame): Recalls by model.
+
+    Returns:
+        altair.Chart: # of Recalls by Model column chart.
+    """
+    # Create a # of Recalls by Model column chart
+    return alt.Chart(recalls_by_model_df).mark_bar(
+        color='#55A4D4'
+    ).encode(
+        x=alt.X('Model:N', title='Model', axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('Total Recalls:Q', title='# of Recalls (Sum)')
+    ).properties(
+        width=800,
+        height=370,
+        title='# of Recalls by Model'
+    )
+
 
 ######################################################################
 # Sentiment for Sentiment Hierarchy
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-sentiment_hierarchy_df = session.sql(
+def build_sentiment_hierarchy_chart(sentiment_hierarchy_df):
     """
-    SELECT SENTIMENT AS "Sentiment",
-           COUNT(*) AS "Sentiment (Count)"
-    FROM AUTOMOTIVE.AU_SENTIMENT
-    GROUP BY SENTIMENT
-    ORDER BY "Sentiment (Count)" DESC;
+    Create the Sentiment for Sentiment Hierarchy treemap.
+
+    Args:
+        sentiment_hierarchy_df (pandas.DataFrame): Sentiment counts.
+
+    Returns:
+        plotly.graph_objects.Figure: Sentiment for Sentiment Hierarchy
+            treemap.
     """
-).to_pandas()
-
-# Create a Sentiment for Sentiment Hierarchy treemap in Plotly
-sentiment_hierarchy_chart = go.Figure(go.Treemap(
-    labels=sentiment_hierarchy_df['Sentiment'],
-    parents=[""] * len(sentiment_hierarchy_df),
-    values=sentiment_hierarchy_df['Sentiment (Count)'],
-    marker_colors=['#F0D359', '#9EC860', '#55A4D4'],
-    textfont_color='white'
-))
-
-# Add custom legend
-sentiment_hierarchy_chart.update_layout(
-    title="Sentiment for Sentiment Hierarchy",
-    width=800,
-    height=370,
-    margin={
-        "l": 0,
-        "r": 0,
-        "t": 30,
-        "b": 10
-    },
-    annotations=[
-        {
-            "text": (
-                "Sentiment: <span style='color:#55A4D4'>Negative</span>, "
-                "<span style='color:#9EC860'>Neutral</span>, "
-                "<span style='color:#F0D359'>Positive</span>"
-            ),
-            "showarrow": False,
-            "x": 0.5,
-            "y": 1,
-            "xref": "paper",
-            "yref": "paper",
-            "font": {
-                "size": 14,
-                "color": "black"
-            },
-        }
-    ]
-)
+    # Create a Sentiment for Sentiment Hierarchy treemap in Plotly
+    sentiment_hierarchy_chart = go.Figure(go.Treemap(
+        labels=sentiment_hierarchy_df['Sentiment'],
+        parents=[""] * len(sentiment_hierarchy_df),
+        values=sentiment_hierarchy_df['Sentiment (Count)'],
+        marker_colors=['#F0D359', '#9EC860', '#55A4D4'],
+        textfont_color='white'
+    ))
+
+    # Add custom legend
+    sentiment_hierarchy_chart.update_layout(
+        title="Sentiment for Sentiment Hierarchy",
+        width=800,
+        height=370,
+        margin={
+            "l": 0,
+            "r": 0,
+            "t": 30,
+            "b": 10
+        },
+        annotations=[
+            {
+                "text": (
+                    "Sentiment: <span style='color:#55A4D4'>Negative</span>, "
+                    "<span style='color:#9EC860'>Neutral</span>, "
+                    "<span style='color:#F0D359'>Positive</span>"
+                ),
+                "showarrow": False,
+                "x": 0.5,
+                "y": 1,
+                "xref": "paper",
+                "yref": "paper",
+                "font": {
+                    "size": 14,
+                    "color": "black"
+                },
+            }
+        ]
+    )
+    return sentiment_hierarchy_chart
 
-# Display charts side by side
-col1, col2 = st.columns(2)
-col1.altair_chart(recalls_by_model_chart, use_container_width=True)
-col2.plotly_chart(sentiment_hierarchy_chart, use_container_width=True)
 
 ######################################################################
 # Profit and Quantity Sold by Month
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-profit_quantity_sold_by_month_df = session.sql(
+def build_profit_quantity_sold_by_month_chart(sales):
     """
-    SELECT MONTH AS "Month",
-        MONTH(DATE) AS "Month Number",
-        SUM(QUANTITY_SOLD) AS "Quantity Sold (Sum)",
-        SUM(PROFIT) AS "Profit (Sum)"
-    FROM AUTOMOTIVE.AU_SALES_BY_MODEL
-    GROUP BY MONTH,
-        MONTH(DATE)
-    ORDER BY MONTH(DATE);
-    """
-).to_pandas()
+    Create the Profit and Quantity Sold by Month chart.
 
-# Map month numbers to month names
-month_names = {
-    1: 'January', 2: 'February', 3: 'March', 4: 'April', 5: 'May', 6: 'June',
-    7: 'July', 8: 'August', 9: 'September', 10: 'October', 11: 'November',
-    12: 'December'
-}
-profit_quantity_sold_by_month_df['Month Name'] = (
-    profit_quantity_sold_by_month_df['Month Number'].map(month_names)
-)
+    Args:
+        sales (dict): Sales aggregates split by panel.
 
-# Melt the data for easier plotting with a shared legend
-melted_data = profit_quantity_sold_by_month_df.melt(
-    id_vars=['Month Name'],
-    value_vars=['Quantity Sold (Sum)', 'Profit (Sum)'],
-    var_name='Metric',
-    value_name='Value'
-)
+    Returns:
+        altair.LayerChart: Profit and Quantity Sold by Month chart.
+    """
+    # Get the profit and quantity sold by month dataframe, with one row per
+    # month and metric for plotting with a shared legend
+    profit_quantity_sold_by_month_df = sales['by_month']
 
-# Create Profit and Quantity Sold by Month chart
-base = alt.Chart(melted_data).encode(
-    alt.X('Month Name:N', title='Month', sort=list(month_names.values())),
-    alt.Color('Metric:N', title='Metrics')
-)
-bar = base.mark_bar().encode(
-    alt.Y('Value:Q', title='Quantity Sold (Sum)'),
-    alt.Color(
-        'Metric:N',
-        title='Metrics',
-        scale=alt.Scale(
-            domain=['Quantity Sold (Sum)', 'Profit (Sum)'],
-            range=['#55A4D4', '#8FBF54']
+    # Create Profit and Quantity Sold by Month chart
+    base = alt.Chart(profit_quantity_sold_by_month_df).encode(
+        alt.X(
+            'Month:N',
+            title='Month',
+            sort=alt.EncodingSortField(field='Month Number', order='ascending')
+        ),
+        alt.Color('Metric:N', title='Metrics')
+    )
+    bar = base.mark_bar().encode(
+        alt.Y('Value:Q', title='Quantity Sold (Sum)'),
+        alt.Color(
+            'Metric:N',
+            title='Metrics',
+            scale=alt.Scale(
+                domain=['Quantity Sold (Sum)', 'Profit (Sum)'],
+                range=['#55A4D4', '#8FBF54']
+            )
         )
+    ).transform_filter(
+        alt.datum.Metric == 'Quantity Sold (Sum)'
     )
-).transform_filter(
-    alt.datum.Metric == 'Quantity Sold (Sum)'
-)
-line = base.mark_line(point=True).encode(
-    alt.Y('Value:Q', title='Profit (Sum)'),
-    alt.Color(
-        'Metric:N',
-        title='Metrics',
-        scale=alt.Scale(
-            domain=['Quantity Sold (Sum)', 'Profit (Sum)'],
-            range=['#55A4D4', '#8FBF54']
+    line = base.mark_line(point=True).encode(
+        alt.Y('Value:Q', title='Profit (Sum)'),
+        alt.Color(
+            'Metric:N',
+            title='Metrics',
+            scale=alt.Scale(
+                domain=['Quantity Sold (Sum)', 'Profit (Sum)'],
+                range=['#55A4D4', '#8FBF54']
+            )
         )
+    ).transform_filter(
+        alt.datum.Metric == 'Profit (Sum)'
+    )
+
+    # Combine the bar and line charts with a legend
+    return alt.layer(bar, line).resolve_scale(
+        y='independent'
+    ).properties(
+        width=800,
+        height=500,
+        title='Profit and Quantity Sold by Month'
+    ).configure_legend(
+        labelFontSize=12,
+        orient='top'
     )
-).transform_filter(
-    alt.datum.Metric == 'Profit (Sum)'
-)
 
-# Combine the bar and line charts with a legend
-profit_quantity_sold_by_month_chart = alt.layer(bar, line).resolve_scale(
-    y='independent'
-).properties(
-    width=800,
-    height=500,
-    title='Profit and Quantity Sold by Month'
-).configure_legend(
-    labelFontSize=12,
-    orient='top'
-)
 
 ######################################################################
 # # of Recalls by Model and Affected System
 ######################################################################
 
-# Execute the SQL query and create a pandas dataframe
-model_affected_system_df = session.sql(
+def build_model_affected_system_chart(model_affected_system_df):
     """
-    SELECT MODEL AS "Model",
-        SYSTEM_AFFECTED AS "Affected System",
-        SUM(UNITS) AS "# of Recalls (Sum)"
-    FROM AUTOMOTIVE.AU_CAR_RECALLS
-    GROUP BY MODEL,
-        SYSTEM_AFFECTED;
+    Create the # of Recalls by Model and Affected System heatmap.
+
+    Args:
+        model_affected_system_df (pandas.DataFrame): Recalls by model and
+            affected system, with a row for every combination.
+
+    Returns:
+        altair.Chart: # of Recalls by Model and Affected System heatmap.
     """
-).to_pandas()
+    # Create heatmap
+    return alt.Chart(model_affected_system_df).mark_rect().encode(
+        x='Affected System:O',
+        y='Model:O',
+        color=alt.Color(
+            '# of Recalls (Sum):Q', legend=alt.Legend(orient='top')
+        )
+    ).properties(
+        title='# of Recalls by Model and Affected System',
+        width=800,
+        height=500
+    )
 
-# Create pivot table
-pivot_table = model_affected_system_df.pivot_table(
-    index='Model',
-    columns='Affected System',
-    values='# of Recalls (Sum)'
-)
 
-# Convert pivot table to long format
-pivot_long = pivot_table.reset_index().melt(
-    id_vars='Model',
-    value_name='# of Recalls (Sum)'
-)
+# Queries of the dashboard, and the panels drawn from the result of each
+# query with the function creating their chart, reduced to the marks that
+# fit in each chart
+QUERIES = {
+    'sales': sales_panels_query(sales_top_n_query(
+        SALES_AGGREGATES_QUERY,
+        MARK_BUDGETS['model_bars'], MARK_BUDGETS['dealer_bars']
+    )),
+    'recalls_by_model': top_n_query(
+        RECALLS_BY_MODEL_QUERY, 'Model', 'Total Recalls',
+        MARK_BUDGETS['recall_bars']
+    ),
+    'sentiment_hierarchy': SENTIMENT_HIERARCHY_QUERY,
+    'model_affected_system': heatmap_cells_query(
+        MODEL_AFFECTED_SYSTEM_QUERY,
+        MARK_BUDGETS['heatmap_models'], MARK_BUDGETS['heatmap_systems']
+    ),
+}
+ROLLUP_QUERIES = {
+    'sales': sales_panels_query(sales_top_n_query(
+        SALES_AGGREGATES_ROLLUP_QUERY,
+        MARK_BUDGETS['model_bars'], MARK_BUDGETS['dealer_bars']
+    )),
+    'recalls_by_model': top_n_query(
+        RECALLS_BY_MODEL_ROLLUP_QUERY, 'Model', 'Total Recalls',
+        MARK_BUDGETS['recall_bars']
+    ),
+    'sentiment_hierarchy': SENTIMENT_HIERARCHY_ROLLUP_QUERY,
+    'model_affected_system': heatmap_cells_query(
+        MODEL_AFFECTED_SYSTEM_ROLLUP_QUERY,
+        MARK_BUDGETS['heatmap_models'], MARK_BUDGETS['heatmap_systems']
+    ),
+}
+PANELS = {
+    'sales': {
+        'profit': build_profit_chart,
+        'quantity_sold': build_quantity_sold_chart,
+        'quantity_sold_by_model': build_quantity_sold_by_model_chart,
+        'average_quantity_sold': build_average_quantity_sold_chart,
+        'profit_by_dealer': build_profit_by_dealer_chart,
+        'profit_quantity_sold_by_month':
+            build_profit_quantity_sold_by_month_chart,
+    },
+    'recalls_by_model': {
+        'recalls_by_model': build_recalls_by_model_chart,
+    },
+    'sentiment_hierarchy': {
+        'sentiment_hierarchy': build_sentiment_hierarchy_chart,
+    },
+    'model_affected_system': {
+        'model_affected_system': build_model_affected_system_chart,
+    },
+}
+# Sections of the dashboard, only the one viewed being queried and drawn,
+# as rows of panels laid out side by side
+SECTIONS = {
+    'Sales': [
+        ['profit', 'quantity_sold', 'quantity_sold_by_model',
+         'average_quantity_sold'],
+        ['profit_by_dealer'],
+    ],
+    'Service': [
+        ['recalls_by_model', 'sentiment_hierarchy'],
+        ['profit_quantity_sold_by_month', 'model_affected_system'],
+    ],
+}
 
-# Create heatmap
-model_affected_system_chart = alt.Chart(pivot_long).mark_rect().encode(
-    x='Affected System:O',
-    y='Model:O',
-    color=alt.Color('# of Recalls (Sum):Q', legend=alt.Legend(orient='top'))
-).properties(
-    title='# of Recalls by Model and Affected System',
-    width=800,
-    height=500
-)
 
-# Display charts side by side
-col1, col2 = st.columns(2)
-col1.altair_chart(
-    profit_quantity_sold_by_month_chart, use_container_width=True
-)
-col2.altair_chart(model_affected_system_chart, use_container_width=True)
+def section_sources(section):
+    """
+    List the sources queried by the panels of a section.
+
+    Args:
+        section (str): Section name, a key of SECTIONS.
+
+    Returns:
+        list: Sources of the section, in the order of SOURCE_TABLES.
+    """
+    panels = {panel for row in SECTIONS[section] for panel in row}
+    sources = {
+        QUERY_SOURCES[name] for name, query_panels in PANELS.items()
+        if panels & set(query_panels)
+    }
+    return [source for source in SOURCE_TABLES if source in sources]
+
+
+def filter_options_query(sources):
+    """
+    Build the query of the values offered by the sidebar filters that apply
+    to the sources of a section, reading the range of days of these sources
+    only.
+
+    Args:
+        sources (list): Sources of the section, keys of SOURCE_TABLES.
+
+    Returns:
+        str: SQL query.
+    """
+    days = "\n        UNION ALL\n".join(
+        DAYS_QUERY.format(table=SOURCE_TABLES[source]) for source in sources
+    )
+    return "    UNION ALL".join(
+        query.format(days=days)
+        for name, query in FILTER_OPTION_QUERIES.items()
+        if any(source in FILTERS[name] for source in sources)
+    ).rstrip() + ";\n"
+
+
+def filter_options(options_df):
+    """
+    Group the values offered by the sidebar filters by filter.
+
+    Args:
+        options_df (pandas.DataFrame): Result of the filter options query.
+
+    Returns:
+        dict: Sorted values by filter name, in the order of FILTERS, for
+            the filters the query offers values of.
+    """
+    options = {}
+    for name in FILTERS:
+        if name not in FILTER_OPTION_QUERIES:
+            continue
+        values = options_df.loc[options_df['Filter'] == name, 'Value']
+        if name in NUMERIC_FILTERS:
+            values = values.astype('int64')
+        elif name in DATE_FILTERS:
+            values = pd.to_datetime(values).dt.date
+        options[name] = sorted(values.tolist())
+    return options
+
+
+def date_range_params(selected, days):
+    """
+    Convert the range picked in a date filter into its bind parameters,
+    the first day and the day after the last one, so that the timestamps
+    of the last day are kept.
+
+    Args:
+        selected (tuple): Days picked in the date input.
+        days (list): Sorted days offered by the filter.
+
+    Returns:
+        list: Bind parameters, empty when the range is incomplete or holds
+            every day offered.
+    """
+    if len(selected) != 2 or (
+            selected[0] <= days[0] and selected[1] >= days[-1]):
+        return []
+    return [selected[0], selected[1] + datetime.timedelta(days=1)]
+
+
+def where_clause(source, filters):
+    """
+    Build the WHERE clause applying the sidebar filters to a table.
+
+    Args:
+        source (str): Filtered table, a key of the FILTERS conditions.
+        filters (dict): Selected values by filter name, empty for all.
+
+    Returns:
+        tuple: WHERE clause, empty when no filter applies, and its bind
+            parameters.
+    """
+    conditions, params = [], []
+    for name, values in filters.items():
+        condition = FILTERS[name].get(source)
+        if values and condition:
+            conditions.append(condition.format(", ".join("?" * len(values))))
+            params += values
+    if not conditions:
+        return "", params
+    return "WHERE " + "\n        AND ".join(conditions), params
+
+
+def select_queries(versions, filters):
+    """
+    Choose the query of each result: the rollup query when no filter
+    applies and its rollup tables exist and are at least as recent as the
+    tables they summarize, and the query of the raw tables otherwise.
+
+    Args:
+        versions (dict): LAST_ALTERED time by table name.
+        filters (dict): Selected values by filter name, empty for all.
+
+    Returns:
+        dict: Query and bind parameters by result name.
+    """
+    def is_fresh(rollup):
+        source = ROLLUP_SOURCES[rollup]
+        return (
+            versions.get(rollup) is not None
+            and versions.get(source) is not None
+            and versions[rollup] >= versions[source]
+        )
+
+    queries = {}
+    for name, query in QUERIES.items():
+        where, params = where_clause(QUERY_SOURCES[name], filters)
+        rollup_query = ROLLUP_QUERIES[name]
+        if not params and all(
+                is_fresh(table) for table in query_tables(rollup_query)):
+            query = rollup_query
+        queries[name] = (query.format(where=where), params)
+    return queries
+
+
+class PanelTimings:
+    """
+    Collect the timing of every panel drawn in a rerun: the time its query
+    ran, the size of its result and the time spent fetching and converting
+    it, then the time spent reshaping the result, building the chart and
+    drawing it.
+    """
+
+    def __init__(self):
+        self.run_id = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        )
+        self.panels = {}
+        self.start = time.perf_counter()
+        self.seconds = None
+
+    def add(self, panels, **values):
+        """
+        Record values of panels.
+
+        Args:
+            panels (iterable): Panel names.
+            **values: Recorded values by name.
+        """
+        for panel in panels:
+            self.panels.setdefault(panel, {}).update(values)
+
+    @contextlib.contextmanager
+    def timed(self, panels, phase):
+        """
+        Record the wall time of the block as a phase of panels.
+
+        Args:
+            panels (iterable): Panel names.
+            phase (str): Phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(panels, **{
+                f'{phase}_seconds': round(time.perf_counter() - start, 3)
+            })
+
+    def ready(self, panels):
+        """
+        Record the time since the start of the rerun when panels were
+        drawn.
+
+        Args:
+            panels (iterable): Panel names.
+        """
+        self.add(
+            panels, ready_seconds=round(time.perf_counter() - self.start, 3)
+        )
+
+    def finish(self):
+        """
+        Record the wall time of the rerun.
+        """
+        self.seconds = round(time.perf_counter() - self.start, 3)
+
+    def records(self):
+        """
+        List the panel records and the rerun record.
+
+        Returns:
+            list: Records as dictionaries.
+        """
+        return [
+            {'type': 'panel', 'run_id': self.run_id, 'panel': panel,
+             **values}
+            for panel, values in self.panels.items()
+        ] + [{'type': 'rerun', 'run_id': self.run_id, 'seconds': self.seconds}]
+
+    def write(self, path):
+        """
+        Append the records to a JSON-lines file.
+
+        Args:
+            path (str): Output file path.
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in self.records():
+                f.write(json.dumps(entry) + "\n")
+
+
+def timing_percentiles(records):
+    """
+    Summarize panel timings as the median and 95th percentile of each
+    phase.
+
+    Args:
+        records (iterable): Panel timing records.
+
+    Returns:
+        pandas.DataFrame: One row per panel, with the number of times it
+            was drawn and two columns per phase.
+    """
+    timings_df = pd.DataFrame(records)
+    columns = [
+        column for column in timings_df.columns
+        if column.endswith('_seconds')
+    ]
+    grouped = timings_df.groupby('panel', sort=False)[columns]
+    summary = pd.concat(
+        {'p50': grouped.quantile(0.5), 'p95': grouped.quantile(0.95)},
+        axis=1
+    ).swaplevel(axis=1)[columns]
+    summary.columns = [f"{column} {stat}" for column, stat in summary.columns]
+    summary.insert(0, 'draws', grouped.size())
+    return summary.reset_index()
+
+
+def chart_key(query, params, versions):
+    """
+    Identify the charts drawn from a query result: the same query and bind
+    parameters read from the same version of its tables give the same
+    charts.
+
+    Args:
+        query (str): SQL query.
+        params (list): Bind parameters.
+        versions (dict): LAST_ALTERED time by table name.
+
+    Returns:
+        tuple: Chart key.
+    """
+    return (
+        ResultCache.key(query, params),
+        tuple((table, versions.get(table)) for table in query_tables(query)),
+    )
+
+
+def draw_chart(placeholder, chart):
+    """
+    Draw a chart in its placeholder.
+
+    Args:
+        placeholder (streamlit.delta_generator.DeltaGenerator):
+            Placeholder of the panel.
+        chart (altair.TopLevelMixin | plotly.graph_objects.Figure): Chart,
+            None when the filters match no data.
+    """
+    if chart is None:
+        placeholder.info(NO_DATA_MESSAGE)
+    elif isinstance(chart, go.Figure):
+        placeholder.plotly_chart(chart, use_container_width=True)
+    else:
+        placeholder.altair_chart(chart, use_container_width=True)
+
+
+def main():
+    """
+    Draw the dashboard: the sidebar filters and the panels of the section
+    viewed, each as soon as the result of its query arrives.
+    """
+    # Streamlit app, configured before any other Streamlit call
+    st.set_page_config(layout="wide")
+
+    # Time the rerun and every panel drawn by it
+    timings = PanelTimings()
+
+    # Get the current credentials, or the local session outside Snowflake
+    session = get_session()
+
+    # Probe the tables once per rerun so unchanged results come from the cache
+    cache = get_result_cache()
+    versions = get_table_versions(session)
+
+    # Custom CSS to remove whitespace above the title
+    st.markdown(
+        """
+        <style>
+        .block-container {
+            padding-top: 0rem;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.title(":car::dash: SwiftAuto Traders Dashboard")
+
+    # Only the section viewed is queried and drawn
+    section = st.radio(
+        "Section", list(SECTIONS), horizontal=True,
+        label_visibility="collapsed"
+    )
+    section_panels = [panel for row in SECTIONS[section] for panel in row]
+
+    # Get the values offered by the sidebar filters, from the sources of the
+    # section only
+    options = filter_options(
+        submit_query(
+            session, cache, versions,
+            filter_options_query(section_sources(section)),
+            tag=query_tag('filter_options')
+        ).result()
+    )
+
+    # Sidebar filters, applied in the warehouse through bind parameters
+    st.sidebar.header("Filters")
+    filters = {}
+    for name, values in options.items():
+        if name not in DATE_FILTERS:
+            filters[name] = st.sidebar.multiselect(
+                name, values, placeholder="All"
+            )
+        elif values:
+            filters[name] = date_range_params(
+                st.sidebar.date_input(
+                    name, (values[0], values[-1]),
+                    min_value=values[0], max_value=values[-1]
+                ),
+                values
+            )
+
+    # Charts drawn earlier in the session, by panel, with the key of the query
+    # result they were built from
+    charts = st.session_state.setdefault('charts', {})
+
+    # Submit every query of the section whose charts were not drawn from the
+    # same result earlier in the session, before drawing anything, so they run
+    # at the same time, reading the rollup tables when no filter is selected
+    # and they are up to date
+    panel_keys, pending = {}, {}
+    for name, (query, params) in select_queries(versions, filters).items():
+        panels = [panel for panel in PANELS[name] if panel in section_panels]
+        key = chart_key(query, params, versions)
+        panel_keys.update((panel, key) for panel in panels)
+        if any(charts.get(panel, (None,))[0] != key for panel in panels):
+            pending[name] = submit_query(
+                session, cache, versions, query, params,
+                tag=query_tag(name, PANELS[name])
+            )
+
+    # Lay out a placeholder for every panel of the section, showing the chart
+    # drawn earlier in the session or filled in as its query returns
+    st.header(section)
+    placeholders = {}
+    for row in SECTIONS[section]:
+        columns = st.columns(len(row)) if len(row) > 1 else [st]
+        for panel, column in zip(row, columns):
+            placeholders[panel] = column.empty()
+
+    for panel, placeholder in placeholders.items():
+        key, chart = charts.get(panel, (None, None))
+        if key == panel_keys[panel]:
+            with timings.timed([panel], 'draw'):
+                draw_chart(placeholder, chart)
+            timings.add([panel], memoized=True)
+            timings.ready([panel])
+        else:
+            placeholder.info("Loading...")
+
+    # Draw the panels of each query as soon as its result arrives
+    for name, result, error in wait_for_results(pending):
+        panels = {
+            panel: build_chart for panel, build_chart in PANELS[name].items()
+            if panel in placeholders
+            and charts.get(panel, (None,))[0] != panel_keys[panel]
+        }
+        timings.add(panels, query=name, **pending[name].stats)
+        if error is not None:
+            timings.add(panels, error=str(error))
+            for panel in panels:
+                placeholders[panel].error(
+                    f"An unexpected error occurred: {error}"
+                )
+            timings.ready(panels)
+            continue
+        with timings.timed(panels, 'transform'):
+            result = panel_data(name, result)
+        for panel, build_chart in panels.items():
+            with timings.timed([panel], 'build'):
+                chart = None if result is None else build_chart(result)
+            charts[panel] = (panel_keys[panel], chart)
+            with timings.timed([panel], 'draw'):
+                draw_chart(placeholders[panel], chart)
+            timings.ready([panel])
+    timings.finish()
+
+    # Keep the panel timings of every session, and append them to the sink
+    history = get_timing_history()
+    history.extend(
+        record for record in timings.records() if record['type'] == 'panel'
+    )
+    if TIMINGS_PATH:
+        try:
+            timings.write(TIMINGS_PATH)
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+    # Show where each panel spent its time, in this rerun and across sessions
+    if DEBUG:
+        with st.expander("Panel timings"):
+            st.caption(f"Rerun {timings.run_id} took {timings.seconds:.3f}s")
+            st.dataframe(
+                pd.DataFrame([
+                    record for record in timings.records()
+                    if record['type'] == 'panel'
+                ]).drop(columns=['type', 'run_id']),
+                hide_index=True
+            )
+            st.caption(f"Percentiles of the last {len(history)} panels drawn")
+            st.dataframe(timing_percentiles(history), hide_index=True)
+
+
+if __name__ == "__main__":
+    main()
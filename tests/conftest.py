@@ -0,0 +1,68 @@
+"""
+Shared fixtures of the tests of the SwiftAuto Traders scripts.
+"""
+
+# Importing the required libraries
+import contextlib
+import io
+import os
+import shutil
+import sys
+import pytest
+
+# Make the scripts at the repository root importable
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture(scope="session")
+def local_session():
+    """
+    Load the bundled dataset into a local session shared by the tests.
+    """
+    import local_session_swiftauto_traders
+    return local_session_swiftauto_traders.LocalSession(
+        dataset_dir=os.path.join(REPO_DIR, "Automotive_Industry")
+    )
+
+
+@pytest.fixture
+def connection(tmp_path, monkeypatch):
+    """
+    Run the setup in a copy of the dataset against a simulated connection.
+    """
+    import setup_swiftauto_traders as setup
+    import simulated_snowflake as simulated
+    shutil.copytree(
+        os.path.join(REPO_DIR, "Automotive_Industry"),
+        tmp_path / "Automotive_Industry"
+    )
+    monkeypatch.chdir(tmp_path)
+    connection = simulated.SimulatedConnection(latency=0)
+    monkeypatch.setattr(setup, "get_snowflake_connection", lambda: connection)
+    return connection
+
+
+def run_setup(connection, output=None):
+    """
+    Run the whole setup, silencing its output.
+
+    Args:
+        connection (simulated_snowflake.SimulatedConnection):
+            Simulated connection.
+        output (io.StringIO): Buffer receiving the output of the run.
+
+    Returns:
+        list: Statements executed by the run, multi-statement requests
+            being split into their statements.
+    """
+    import setup_swiftauto_traders as setup
+    start = len(connection.statements)
+    with contextlib.redirect_stdout(output or io.StringIO()):
+        setup.main()
+    return [
+        statement.strip()
+        for request in connection.statements[start:]
+        for statement in request.split(";")
+        if statement.strip()
+    ]
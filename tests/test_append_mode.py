@@ -0,0 +1,184 @@
+"""
+Tests of the append mode of setup_swiftauto_traders.py, loading the lines
+appended to a file into its existing table, run against the simulated
+connection.
+"""
+
+# Importing the required libraries
+import io
+import os
+import pytest
+import setup_swiftauto_traders as setup
+from conftest import run_setup
+
+SALES_CSV = os.path.join("Automotive_Industry", "AU_Sales_By_Model.csv")
+SALES_TABLE = "SWIFTAUTO_DB.AUTOMOTIVE.AU_SALES_BY_MODEL"
+APPENDED_LINES = (
+    "2023,December,2023-12-31 23:00:00,Beaufort,1222,12,18000\n"
+    "2023,December,2023-12-31 23:00:00,Salish,1288,7,21000\n"
+)
+
+
+@pytest.fixture
+def append_mode(connection, monkeypatch):
+    """
+    Load the dataset in append mode, returning the simulated connection.
+    """
+    monkeypatch.setattr(setup, "LOAD_MODE", "append")
+    run_setup(connection)
+    return connection
+
+
+def append_lines(path, lines):
+    """
+    Append lines to a file.
+
+    Args:
+        path (str): File path.
+        lines (str): Lines to append.
+    """
+    with open(path, "a", newline="") as f:
+        f.write(lines)
+
+
+def run_sync(connection):
+    """
+    Run the setup, keeping its output.
+
+    Args:
+        connection (simulated_snowflake.SimulatedConnection):
+            Simulated connection.
+
+    Returns:
+        tuple: Statements executed by the run and its output.
+    """
+    output = io.StringIO()
+    statements = run_setup(connection, output)
+    return statements, output.getvalue()
+
+
+def table_statements(statements, keyword):
+    """
+    List the tables of the statements starting with a keyword.
+
+    Args:
+        statements (list): Executed statements.
+        keyword (str): Statement prefix, such as COPY INTO.
+
+    Returns:
+        list: Table names, the word following the keyword.
+    """
+    return [
+        statement.split()[len(keyword.split())]
+        for statement in statements if statement.startswith(keyword)
+    ]
+
+
+def test_appended_lines_load_only_the_delta(append_mode):
+    """
+    Lines appended to a file are uploaded as a delta file and copied into
+    the existing table, which is not recreated.
+    """
+    rows = append_mode.table_rows[SALES_TABLE]
+    append_lines(SALES_CSV, APPENDED_LINES)
+
+    statements, output = run_sync(append_mode)
+
+    puts = [s for s in statements if s.startswith("PUT")]
+    assert len(puts) == 1 and "AU_Sales_By_Model.delta_" in puts[0]
+    assert table_statements(statements, "COPY INTO") == ["AU_SALES_BY_MODEL"]
+    assert "AU_SALES_BY_MODEL" not in table_statements(
+        statements, "CREATE OR REPLACE TABLE"
+    )
+    assert append_mode.table_rows[SALES_TABLE] == rows + 2
+    assert "bytes of AU_Sales_By_Model.csv in" in output
+
+    # The next run finds the file and its delta loaded
+    statements, _ = run_sync(append_mode)
+    assert not [s for s in statements if s.startswith(("PUT", "COPY"))]
+
+
+def test_incompatible_lines_reload_the_table(append_mode):
+    """
+    Appended lines that no longer fit the schema of the table reload the
+    whole file into a recreated table.
+    """
+    append_lines(
+        SALES_CSV, "2023,December,2023-12-31 23:00:00,Beaufort,1222,n/a,0\n"
+    )
+
+    statements, output = run_sync(append_mode)
+
+    assert "Schema of AU_Sales_By_Model.csv changed" in output
+    puts = [s for s in statements if s.startswith("PUT")]
+    assert len(puts) == 1 and "delta_" not in puts[0]
+    assert "AU_SALES_BY_MODEL" in table_statements(
+        statements, "CREATE OR REPLACE TABLE"
+    )
+    assert table_statements(statements, "COPY INTO") == ["AU_SALES_BY_MODEL"]
+    copy = next(s for s in statements if s.startswith("COPY INTO"))
+    assert "delta_" not in copy
+
+
+def test_rewritten_file_is_reloaded(append_mode):
+    """
+    A file that grew but whose loaded lines were also edited is reloaded in
+    full rather than appended.
+    """
+    with open(SALES_CSV, newline="") as f:
+        lines = f.readlines()
+    lines[1] = lines[1].replace(",10,15000", ",11,16500")
+    with open(SALES_CSV, "w", newline="") as f:
+        f.writelines(lines + [APPENDED_LINES])
+
+    statements, output = run_sync(append_mode)
+
+    assert "Appended " not in output
+    assert not any("delta_" in s for s in statements)
+    assert "AU_SALES_BY_MODEL" in table_statements(
+        statements, "CREATE OR REPLACE TABLE"
+    )
+    assert table_statements(statements, "COPY INTO") == ["AU_SALES_BY_MODEL"]
+
+
+def test_write_delta_file_keeps_the_header(tmp_path):
+    """
+    The delta file holds the header and the lines after the offset only.
+    """
+    path = tmp_path / "AU_Sales.csv"
+    header, loaded = "Year,Model\n", "2019,Beaufort\n2019,Salish\n"
+    path.write_text(header + loaded + "2020,Hudson\n")
+
+    delta = setup.write_delta_file(
+        str(path), len(header + loaded), build_dir=str(tmp_path / "build")
+    )
+
+    assert os.path.basename(delta) == (
+        f"AU_Sales.delta_{len(header + loaded):015d}.csv"
+    )
+    with open(delta, newline="") as f:
+        assert f.read() == header + "2020,Hudson\n"
+
+
+@pytest.mark.parametrize("lines, accepted", [
+    ("2023,Beaufort,12\n", True),
+    ("2023,Beaufort,twelve\n", False),
+    ("2023,Beaufort,12.5\n", False),
+    ("2023,Beaufort\n", False),
+])
+def test_schema_accepts(tmp_path, lines, accepted):
+    """
+    New rows are accepted when their columns match and every value fits the
+    type of its column.
+    """
+    header = "Year,Model,Quantity Sold\n"
+    base = tmp_path / "base.csv"
+    base.write_text(header + "2019,Beaufort,10\n2020,Salish,13\n")
+    new = tmp_path / "new.csv"
+    new.write_text((header if lines.count(",") == 2 else "Year,Model\n")
+                   + lines)
+
+    assert setup.schema_accepts(
+        setup.infer_csv_schema(str(base)),
+        setup.infer_csv_schema(str(new), sample_rows=0)
+    ) is accepted
@@ -0,0 +1,104 @@
+"""
+Tests of the Date filter of streamlit_swiftauto_traders.py, run against
+AU_Car_Recalls.csv loaded into the local session.
+"""
+
+# Importing the required libraries
+import csv
+import datetime
+import os
+import shutil
+import pytest
+import local_session_swiftauto_traders as local_session
+from queries_swiftauto_traders import FILTERS
+from conftest import REPO_DIR
+
+RECALLS_CSV = os.path.join(
+    REPO_DIR, "Automotive_Industry", "AU_Car_Recalls.csv"
+)
+
+
+@pytest.fixture(scope="module")
+def session(tmp_path_factory):
+    """
+    Load AU_Car_Recalls.csv alone into a local session.
+    """
+    dataset_dir = tmp_path_factory.mktemp("dataset")
+    shutil.copy(RECALLS_CSV, dataset_dir)
+    return local_session.LocalSession(
+        dataset_dir=str(dataset_dir), rollups=False
+    )
+
+
+@pytest.fixture(scope="module")
+def recall_days():
+    """
+    Days of the recalls, parsed from the CSV file.
+    """
+    with open(RECALLS_CSV, newline="") as f:
+        return [
+            datetime.datetime.strptime(row["Date"], "%A, %B %d, %Y").date()
+            for row in csv.DictReader(f)
+        ]
+
+
+def count_recalls(session, condition, params):
+    """
+    Count the recalls matching a filter condition.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        condition (str): Condition of the WHERE clause.
+        params (list): Bind parameters of the condition.
+
+    Returns:
+        int: Number of recalls matching the condition.
+    """
+    query = f"SELECT COUNT(*) FROM AUTOMOTIVE.AU_CAR_RECALLS WHERE {condition}"
+    return session.sql(query, params).collect()[0][0]
+
+
+def test_recall_dates_are_loaded_as_dates(session):
+    """
+    The long-form dates of the recalls are typed as DATE.
+    """
+    columns = dict(
+        row[:2] for row in session.database.execute(
+            "DESCRIBE AUTOMOTIVE.AU_CAR_RECALLS"
+        ).fetchall()
+    )
+    assert columns["DATE"] == "DATE"
+
+
+@pytest.mark.parametrize("first, last", [
+    (datetime.date(2021, 1, 1), datetime.date(2021, 12, 31)),
+    (datetime.date(2019, 3, 1), datetime.date(2020, 6, 30)),
+    (datetime.date(2019, 1, 18), datetime.date(2019, 1, 18)),
+])
+def test_date_filter_keeps_the_recalls_of_the_range(
+        session, recall_days, first, last):
+    """
+    The Date filter keeps the recalls of every day of the range, the last
+    day included, as its bind parameters end the day after it.
+    """
+    condition = FILTERS["Date"]["recalls"]
+    params = [first, last + datetime.timedelta(days=1)]
+
+    expected = sum(first <= day <= last for day in recall_days)
+    assert expected
+    assert count_recalls(session, condition, params) == expected
+
+
+def test_date_filter_matches_year_filter(session):
+    """
+    A Date range covering a year keeps the same recalls as the Year filter.
+    """
+    by_date = count_recalls(
+        session, FILTERS["Date"]["recalls"],
+        [datetime.date(2021, 1, 1), datetime.date(2022, 1, 1)]
+    )
+    by_year = count_recalls(
+        session, FILTERS["Year"]["recalls"].format("?"), [2021]
+    )
+    assert by_date == by_year
@@ -0,0 +1,80 @@
+"""
+Tests of the panels of streamlit_swiftauto_traders.py when the sidebar
+filters match no rows, run against the local session.
+"""
+
+# Importing the required libraries
+import datetime
+import pytest
+import streamlit_swiftauto_traders as app
+
+# A day range before any sale, recall or review
+NO_ROWS = {'Date': [datetime.date(1990, 1, 1), datetime.date(1990, 1, 2)]}
+
+
+class Placeholder:
+    """
+    Placeholder recording the messages and charts drawn in it.
+    """
+
+    def __init__(self):
+        self.drawn = []
+
+    def info(self, text):
+        self.drawn.append(('info', text))
+
+    def altair_chart(self, chart, **kwargs):
+        self.drawn.append(('altair', chart))
+
+    def plotly_chart(self, chart, **kwargs):
+        self.drawn.append(('plotly', chart))
+
+
+def panel_results(session, filters):
+    """
+    Run the queries of the dashboard for the sidebar filters.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        filters (dict): Selected values by filter name.
+
+    Returns:
+        dict: Data of the panels by query name.
+    """
+    versions = app.get_table_versions(session)
+    cache = app.ResultCache()
+    return {
+        name: app.panel_data(
+            name,
+            app.submit_query(session, cache, versions, query, params).result()
+        )
+        for name, (query, params) in app.select_queries(
+            versions, filters).items()
+    }
+
+
+def test_filter_matching_no_rows_draws_no_data(local_session):
+    """
+    Every panel shows the no data message instead of NaN scorecards or a
+    failure when the filters match no rows.
+    """
+    results = panel_results(local_session, NO_ROWS)
+
+    assert results == dict.fromkeys(app.PANELS)
+    placeholder = Placeholder()
+    app.draw_chart(placeholder, None)
+    assert placeholder.drawn == [('info', app.NO_DATA_MESSAGE)]
+
+
+@pytest.mark.parametrize("filters", [{}, {'Year': [2021]}])
+def test_filter_matching_rows_formats_the_scorecards(local_session, filters):
+    """
+    The scorecards of a slice holding sales show numbers.
+    """
+    sales = panel_results(local_session, filters)['sales']
+
+    profit = app.build_profit_chart(sales).data['Value'][0]
+    quantity = app.build_quantity_sold_chart(sales).data['Value'][0]
+    assert profit.startswith('US$') and 'nan' not in profit
+    assert quantity > 0
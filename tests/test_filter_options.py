@@ -0,0 +1,76 @@
+"""
+Tests of the values offered by the sidebar filters of
+streamlit_swiftauto_traders.py, run against the local session.
+"""
+
+# Importing the required libraries
+import datetime
+import pytest
+import streamlit_swiftauto_traders as app
+
+
+def section_options(session, section):
+    """
+    Read the values offered by the sidebar filters of a section.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        section (str): Section name, a key of SECTIONS.
+
+    Returns:
+        dict: Sorted values by filter name.
+    """
+    query = app.filter_options_query(app.section_sources(section))
+    return app.filter_options(
+        app.submit_query(session, app.ResultCache(), {}, query).result()
+    )
+
+
+def day_range(session, table):
+    """
+    Read the first and last day of a table.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        table (str): Table name in the AUTOMOTIVE schema.
+
+    Returns:
+        list: First and last day.
+    """
+    query = (
+        "SELECT CAST(MIN(DATE) AS DATE), CAST(MAX(DATE) AS DATE) "
+        f"FROM AUTOMOTIVE.{table}"
+    )
+    return list(session.sql(query).collect()[0])
+
+
+def test_sales_section_reads_the_sales_sources_only():
+    """
+    The options of the Sales section read neither the recalls nor the
+    sentiment.
+    """
+    query = app.filter_options_query(app.section_sources('Sales'))
+
+    tables = set(app.query_tables(query))
+    assert 'AU_SALES_BY_MODEL' in tables
+    assert not tables & {'AU_CAR_RECALLS', 'AU_SENTIMENT'}
+
+
+@pytest.mark.parametrize("section, tables", [
+    ('Sales', ['AU_SALES_BY_MODEL']),
+    ('Service', ['AU_SALES_BY_MODEL', 'AU_CAR_RECALLS', 'AU_SENTIMENT']),
+])
+def test_date_range_covers_the_section_sources(local_session, section, tables):
+    """
+    The Date filter offers the days from the first to the last day of the
+    tables of the section, and every filter of the section is offered.
+    """
+    options = section_options(local_session, section)
+
+    days = [day for table in tables for day in day_range(local_session, table)]
+    assert options['Date'] == sorted(set(days))
+    assert all(isinstance(day, datetime.date) for day in options['Date'])
+    assert list(options) == list(app.FILTERS)
+    assert options['Year'] and options['Model'] and options['State']
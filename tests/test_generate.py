@@ -0,0 +1,74 @@
+"""
+Tests of the scaled dataset generated by generate_swiftauto_traders.py.
+"""
+
+# Importing the required libraries
+import contextlib
+import csv
+import filecmp
+import io
+import os
+import pytest
+import generate_swiftauto_traders as generate
+from conftest import REPO_DIR
+
+
+@pytest.fixture
+def generated(tmp_path, monkeypatch):
+    """
+    Generate a small scaled dataset with one and with two worker processes,
+    in blocks smaller than the tables, returning both output directories.
+    """
+    monkeypatch.setattr(
+        generate, "SOURCE_DIR", os.path.join(REPO_DIR, "Automotive_Industry")
+    )
+    monkeypatch.setattr(generate, "SCALE", 1.2)
+    monkeypatch.setattr(generate, "BLOCK_ROWS", 1000)
+    output_dirs = {}
+    for workers in (1, 2):
+        output_dirs[workers] = str(tmp_path / f"workers_{workers}")
+        monkeypatch.setattr(generate, "WORKERS", workers)
+        monkeypatch.setattr(generate, "OUTPUT_DIR", output_dirs[workers])
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate.main()
+    return output_dirs
+
+
+def test_output_is_independent_of_the_workers(generated):
+    """
+    One and two worker processes write byte-identical files.
+    """
+    names = sorted(os.listdir(generated[1]))
+
+    assert names == sorted(os.listdir(generated[2]))
+    assert names == sorted(
+        f"{table}.csv" for table in generate.TABLES + ["AU_Car_Models"]
+    )
+    match, mismatch, errors = filecmp.cmpfiles(
+        generated[1], generated[2], names, shallow=False
+    )
+    assert (match, mismatch, errors) == (names, [], [])
+
+
+def test_row_counts_match_table_rows(generated):
+    """
+    Every generated table has the header of its bundled file and the rows
+    computed by table_rows, with the bundled dealers first.
+    """
+    profile = generate.load_profile()
+    counts = generate.table_rows(profile, generate.SCALE)
+
+    for table in generate.TABLES:
+        with open(os.path.join(generated[1], f"{table}.csv"),
+                  newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == profile["headers"][table]
+        assert len(rows) - 1 == counts[table]
+        assert counts[table] > generate.BLOCK_ROWS or table in (
+            "AU_Dealers", "AU_Car_Recalls"
+        )
+    with open(os.path.join(generated[1], "AU_Dealers.csv"), newline='') as f:
+        dealer_ids = [row[0] for row in list(csv.reader(f))[1:]]
+    bundled = sorted(profile["dealer_ids"])
+    assert sorted(dealer_ids[:len(bundled)]) == bundled
+    assert len(dealer_ids) > len(bundled)
@@ -0,0 +1,137 @@
+"""
+Tests of the pixel budget of the charts of streamlit_swiftauto_traders.py:
+LTTB downsampling, and the top-N and Other groups computed in the queries,
+run against the local session.
+"""
+
+# Importing the required libraries
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit_swiftauto_traders as app
+from queries_swiftauto_traders import (
+    MODEL_AFFECTED_SYSTEM_QUERY, RECALLS_BY_MODEL_QUERY,
+    SALES_AGGREGATES_QUERY
+)
+
+
+def run(session, query):
+    """
+    Run a query of the raw tables without filters.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        query (str): SQL query with its {where} placeholder.
+
+    Returns:
+        pandas.DataFrame: Query result.
+    """
+    return app.submit_query(
+        session, app.ResultCache(), {}, query.format(where="")
+    ).result()
+
+
+@pytest.mark.parametrize("count, points", [
+    (1000, 3), (1000, 200), (201, 200), (57, 10), (10, 10), (4, 10),
+])
+def test_lttb_keeps_the_ends_within_the_budget(count, points):
+    """
+    LTTB keeps the first and last points and at most the budget, in order.
+    """
+    rng = np.random.default_rng(count)
+    x = np.arange(count, dtype='float64')
+    y = rng.normal(size=count).cumsum()
+
+    indices = app.lttb(x, y, points)
+
+    assert len(indices) == min(count, points)
+    assert indices[0] == 0 and indices[-1] == count - 1
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_keeps_the_peaks():
+    """
+    A spike far above the rest of the series is kept.
+    """
+    y = np.zeros(500)
+    y[321] = 100.0
+
+    indices = app.lttb(np.arange(500, dtype='float64'), y, 20)
+
+    assert 321 in indices
+
+
+def test_downsample_series_bounds_every_series():
+    """
+    Every series of a long format dataframe is downsampled on its own.
+    """
+    series_df = pd.DataFrame({
+        'Month Number': np.tile(np.arange(300), 2),
+        'Metric': np.repeat(['Profit (Sum)', 'Quantity Sold (Sum)'], 300),
+        'Value': np.arange(600, dtype='float64') % 17,
+    })
+
+    sampled = app.downsample_series(
+        series_df, 'Month Number', 'Value', 25, by='Metric'
+    )
+
+    for _, group in sampled.groupby('Metric'):
+        assert len(group) == 25
+        assert group['Month Number'].iloc[[0, -1]].tolist() == [0, 299]
+    short = series_df.iloc[:20]
+    assert app.downsample_series(short, 'Month Number', 'Value', 25) is short
+
+
+@pytest.mark.parametrize("limit", [2, 3, 100])
+def test_top_n_keeps_the_grand_total(local_session, limit):
+    """
+    The kept groups and the Other group add up to the total of every group.
+    """
+    groups = run(local_session, RECALLS_BY_MODEL_QUERY)
+    top = run(local_session, app.top_n_query(
+        RECALLS_BY_MODEL_QUERY, 'Model', 'Total Recalls', limit
+    ))
+
+    assert top['Total Recalls'].sum() == groups['Total Recalls'].sum()
+    assert len(top) == min(limit, len(groups))
+    assert ('Other' in top['Model'].tolist()) == (len(groups) > limit)
+
+
+def test_sales_top_n_keeps_the_grand_total(local_session):
+    """
+    The models and dealers kept with their Other groups add up to the
+    Total row.
+    """
+    sales = run(local_session, app.sales_top_n_query(
+        SALES_AGGREGATES_QUERY, 3, 4
+    ))
+    grains = {name: group for name, group in sales.groupby('Grain')}
+    total = grains['Total'].iloc[0]
+
+    assert len(grains['Model']) == 3 and len(grains['Dealer ID']) == 4
+    assert 'Other' in grains['Model']['Model'].tolist()
+    assert 'Other' in grains['Dealer ID']['Dealer ID'].tolist()
+    assert grains['Model']['Quantity Sold (Sum)'].sum() == (
+        total['Quantity Sold (Sum)']
+    )
+    assert grains['Dealer ID']['Profit (Sum)'].sum() == pytest.approx(
+        total['Profit (Sum)']
+    )
+
+
+def test_heatmap_cells_keep_the_grand_total(local_session):
+    """
+    The binned heatmap has a cell for every row and column kept, adding up
+    to the recalls of every model and affected system.
+    """
+    cells = run(local_session, MODEL_AFFECTED_SYSTEM_QUERY)
+    binned = run(local_session, app.heatmap_cells_query(
+        MODEL_AFFECTED_SYSTEM_QUERY, 3, 4
+    ))
+
+    models = binned['Model'].nunique()
+    systems = binned['Affected System'].nunique()
+    assert models <= 3 and systems <= 4
+    assert len(binned) == models * systems
+    assert binned['# of Recalls (Sum)'].sum() == cells['UNITS'].sum()
@@ -0,0 +1,89 @@
+"""
+Tests of the result cache of streamlit_swiftauto_traders.py, run against
+the local session.
+"""
+
+# Importing the required libraries
+import streamlit_swiftauto_traders as app
+
+RECALLS_QUERY = "SELECT COUNT(*) AS RECALLS FROM AUTOMOTIVE.AU_CAR_RECALLS"
+SALES_QUERY = "SELECT COUNT(*) AS SALES FROM AUTOMOTIVE.AU_SALES_BY_MODEL"
+DEALERS_QUERY = "SELECT COUNT(*) AS DEALERS FROM AUTOMOTIVE.AU_DEALERS"
+
+
+def submit(session, cache, query):
+    """
+    Submit a query against the current version of its tables.
+
+    Args:
+        session (local_session_swiftauto_traders.LocalSession):
+            Local session.
+        cache (streamlit_swiftauto_traders.ResultCache): Result cache.
+        query (str): SQL query.
+
+    Returns:
+        streamlit_swiftauto_traders.PendingQuery: Submitted or cached query.
+    """
+    versions = app.get_table_versions(session)
+    pending = app.submit_query(session, cache, versions, query)
+    pending.result()
+    return pending
+
+
+def test_unchanged_tables_hit_the_cache(local_session):
+    """
+    The same query over unchanged tables is answered from the cache, with
+    the same result, whatever its whitespace.
+    """
+    cache = app.ResultCache()
+    first = submit(local_session, cache, RECALLS_QUERY)
+    second = submit(local_session, cache, f"  {RECALLS_QUERY}\n")
+
+    assert not first.stats['cached']
+    assert second.stats['cached']
+    assert second.result() is first.result()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_table_misses_the_cache(local_session):
+    """
+    A new LAST_ALTERED time of a table read by a query runs it again, and
+    leaves the results of the other tables cached.
+    """
+    cache = app.ResultCache()
+    submit(local_session, cache, RECALLS_QUERY)
+    submit(local_session, cache, SALES_QUERY)
+
+    local_session.touch('AU_CAR_RECALLS')
+
+    assert not submit(local_session, cache, RECALLS_QUERY).stats['cached']
+    assert submit(local_session, cache, SALES_QUERY).stats['cached']
+
+
+def test_least_recently_used_result_is_evicted(local_session):
+    """
+    Beyond the cache size, the least recently used result is evicted.
+    """
+    cache = app.ResultCache(size=2)
+    submit(local_session, cache, RECALLS_QUERY)
+    submit(local_session, cache, SALES_QUERY)
+    submit(local_session, cache, RECALLS_QUERY)
+    submit(local_session, cache, DEALERS_QUERY)
+
+    assert len(cache.entries) == 2
+    assert submit(local_session, cache, RECALLS_QUERY).stats['cached']
+    assert not submit(local_session, cache, SALES_QUERY).stats['cached']
+
+
+def test_expired_result_misses_the_cache(local_session):
+    """
+    A result older than the time to live is not used.
+    """
+    now = [0.0]
+    cache = app.ResultCache(ttl=60, clock=lambda: now[0])
+    submit(local_session, cache, RECALLS_QUERY)
+
+    now[0] = 59.0
+    assert submit(local_session, cache, RECALLS_QUERY).stats['cached']
+    now[0] = 121.0
+    assert not submit(local_session, cache, RECALLS_QUERY).stats['cached']
@@ -0,0 +1,64 @@
+"""
+Tests of the sales panels of streamlit_swiftauto_traders.py.
+"""
+
+# Importing the required libraries
+import pandas as pd
+import pytest
+import streamlit_swiftauto_traders as app
+
+COLUMNS = [
+    'Grain', 'Model', 'Dealer ID', 'Month', 'Month Number',
+    'Quantity Sold (Sum)', 'Profit (Sum)', 'Average Quantity Sold',
+    'Metric', 'Value'
+]
+
+
+def sales_frame(rows):
+    """
+    Build a result of the sales panels query.
+
+    Args:
+        rows (list): Rows as tuples of the COLUMNS.
+
+    Returns:
+        pandas.DataFrame: Sales aggregates.
+    """
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_sales_are_split_by_panel():
+    """
+    The Total row and every grain are split into their own dataframe.
+    """
+    sales = app.split_sales_aggregates(sales_frame([
+        ('Dealer ID', None, '1001', None, None, 30, 900.0, None, None, None),
+        ('Model', 'Beaufort', None, None, None, 30, 900.0, None, None, None),
+        ('Month', None, None, 'Jan', 1.0, 30, 900.0, None,
+         'Profit (Sum)', 900.0),
+        ('Month', None, None, 'Jan', 1.0, 30, 900.0, None,
+         'Quantity Sold (Sum)', 30.0),
+        ('Total', None, None, None, None, 30, 900.0, 15.0, None, None),
+    ]))
+
+    assert sales['total']['Profit (Sum)'] == 900.0
+    assert sales['total']['Average Quantity Sold'] == 15.0
+    assert sales['by_model'].to_dict('records') == [
+        {'Model': 'Beaufort', 'Quantity Sold (Sum)': 30}
+    ]
+    assert sales['by_dealer']['Dealer ID'].tolist() == ['1001']
+    assert sales['by_month']['Month Number'].tolist() == [1, 1]
+
+
+@pytest.mark.parametrize("rows", [
+    [],
+    [('Total', None, None, None, None, None, None, None, None, None)],
+    [('Total', None, None, None, None, float('nan'), float('nan'),
+      float('nan'), None, None)],
+])
+def test_sales_without_total_have_nothing_to_draw(rows):
+    """
+    A result without a Total row, or with NULL sums fetched as None or
+    NaN, has nothing to draw instead of failing in the scorecards.
+    """
+    assert app.split_sales_aggregates(sales_frame(rows)) is None
@@ -0,0 +1,65 @@
+"""
+Tests of the local schema inference of setup_swiftauto_traders.py.
+"""
+
+# Importing the required libraries
+import csv
+import pytest
+import setup_swiftauto_traders as setup
+
+
+def write_column(path, values):
+    """
+    Write a single-column CSV file.
+
+    Args:
+        path (pathlib.Path): Path to the CSV file.
+        values (list): Column values.
+
+    Returns:
+        str: Path to the CSV file.
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Value"])
+        writer.writerows([value] for value in values)
+    return str(path)
+
+
+@pytest.mark.parametrize("first, second, expected", [
+    ("1", "2024-01-01 10:00:00", "VARCHAR(19)"),
+    ("1.5", "2024-01-01", "VARCHAR(10)"),
+    ("2024-01-01", "1", "VARCHAR(10)"),
+    ("2024-01-01 10:00:00", "2024-01-01", "VARCHAR(19)"),
+    ("1", "1.25", "NUMBER(3, 2)"),
+])
+def test_types_hold_for_every_chunk(tmp_path, first, second, expected):
+    """
+    A type ruled out by a later chunk is not replaced by a broader type
+    that the earlier chunks do not match.
+    """
+    path = write_column(
+        tmp_path / "mixed.csv", [first] * 20000 + [second] * 20000
+    )
+    column, = setup.infer_csv_schema(path, sample_rows=0)
+    assert column["type"] == expected
+
+
+def test_dates_keep_the_format_of_every_chunk(tmp_path):
+    """
+    Dates are only typed with a format matching every chunk.
+    """
+    path = write_column(
+        tmp_path / "dates.csv", ["01/02/2024"] * 3 + ["2024-01-02"] * 3
+    )
+    column, = setup.infer_csv_schema(path, sample_rows=0, chunk_rows=2)
+    assert column["type"] == "VARCHAR(10)"
+
+    path = write_column(
+        tmp_path / "recalls.csv",
+        ["Friday, January 18, 2019", "Monday, March 4, 2019", "", "NULL"]
+    )
+    column, = setup.infer_csv_schema(path, sample_rows=0, chunk_rows=1)
+    assert column["type"] == "DATE"
+    assert column["format"] == "DAY, MMMM DD, YYYY"
+    assert column["nullable"]
@@ -0,0 +1,231 @@
+"""
+Tests of setup_swiftauto_traders.py run against the simulated connection
+of simulated_snowflake.py.
+"""
+
+# Importing the required libraries
+import contextlib
+import csv
+import io
+import mmap
+import os
+import re
+import pytest
+import setup_swiftauto_traders as setup
+import simulated_snowflake as simulated
+from conftest import run_setup
+
+# Statements that only read or create missing objects, issued by every run
+METADATA_PROBE = re.compile(
+    r"(SHOW|LIST|SELECT|USE|CREATE\s+\w+\s+IF\s+NOT\s+EXISTS)\b", re.I
+)
+
+
+def test_cold_run_creates_tables_and_grants(connection):
+    """
+    A first run loads every table, creates the rollup tables and grants
+    the roles and users.
+    """
+    statements = run_setup(connection)
+
+    tables = {name.rsplit(".", 1)[1] for name in connection.tables}
+    assert tables == {
+        "AU_CAR_MODELS", "AU_CAR_RECALLS", "AU_DEALERS",
+        "AU_SALES_BY_MODEL", "AU_SENTIMENT", *setup.ROLLUP_TABLES
+    }
+    assert sum(s.startswith("COPY INTO") for s in statements) == 5
+    assert set(setup.ROLES) <= set(connection.roles)
+    assert set(setup.USERS) <= set(connection.users)
+    for role, grantee in setup.ROLE_GRANTS:
+        assert (role, "ROLE", grantee) in connection.grants
+    granted = {privilege[0] for privilege in connection.privileges}
+    assert {grant[3] for grant in setup.PRIVILEGE_GRANTS} <= granted
+
+
+def test_warm_run_issues_only_metadata_probes(connection):
+    """
+    A second run over unchanged files uploads, loads and grants nothing.
+    """
+    run_setup(connection)
+    tables = dict(connection.tables)
+
+    statements = run_setup(connection)
+
+    assert statements
+    assert [s for s in statements if not METADATA_PROBE.match(s)] == []
+    assert connection.tables == tables
+
+
+def test_edited_file_is_reloaded(connection):
+    """
+    Editing a file uploads and reloads its table only, and refreshes the
+    rollup tables summarizing it.
+    """
+    run_setup(connection)
+    tables = dict(connection.tables)
+    path = os.path.join("Automotive_Industry", "AU_Sales_By_Model.csv")
+    with open(path, newline="") as f:
+        lines = f.readlines()
+    lines[1] = lines[1].replace(",10,15000", ",11,16500")
+    with open(path, "w", newline="") as f:
+        f.writelines(lines)
+
+    statements = run_setup(connection)
+
+    puts = [s for s in statements if s.startswith("PUT")]
+    assert len(puts) == 1 and "AU_Sales_By_Model" in puts[0]
+    copies = [s for s in statements if s.startswith("COPY INTO")]
+    assert [s.split()[2] for s in copies] == ["AU_SALES_BY_MODEL"]
+    changed = {
+        name.rsplit(".", 1)[1] for name, version in connection.tables.items()
+        if version != tables[name]
+    }
+    assert changed == {"AU_SALES_BY_MODEL"} | {
+        name for name, (source, _) in setup.ROLLUP_TABLES.items()
+        if source == "AU_SALES_BY_MODEL"
+    }
+
+
+def test_record_boundaries_skip_quoted_line_breaks(tmp_path):
+    """
+    Split points never fall inside a quoted field, even one holding line
+    breaks, so every part parses into whole records.
+    """
+    header = b"ID,Comment,Model\n"
+    rows = b"".join(
+        b'%d,"first line\nsecond, line\n""quoted""",Beaufort\n' % i
+        for i in range(200)
+    )
+    path = tmp_path / "quoted.csv"
+    path.write_bytes(header + rows)
+
+    with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        boundaries = setup.find_record_boundaries(mm, len(header), 7)
+        data = mm[:]
+
+    assert boundaries[0] == len(header) and boundaries[-1] == len(data)
+    assert len(boundaries) > 2
+    records = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        assert data[start - 1:start] == b"\n"
+        assert data[:start].count(b'"') % 2 == 0
+        records += list(csv.reader(io.StringIO(data[start:end].decode())))
+    assert [record[0] for record in records] == [str(i) for i in range(200)]
+    assert all(
+        record[1] == 'first line\nsecond, line\n"quoted"' for record in records
+    )
+
+
+@pytest.mark.parametrize("name, matches, rejects", [
+    ("AU_Sales.csv.gz", ["AU_Sales.csv.gz"], ["AU_SalesXcsv.gz"]),
+    (
+        "AU_Sales/AU_Sales_*.csv.gz",
+        ["AU_Sales/AU_Sales_0000.csv.gz", "AU_Sales/AU_Sales_12.csv.gz"],
+        ["AU_Sales/AU_Sales_.csv.gz", "AU_Sales/AU_Sales_0a.csv.gz"]
+    ),
+    ("a+b (1).csv", ["a+b (1).csv"], ["aab (1).csv", "a+b 1.csv"]),
+])
+def test_escape_pattern(name, matches, rejects):
+    """
+    Stage file names match themselves only, without backslashes, and the
+    chunk wildcard matches any chunk number.
+    """
+    pattern = setup.escape_pattern(name)
+    assert "\\" not in pattern
+    assert all(re.fullmatch(pattern, path) for path in matches)
+    assert not any(re.fullmatch(pattern, path) for path in rejects)
+
+
+def test_reconcile_stage_removes_stale_files():
+    """
+    Stage files without a local source file are removed, including files
+    of another staging format, and the chunks of split files are kept.
+    """
+    connection = simulated.SimulatedConnection(latency=0)
+    for path in (
+            "AU_Dealers.csv.gz", "AU_Dealers.parquet", "AU_Old.csv.gz",
+            "AU_Sales/AU_Sales_0000.csv.gz", "AU_Sales/AU_Sales_0001.csv.gz",
+            "AU_Gone/AU_Gone_0000.csv.gz"):
+        connection.stage[path] = 1
+        connection.stage_rows[path] = 1
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        staged = setup.reconcile_stage(
+            connection.cursor(),
+            ["AU_Dealers.csv.gz", "AU_Sales/AU_Sales_*.csv.gz"]
+        )
+
+    expected = {
+        "AU_Dealers.csv.gz", "AU_Sales/AU_Sales_0000.csv.gz",
+        "AU_Sales/AU_Sales_0001.csv.gz"
+    }
+    assert staged == expected
+    assert set(connection.stage) == expected
+
+
+def test_cluster_tables_applies_the_dashboard_key(connection, monkeypatch):
+    """
+    The clustering key of a large table is made of the expressions compared
+    by the dashboard filters, most used first and ordered by cardinality,
+    applied once and then reported as up to date.
+    """
+    run_setup(connection)
+    connection.column_stats.update({
+        "YEAR": (3, 2021), "MODEL": (12, "Beaufort"),
+        "DATE": (1000, "2021-01-01"), "DEALER_ID": (50, 1001),
+    })
+    monkeypatch.setattr(setup, "CLUSTER_MIN_BYTES", 1)
+    monkeypatch.setattr(setup, "CLUSTER_APPLY", True)
+
+    start = len(connection.statements)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        setup.cluster_tables(connection.cursor())
+    clustered = [
+        statement for statement in connection.statements[start:]
+        if statement.startswith("ALTER TABLE")
+    ]
+
+    assert "An unexpected error occurred" not in output.getvalue()
+    assert (
+        "ALTER TABLE AUTOMOTIVE.AU_SALES_BY_MODEL "
+        "CLUSTER BY (YEAR, MODEL, DEALER_ID);"
+    ) in clustered
+    assert not any("AU_DEALERS" in statement for statement in clustered)
+    manifest = setup.load_manifest()
+    assert manifest["clustering"]["AU_SALES_BY_MODEL"]["key"] == (
+        "YEAR, MODEL, DEALER_ID"
+    )
+
+    start = len(connection.statements)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        setup.cluster_tables(connection.cursor())
+
+    assert not any(
+        statement.startswith("ALTER TABLE")
+        for statement in connection.statements[start:]
+    )
+    assert "Clustering key of AU_SALES_BY_MODEL is up to date." in (
+        output.getvalue()
+    )
+
+
+def test_cluster_tables_skips_small_tables(connection):
+    """
+    Tables below the size threshold are reported and left unclustered.
+    """
+    run_setup(connection)
+
+    start = len(connection.statements)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        setup.cluster_tables(connection.cursor())
+
+    assert "Skipping clustering of AU_SALES_BY_MODEL" in output.getvalue()
+    assert "An unexpected error occurred" not in output.getvalue()
+    assert not any(
+        statement.startswith("ALTER TABLE")
+        for statement in connection.statements[start:]
+    )
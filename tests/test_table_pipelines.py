@@ -0,0 +1,163 @@
+"""
+Tests of the concurrent table pipelines of setup_swiftauto_traders.py, run
+against the simulated connection and its failure injection.
+"""
+
+# Importing the required libraries
+import contextlib
+import io
+import setup_swiftauto_traders as setup
+import simulated_snowflake as simulated
+from conftest import run_setup
+
+
+class PollingConnection(simulated.SimulatedConnection):
+    """
+    Simulated connection logging the submitted statements and the polled
+    query statuses in the order they happen.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.events = []
+
+    def record(self, sql):
+        super().record(sql)
+        self.events.append(("submit", " ".join(sql.split())))
+
+    def get_query_status(self, query_id):
+        status = super().get_query_status(query_id)
+        self.events.append(("poll", query_id, status))
+        return status
+
+
+def table_pipelines(tables):
+    """
+    Build a create and a load statement for each table.
+
+    Args:
+        tables (list): Table names.
+
+    Returns:
+        dict: Lists of (step name, statement) tuples keyed by table name.
+    """
+    return {
+        table: [
+            ("create",
+             f"CREATE OR REPLACE TABLE AUTOMOTIVE.{table} (ID INT);"),
+            ("insert", f"INSERT INTO AUTOMOTIVE.{table} VALUES (1);"),
+        ]
+        for table in tables
+    }
+
+
+def run_pipelines(connection, pipelines, **kwargs):
+    """
+    Run pipelines, capturing their report.
+
+    Args:
+        connection (simulated_snowflake.SimulatedConnection):
+            Simulated connection.
+        pipelines (dict): Lists of (step name, statement) tuples keyed by
+            pipeline name.
+        **kwargs: Concurrency and poll interval.
+
+    Returns:
+        tuple: Results by pipeline name and the printed report.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        results = setup.run_table_pipelines(connection, pipelines, **kwargs)
+    return results, output.getvalue()
+
+
+def test_steps_wait_for_the_previous_step():
+    """
+    The next statement of a pipeline is submitted only once the polled
+    status of the previous one reports success, and pipelines run side by
+    side up to the concurrency.
+    """
+    connection = PollingConnection(latency=0.05)
+    pipelines = table_pipelines(["A", "B", "C"])
+
+    results, _ = run_pipelines(
+        connection, pipelines, concurrency=2, poll_interval=0.01
+    )
+
+    assert {result["status"] for result in results.values()} == {"SUCCESS"}
+    assert all(
+        set(result["steps"]) == {"create", "insert"}
+        for result in results.values()
+    )
+    submitted = [event[1] for event in connection.events
+                 if event[0] == "submit"]
+    assert [statement.split()[0] for statement in submitted] == [
+        "CREATE", "CREATE", "INSERT", "INSERT", "CREATE", "INSERT"
+    ]
+    query_ids = list(connection.queries)
+    for table, steps in pipelines.items():
+        create, insert = (
+            submitted.index(" ".join(statement.split()))
+            for _, statement in steps
+        )
+        assert create < insert
+        # Polled while running, and submitted right after its success
+        polls = [event[2] for event in connection.events
+                 if event[0] == "poll" and event[1] == query_ids[create]]
+        assert polls[0] == "RUNNING" and polls[-1] == "SUCCESS"
+        before = connection.events[
+            connection.events.index(("submit", submitted[insert])) - 1
+        ]
+        assert before == ("poll", query_ids[create], "SUCCESS")
+
+
+def test_failed_pipeline_stops_and_is_reported():
+    """
+    A failed statement reports the error of its step through is_an_error
+    and stops its pipeline, while the other pipelines complete.
+    """
+    connection = PollingConnection(
+        latency=0.02, failure_rate=1.0, failure_pattern=r"TABLE AUTOMOTIVE\.B "
+    )
+
+    results, output = run_pipelines(
+        connection, table_pipelines(["A", "B", "C"]), poll_interval=0.01
+    )
+
+    assert results["A"]["status"] == results["C"]["status"] == "SUCCESS"
+    assert results["B"]["status"] == "FAILED"
+    assert results["B"]["error"].startswith("create: Simulated failure")
+    assert list(results["B"]["steps"]) == ["create"]
+    assert not any(
+        event == ("submit", "INSERT INTO AUTOMOTIVE.B VALUES (1);")
+        for event in connection.events
+    )
+    assert "Pipeline B: FAILED" in output
+    assert f"    {results['B']['error']}" in output
+    assert connection.failures == 1
+
+
+def test_failed_load_leaves_the_other_tables_loaded(connection):
+    """
+    When the COPY of one table fails during the setup, the other tables are
+    loaded and the failure is printed.
+    """
+    connection.failure_rate = 1.0
+    connection.failure_pattern = r"^\s*COPY INTO AU_DEALERS\b"
+    output = io.StringIO()
+
+    statements = run_setup(connection, output)
+
+    copies = [s.split()[2] for s in statements if s.startswith("COPY INTO")]
+    assert sorted(copies) == [
+        "AU_CAR_MODELS", "AU_CAR_RECALLS", "AU_DEALERS", "AU_SALES_BY_MODEL",
+        "AU_SENTIMENT"
+    ]
+    assert connection.failures == 1
+    report = output.getvalue()
+    assert "Pipeline AU_Dealers.csv.gz: FAILED" in report
+    assert "copy: Simulated failure" in report
+    for table in ("AU_CAR_MODELS", "AU_CAR_RECALLS", "AU_SALES_BY_MODEL",
+                  "AU_SENTIMENT"):
+        assert f"Data loaded into table {table} " in report
+    assert "Data loaded into table AU_DEALERS " not in report
@@ -0,0 +1,97 @@
+"""
+Tests of the telemetry of setup_swiftauto_traders.py, recording the
+statements of concurrent steps run against the simulated connection.
+"""
+
+# Importing the required libraries
+import contextlib
+import io
+import threading
+import setup_swiftauto_traders as setup
+import simulated_snowflake as simulated
+
+STAGE_LIST = "LIST @SWIFTAUTO_DB.PUBLIC.AUTOMOTIVE_INDUSTRY;"
+
+
+def test_threads_keep_their_own_step():
+    """
+    Steps entered at the same time by two threads are nested in the step of
+    their own thread only.
+    """
+    telemetry = setup.Telemetry()
+    barrier = threading.Barrier(2)
+
+    def run(outer, inner):
+        with telemetry.step(outer):
+            barrier.wait()
+            with telemetry.step(inner):
+                barrier.wait()
+                telemetry.record(f"SELECT '{outer}'", outer, 0.0)
+                barrier.wait()
+            telemetry.record(f"SELECT '{inner}'", inner, 0.0)
+
+    threads = [
+        threading.Thread(target=run, args=names)
+        for names in (("load", "copy"), ("upload", "put"))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    steps = {entry["query_id"]: entry["step"] for entry in telemetry.records}
+    assert steps == {
+        "load": "load/copy", "copy": "load",
+        "upload": "upload/put", "put": "upload",
+    }
+    assert set(telemetry.steps) == {
+        "load", "load/copy", "upload", "upload/put"
+    }
+    assert telemetry.step_name == "main"
+
+
+def test_concurrent_uploads_are_recorded_in_their_step(tmp_path):
+    """
+    The PUT statements of the upload workers are recorded in the step of the
+    caller, while statements of another thread running at the same time
+    keep their own step, and the step totals are kept apart.
+    """
+    for number in range(4):
+        (tmp_path / f"AU_Large_{number}.csv").write_text("x" * 2048)
+    for number in range(3):
+        (tmp_path / f"AU_Small_{number}.csv").write_text("x")
+    telemetry = setup.Telemetry()
+    connection = setup.InstrumentedConnection(
+        simulated.SimulatedConnection(latency=0.05), telemetry
+    )
+    uploading = threading.Event()
+
+    def list_stage():
+        cursor = connection.cursor()
+        uploading.wait()
+        with telemetry.step("reconcile_stage"):
+            for _ in range(3):
+                cursor.execute(STAGE_LIST)
+
+    thread = threading.Thread(target=list_stage)
+    thread.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with telemetry.step("upload_csv_files"):
+            uploading.set()
+            summary = setup.upload_csv_files(
+                connection.cursor(), str(tmp_path), workers=4,
+                batch_threshold=1024
+            )
+    thread.join()
+
+    assert summary["files"] == 7
+    puts = [e for e in telemetry.records if e["kind"] == "PUT"]
+    lists = [e for e in telemetry.records if e["kind"] == "LIST"]
+    assert len(puts) == 5 and len(lists) == 3
+    assert {entry["step"] for entry in puts} == {"upload_csv_files"}
+    assert {entry["step"] for entry in lists} == {"reconcile_stage"}
+    assert set(telemetry.steps) == {"upload_csv_files", "reconcile_stage"}
+    # The workers overlap, so the step takes less than its statements
+    assert max(e["seconds"] for e in puts) <= (
+        telemetry.steps["upload_csv_files"]
+    ) < sum(e["seconds"] for e in puts)
@@ -0,0 +1,78 @@
+"""
+Tests of the batched uploads of setup_swiftauto_traders.py, run against
+the simulated connection.
+"""
+
+# Importing the required libraries
+import contextlib
+import io
+import os
+import setup_swiftauto_traders as setup
+import simulated_snowflake as simulated
+
+LARGE = ("AU_Sales.csv", "AU_Sentiment.csv")
+SMALL = ("AU_Car_Models.csv", "AU_Dealers.csv", "AU_Recalls.csv")
+
+
+def write_files(directory):
+    """
+    Write large and small CSV files.
+
+    Args:
+        directory (pathlib.Path): Directory receiving the files.
+
+    Returns:
+        list: Paths of the files, in name order.
+    """
+    for name in LARGE:
+        (directory / name).write_text("ID\n" + "1\n" * 1024)
+    for name in SMALL:
+        (directory / name).write_text("ID\n1\n")
+    return sorted(str(directory / name) for name in LARGE + SMALL)
+
+
+def test_plan_uploads_batches_small_files(tmp_path):
+    """
+    Large files and directories of chunks each get a task of their own, and
+    small files share the last task.
+    """
+    paths = write_files(tmp_path)
+    chunks = tmp_path / "AU_Big"
+    chunks.mkdir()
+    (chunks / "AU_Big_0000.csv").write_text("ID\n1\n")
+
+    tasks = setup.plan_uploads(paths + [str(chunks)], batch_threshold=1024)
+
+    assert tasks == [
+        [str(tmp_path / name)] for name in sorted(LARGE)
+    ] + [[str(chunks)], [str(tmp_path / name) for name in sorted(SMALL)]]
+
+
+def test_small_files_share_one_wildcard_put(tmp_path):
+    """
+    Small files are uploaded by a single wildcard PUT, and large files by
+    a PUT each, with the PARALLEL option.
+    """
+    write_files(tmp_path)
+    connection = simulated.SimulatedConnection(latency=0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = setup.upload_csv_files(
+            connection.cursor(), str(tmp_path), workers=2, parallel=8,
+            batch_threshold=1024
+        )
+
+    puts = [s for s in connection.statements if s.startswith("PUT")]
+    assert len(puts) == 3
+    assert all(put.endswith("PARALLEL = 8;") for put in puts)
+    sources = sorted(put.split()[1] for put in puts)
+    wildcards = [source for source in sources if source.endswith("/*")]
+    assert len(wildcards) == 1
+    assert sorted(set(sources) - set(wildcards)) == sorted(
+        f"file://{tmp_path / name}" for name in LARGE
+    )
+    assert sorted(connection.stage) == sorted(LARGE + SMALL)
+    assert summary["files"] == 5
+    assert summary["bytes"] == sum(
+        os.path.getsize(tmp_path / name) for name in LARGE + SMALL
+    )